@@ -98,7 +98,7 @@ def dot_prod(vec_a: List[float], vec_b: List[float]):
     return dot_product.astype(float)
 
 
-@jaseci_action(act_group=["bi_enc"], allow_remote=True)
+@jaseci_action(act_group=["bi_enc"], allow_remote=True, batch="contexts")
 def infer(
     contexts: Union[List[str], List[List]],
     candidates: Union[List[str], List[List]],
@@ -3,13 +3,20 @@ import tensorflow_hub as hub
 import tensorflow as tf
 import tensorflow_text  # noqa
 from jaseci.actions.live_actions import jaseci_action
+from jac_nlp.utils.label_classify import classify
 from typing import Union
 
 
 module = hub.load("https://tfhub.dev/google/universal-sentence-encoder/4")
 
 
-@jaseci_action(act_group=["use"], aliases=["get_embedding"], allow_remote=True)
+@jaseci_action(
+    act_group=["use"],
+    aliases=["get_embedding"],
+    allow_remote=True,
+    cacheable=True,
+    batch="text",
+)
 def encode(text: Union[str, list]):
     if isinstance(text, str):
         text = [text]
@@ -32,17 +39,7 @@ def text_similarity(text1: str, text2: str):
 
 @jaseci_action(act_group=["use"], allow_remote=True)
 def text_classify(text: str, classes: list):
-    text_emb = np.squeeze(np.asarray(encode(text)))
-    ret = {"match": "", "match_idx": -1, "scores": []}
-    for i in classes:
-        i_emb = np.squeeze(np.asarray(encode(i))) if isinstance(i, str) else i
-        ret["scores"].append(cos_sim_score(text_emb, i_emb))
-    top_hit = ret["scores"].index(max(ret["scores"]))
-    ret["match_idx"] = top_hit
-    ret["match"] = (
-        classes[top_hit] if isinstance(classes[top_hit], str) else "[embedded value]"
-    )
-    return ret
+    return classify(text, classes, encode, encode)
 
 
 if __name__ == "__main__":
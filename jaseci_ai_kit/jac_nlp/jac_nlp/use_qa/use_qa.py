@@ -3,6 +3,7 @@ import tensorflow_hub as hub
 import tensorflow as tf
 import tensorflow_text  # noqa
 from jaseci.actions.live_actions import jaseci_action
+from jac_nlp.utils.label_classify import classify
 from typing import Union
 
 
@@ -11,7 +12,13 @@ module = hub.load(
 )
 
 
-@jaseci_action(act_group=["use"], aliases=["enc_question"], allow_remote=True)
+@jaseci_action(
+    act_group=["use"],
+    aliases=["enc_question"],
+    allow_remote=True,
+    cacheable=True,
+    batch="question",
+)
 def question_encode(question: Union[str, list]):
     if isinstance(question, list):
         return (
@@ -27,7 +34,9 @@ def question_encode(question: Union[str, list]):
         )
 
 
-@jaseci_action(act_group=["use"], aliases=["enc_answer"], allow_remote=True)
+@jaseci_action(
+    act_group=["use"], aliases=["enc_answer"], allow_remote=True, cacheable=True
+)
 def answer_encode(answer: Union[str, list], context: Union[str, list] = None):
     if context is None:
         context = answer
@@ -69,17 +78,7 @@ def question_similarity(text1: str, text2: str):
 
 @jaseci_action(act_group=["use"], allow_remote=True)
 def question_classify(text: str, classes: list):
-    text_emb = np.squeeze(np.asarray(question_encode(text)))
-    ret = {"match": "", "match_idx": -1, "scores": []}
-    for i in classes:
-        i_emb = np.squeeze(np.asarray(question_encode(i))) if isinstance(i, str) else i
-        ret["scores"].append(cos_sim_score(text_emb, i_emb))
-    top_hit = ret["scores"].index(max(ret["scores"]))
-    ret["match_idx"] = top_hit
-    ret["match"] = (
-        classes[top_hit] if isinstance(classes[top_hit], str) else "[embedded value]"
-    )
-    return ret
+    return classify(text, classes, question_encode, question_encode)
 
 
 @jaseci_action(act_group=["use"], allow_remote=True)
@@ -91,17 +90,7 @@ def answer_similarity(text1: str, text2: str):
 
 @jaseci_action(act_group=["use"], allow_remote=True)
 def answer_classify(text: str, classes: list):
-    text_emb = np.squeeze(np.asarray(answer_encode(text)))
-    ret = {"match": "", "match_idx": -1, "scores": []}
-    for i in classes:
-        i_emb = np.squeeze(np.asarray(answer_encode(i))) if isinstance(i, str) else i
-        ret["scores"].append(cos_sim_score(text_emb, i_emb))
-    top_hit = ret["scores"].index(max(ret["scores"]))
-    ret["match_idx"] = top_hit
-    ret["match"] = (
-        classes[top_hit] if isinstance(classes[top_hit], str) else "[embedded value]"
-    )
-    return ret
+    return classify(text, classes, answer_encode, answer_encode)
 
 
 @jaseci_action(act_group=["use"], allow_remote=True)
@@ -113,17 +102,7 @@ def qa_similarity(text1: str, text2: str):
 
 @jaseci_action(act_group=["use"], allow_remote=True)
 def qa_classify(text: str, classes: list):
-    text_emb = np.squeeze(np.asarray(question_encode(text)))
-    ret = {"match": "", "match_idx": -1, "scores": []}
-    for i in classes:
-        i_emb = np.squeeze(np.asarray(answer_encode(i))) if isinstance(i, str) else i
-        ret["scores"].append(cos_sim_score(text_emb, i_emb))
-    top_hit = ret["scores"].index(max(ret["scores"]))
-    ret["match_idx"] = top_hit
-    ret["match"] = (
-        classes[top_hit] if isinstance(classes[top_hit], str) else "[embedded value]"
-    )
-    return ret
+    return classify(text, classes, question_encode, answer_encode)
 
 
 if __name__ == "__main__":
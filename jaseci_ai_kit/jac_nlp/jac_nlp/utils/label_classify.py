@@ -0,0 +1,49 @@
+"""
+Text classification against labels shared by the use encoder modules
+
+Label embeddings are kept in a small LRU keyed by encoder and label set,
+so classifying many texts against the same intents encodes the labels once
+"""
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+LABEL_CACHE_SIZE = 64
+label_cache = OrderedDict()  # {(encoder module, name, labels): embeddings, ...}
+label_cache_lock = Lock()
+
+
+def classify(text, classes, text_encoder, label_encoder):
+    """
+    Scores text against classes, labels or embeddings, with one matrix
+    product. Label embeddings are cached by label set, and encoded in the
+    same call as text when both use the same encoder
+    """
+    labels = tuple(i for i in classes if isinstance(i, str))
+    key = (label_encoder.__module__, label_encoder.__name__, labels)
+    with label_cache_lock:
+        label_embs = label_cache.get(key)
+        if label_embs is not None:
+            label_cache.move_to_end(key)
+    if label_embs is None and text_encoder is label_encoder:
+        embs = np.asarray(text_encoder([text] + list(labels)))
+        text_emb, label_embs = embs[0], embs[1:]
+    else:
+        text_emb = np.asarray(text_encoder(text))[0]
+        if label_embs is None:
+            label_embs = np.asarray(label_encoder(list(labels))) if labels else []
+    with label_cache_lock:
+        label_cache[key] = label_embs
+        while len(label_cache) > LABEL_CACHE_SIZE:
+            label_cache.popitem(last=False)
+    embs = iter(label_embs)
+    mat = np.array([next(embs) if isinstance(i, str) else i for i in classes])
+    scores = mat @ text_emb / (np.linalg.norm(mat, axis=1) * np.linalg.norm(text_emb))
+    top_hit = int(np.argmax(scores))
+    match = classes[top_hit]
+    return {
+        "match": match if isinstance(match, str) else "[embedded value]",
+        "match_idx": top_hit,
+        "scores": scores.tolist(),
+    }
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import numpy as np
+
+from jac_nlp.utils import label_classify
+from jac_nlp.utils.label_classify import classify
+
+VECS = {
+    "how do i get there": [1.0, 0.2, 0.0],
+    "getdirections": [0.9, 0.1, 0.1],
+    "searchplace": [0.1, 1.0, 0.3],
+    "weather": [0.0, 0.2, 1.0],
+}
+
+
+class StubEncoder:
+    """Encoder returning fixed vectors, recording the texts of each call"""
+
+    def __init__(self, name="encode"):
+        self.__name__ = name
+        self.calls = []
+
+    def __call__(self, text):
+        text = [text] if isinstance(text, str) else text
+        self.calls.append(list(text))
+        return [VECS[i] for i in text]
+
+
+def reference_scores(text, classes):
+    """Scores as text_classify computed them, one cos_sim_score per class"""
+    text_emb = np.asarray(VECS[text])
+    scores = []
+    for i in classes:
+        i_emb = np.asarray(VECS[i] if isinstance(i, str) else i)
+        norms = np.linalg.norm(text_emb) * np.linalg.norm(i_emb)
+        scores.append(float(np.dot(text_emb, i_emb) / norms))
+    return scores
+
+
+class LabelClassifyTest(TestCase):
+    def setUp(self):
+        label_classify.label_cache.clear()
+
+    def test_labels_encoded_once(self):
+        enc = StubEncoder()
+        classes = ["getdirections", "searchplace", "weather"]
+        first = classify("how do i get there", classes, enc, enc)
+        self.assertEqual(enc.calls, [["how do i get there"] + classes])
+        second = classify("how do i get there", classes, enc, enc)
+        self.assertEqual(enc.calls[1:], [["how do i get there"]])
+        self.assertEqual(first, second)
+
+    def test_scores_unchanged(self):
+        enc = StubEncoder()
+        classes = ["searchplace", "getdirections", "weather"]
+        ret = classify("how do i get there", classes, enc, enc)
+        self.assertEqual(ret["match"], "getdirections")
+        self.assertEqual(ret["match_idx"], 1)
+        np.testing.assert_allclose(
+            ret["scores"], reference_scores("how do i get there", classes)
+        )
+
+    def test_mixed_labels_and_embeddings(self):
+        text_enc, label_enc = StubEncoder("question"), StubEncoder("answer")
+        classes = ["weather", [1.0, 0.2, 0.01], "searchplace"]
+        ret = classify("how do i get there", classes, text_enc, label_enc)
+        self.assertEqual(ret["match"], "[embedded value]")
+        self.assertEqual(ret["match_idx"], 1)
+        np.testing.assert_allclose(
+            ret["scores"], reference_scores("how do i get there", classes)
+        )
+        self.assertEqual(label_enc.calls, [["weather", "searchplace"]])
+        classify("how do i get there", classes, text_enc, label_enc)
+        self.assertEqual(len(label_enc.calls), 1)
+        self.assertEqual(text_enc.calls, [["how do i get there"]] * 2)
@@ -0,0 +1,128 @@
+"""
+Dynamic batching of remote action calls
+
+Actions declared with a batch param take a list for it and return one
+result per item. A call arriving while no other call is running runs
+right away. Calls arriving while one is running are queued until it
+returns, or longer if a wait is configured, and when their other
+arguments match run as a single call on the concatenated list so models
+see a real batch. Results are split back to each caller in order.
+"""
+import json
+import os
+from concurrent.futures import Future
+from threading import Event, Lock
+
+ACTION_BATCH_CONFIG = {
+    "max_wait": float(os.getenv("JSCI_ACTION_BATCH_WAIT_MS", "0")) / 1000,
+    "max_items": int(os.getenv("JSCI_ACTION_BATCH_MAX_ITEMS", "32")),
+}
+
+
+class ActionBatcher:
+    """Queues concurrent calls of one action and runs them batched"""
+
+    def __init__(self, func, param, max_wait=None, max_items=None):
+        self.func = func
+        self.param = param
+        self.max_wait = (
+            ACTION_BATCH_CONFIG["max_wait"] if max_wait is None else max_wait
+        )
+        self.max_items = max_items or ACTION_BATCH_CONFIG["max_items"]
+        self._queue = []  # [(kwargs, future), ...]
+        self._items = 0
+        self._in_flight = 0
+        self._full = Event()
+        self._lock = Lock()
+        self._running = Lock()
+
+    def call(self, **kwargs):
+        """
+        Result of func(**kwargs). The first call to arrive runs at once if
+        no batch is in flight, else waits for the batch in flight and up
+        to max_wait (or until max_items are queued), then runs everything
+        queued by then
+        """
+        future = Future()
+        with self._lock:
+            self._queue.append((kwargs, future))
+            self._items += self.size(kwargs)
+            leader = len(self._queue) == 1
+            busy = self._in_flight > 0
+            if self._items >= self.max_items:
+                self._full.set()
+        if leader:
+            if busy:
+                self._full.wait(self.max_wait)
+            with self._running:
+                with self._lock:
+                    batch, self._queue, self._items = self._queue, [], 0
+                    self._in_flight = len(batch)
+                    self._full.clear()
+                try:
+                    self.run(batch)
+                finally:
+                    with self._lock:
+                        self._in_flight = 0
+        return future.result()
+
+    def call_many(self, kwargs_list):
+        """
+        Results of a list of calls run batched right away, the exception
+        raised in place of the result of a call that failed
+        """
+        batch = [(i, Future()) for i in kwargs_list]
+        with self._running:
+            self.run(batch)
+        return [i[1].exception() or i[1].result() for i in batch]
+
+    def size(self, kwargs):
+        val = kwargs.get(self.param)
+        return len(val) if isinstance(val, list) else 1
+
+    def run(self, batch):
+        """Runs queued calls, one func call per group of matching args"""
+        groups = {}
+        for kwargs, future in batch:
+            groups.setdefault(self.group_key(kwargs), []).append((kwargs, future))
+        for calls in groups.values():
+            if len(calls) == 1 or not self.run_group(calls):
+                for kwargs, future in calls:
+                    self.run_single(kwargs, future)
+
+    def run_group(self, calls):
+        """
+        Runs calls as one func call, False if the call failed or returned
+        the wrong number of results so each is rerun to get its own error
+        """
+        items, counts = [], []
+        for kwargs, _ in calls:
+            val = kwargs.get(self.param)
+            val = val if isinstance(val, list) else [val]
+            items.extend(val)
+            counts.append(len(val))
+        try:
+            ret = self.func(**dict(calls[0][0], **{self.param: items}))
+        except Exception:
+            return False
+        if not isinstance(ret, list) or len(ret) != len(items):
+            return False
+        start = 0
+        for (_, future), count in zip(calls, counts):
+            future.set_result(ret[start : start + count])
+            start += count
+        return True
+
+    def run_single(self, kwargs, future):
+        try:
+            future.set_result(self.func(**kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+    def group_key(self, kwargs):
+        """Calls can share a func call if all args but param are equal"""
+        others = {k: v for k, v in kwargs.items() if k != self.param}
+        try:
+            return json.dumps(others, sort_keys=True)
+        except (TypeError, ValueError):
+            return id(kwargs)
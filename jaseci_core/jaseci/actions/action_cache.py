@@ -0,0 +1,147 @@
+"""
+Memoization of pure actions across requests
+
+Actions marked cacheable have results kept in an in-process LRU keyed by a
+stable hash of the action name and arguments, with a shared Redis tier
+when the caller's hook has Redis running. Results are stored as json so
+cached values can't be mutated by callers.
+"""
+import json
+import os
+from collections import OrderedDict
+from hashlib import sha256
+from threading import RLock
+from time import time
+
+ACTION_CACHE_CONFIG = {
+    "max_items": int(os.getenv("JSCI_ACTION_CACHE_MAX_ITEMS", "4096")),
+    "redis_ttl": int(os.getenv("JSCI_ACTION_CACHE_REDIS_TTL", "86400")),
+}
+
+REDIS_PREFIX = "jac_action_cache:"
+STATS = ["hits", "redis_hits", "misses", "evictions", "expired"]
+
+
+def cache_key(name, args, kwargs):
+    """Stable hash of a call, None if arguments aren't json serializable"""
+    try:
+        blob = json.dumps([name, args, kwargs], sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return sha256(blob.encode()).hexdigest()
+
+
+class ActionCache:
+    """LRU of action results with optional ttl and a Redis second tier"""
+
+    def __init__(self, max_items=None, redis_ttl=None):
+        self.max_items = max_items or ACTION_CACHE_CONFIG["max_items"]
+        self.redis_ttl = redis_ttl or ACTION_CACHE_CONFIG["redis_ttl"]
+        self.items = OrderedDict()  # {key: (name, expires, json), ...}
+        self.stats = {}
+        self._lock = RLock()
+
+    def call(self, name, func, args, kwargs, ttl=0, redis=None):
+        """Result of func(*args, **kwargs), from cache if called before"""
+        key = cache_key(name, args, kwargs)
+        if key is None:
+            return func(*args, **kwargs)
+        val = self.get(name, key, ttl, redis)
+        if val is not None:
+            return json.loads(val)
+        ret = func(*args, **kwargs)
+        try:
+            val = json.dumps(ret)
+        except (TypeError, ValueError):
+            return ret
+        self.put(name, key, val, ttl, redis)
+        return ret
+
+    def call_many(self, name, func, calls, ttl=0, redis=None):
+        """
+        Results of calls, a list of kwargs, with the uncached ones passed
+        together to func, which takes a list of kwargs and returns results
+        """
+        ret, missed = [None] * len(calls), []
+        for idx, kwargs in enumerate(calls):
+            key = cache_key(name, [], kwargs)
+            val = None if key is None else self.get(name, key, ttl, redis)
+            if val is None:
+                missed.append((idx, key))
+            else:
+                ret[idx] = json.loads(val)
+        if missed:
+            results = func([calls[idx] for idx, _ in missed])
+            for (idx, key), res in zip(missed, results):
+                ret[idx] = res
+                try:
+                    val = json.dumps(res)
+                except (TypeError, ValueError):
+                    continue
+                if key is not None:
+                    self.put(name, key, val, ttl, redis)
+        return ret
+
+    def get(self, name, key, ttl=0, redis=None):
+        """Json of cached result, checking local entries then redis"""
+        with self._lock:
+            item = self.items.get(key)
+            if item is not None:
+                if item[1] and item[1] < time():
+                    del self.items[key]
+                    self.count(name, "expired")
+                else:
+                    self.items.move_to_end(key)
+                    self.count(name, "hits")
+                    return item[2]
+        if redis is not None and redis.is_running():
+            val = redis.get(REDIS_PREFIX + key)
+            if val is not None:
+                self.count(name, "redis_hits")
+                self.put(name, key, val, ttl)
+                return val
+        self.count(name, "misses")
+        return None
+
+    def put(self, name, key, val, ttl=0, redis=None):
+        """Caches json of result, evicting least recently used entries"""
+        with self._lock:
+            self.items[key] = (name, time() + ttl if ttl else 0, val)
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_items:
+                evicted = self.items.popitem(last=False)[1]
+                self.count(evicted[0], "evictions")
+        if redis is not None and redis.is_running():
+            redis.setex(REDIS_PREFIX + key, ttl or self.redis_ttl, val)
+
+    def count(self, name, stat):
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = dict.fromkeys(STATS, 0)
+            stats[stat] += 1
+
+    def get_stats(self, name=""):
+        """Counters per action, or for action name if given"""
+        if name:
+            with self._lock:
+                return dict(self.stats.get(name, dict.fromkeys(STATS, 0)))
+        with self._lock:
+            ret = {i: dict(v) for i, v in self.stats.items()}
+        ret["total"] = {i: sum(v[i] for v in ret.values()) for i in STATS}
+        ret["total"]["size"] = len(self.items)
+        return ret
+
+    def forget(self, name):
+        """Drops local entries of action name, e.g. when it is unloaded"""
+        with self._lock:
+            for key in [k for k, v in self.items.items() if v[0] == name]:
+                del self.items[key]
+
+    def clear(self):
+        with self._lock:
+            self.items.clear()
+            self.stats.clear()
+
+
+action_cache = ActionCache()
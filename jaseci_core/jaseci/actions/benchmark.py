@@ -0,0 +1,90 @@
+"""
+Load benchmark of dynamic batching for remote actions
+
+Runs concurrent clients against an action the way the action server's
+thread pool does, once calling the action directly and once through an
+ActionBatcher, and reports throughput and latency percentiles for each
+concurrency level. By default the action is a small numpy encoder on CPU,
+a loaded action with a batch param can be benchmarked instead
+
+    python -m jaseci.actions.benchmark
+    python -m jaseci.actions.benchmark --module jac_nlp.use_enc --action use.encode
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+
+from jaseci.actions.action_batcher import ActionBatcher
+
+rng = np.random.default_rng(0)
+weights = [rng.standard_normal((512, 2048)), rng.standard_normal((2048, 512))]
+
+
+def toy_encode(text):
+    """Two layer encoder over hashed tokens, one embedding per text"""
+    text = [text] if isinstance(text, str) else text
+    feats = np.zeros((len(text), 512))
+    for row, i in enumerate(text):
+        for tok in i.split():
+            feats[row, hash(tok) % 512] += 1
+    hidden = np.maximum(feats @ weights[0], 0)
+    return (hidden @ weights[1]).tolist()
+
+
+def run_load(call, param, clients, calls_per_client):
+    """Returns (calls per second, p50 ms, p99 ms) of clients calling call"""
+    text = "how do I reset my password for the jaseci dashboard"
+
+    def client(_):
+        took = []
+        for _ in range(calls_per_client):
+            start = perf_counter()
+            call(**{param: text})
+            took.append(perf_counter() - start)
+        return took
+
+    start = perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        took = [t for i in pool.map(client, range(clients)) for t in i]
+    elapsed = perf_counter() - start
+    return (
+        len(took) / elapsed,
+        np.percentile(took, 50) * 1000,
+        np.percentile(took, 99) * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--module", help="module to import actions from")
+    parser.add_argument("--action", help="name of action with a batch param")
+    parser.add_argument("--clients", default="1,4,16,32")
+    parser.add_argument("--calls", type=int, default=50, help="calls per client")
+    parser.add_argument("--wait-ms", type=float, default=0)
+    parser.add_argument("--max-items", type=int, default=32)
+    args = parser.parse_args()
+
+    func, param = toy_encode, "text"
+    if args.action:
+        from importlib import import_module
+        from jaseci.actions.live_actions import live_actions
+
+        if args.module:
+            import_module(args.module)
+        func = live_actions[args.action]
+        param = getattr(func, "_jac_batch_param", None)
+        if param is None:
+            raise SystemExit(f"{args.action} has no batch param")
+
+    print(f"{'clients':>8} {'mode':>9} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for clients in [int(i) for i in args.clients.split(",")]:
+        batcher = ActionBatcher(func, param, args.wait_ms / 1000, args.max_items)
+        for mode, call in [("direct", func), ("batched", batcher.call)]:
+            tput, p50, p99 = run_load(call, param, clients, args.calls)
+            print(f"{clients:>8} {mode:>9} {tput:>9.1f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,10 @@ General action base class with automation for hot loading
 """
 from importlib.util import spec_from_file_location, module_from_spec
 from jaseci.utils.utils import logger
-from jaseci.actions.remote_actions import ACTIONS_SPEC_LOC
 from jaseci.actions.remote_actions import serv_actions, mark_as_remote, mark_as_endpoint
-import requests
+from jaseci.actions.remote_client import get_client
+from jaseci.actions.action_cache import action_cache
+from jaseci.utils.slot_context import SlotContext
 import os
 import sys
 import inspect
@@ -13,12 +14,94 @@ import importlib
 import gc
 
 live_actions = {}  # {"act.func": func_obj, ...}
+action_plans = {}  # {"act.func": ActionPlan, ...} call plans of live_actions
 live_action_modules = {}  # {__module__: ["act.func1", "act.func2", ...], ...}
 action_configs = {}  # {"module_name": {}, ...}
 
 
-def jaseci_action(act_group=None, aliases=list(), allow_remote=False):
-    """Decorator for Jaseci Action interface"""
+class ActionPlan:
+    """
+    How to call an action, resolved once from its signature: positions and
+    names of JacSet params to convert, whether it takes meta and the cache
+    ttl if its results can be memoized (None if not, 0 for no expiry)
+    """
+
+    __slots__ = ["func", "jac_sets", "takes_meta", "signature", "cache_ttl"]
+
+    def __init__(self, func):
+        from jaseci.jac.jac_set import JacSet
+
+        spec = inspect.getfullargspec(func)
+        self.func = func
+        self.jac_sets = tuple(
+            (spec.args.index(k) if k in spec.args else None, k)
+            for k, v in spec.annotations.items()
+            if v == JacSet
+        )
+        self.takes_meta = "meta" in spec.args + spec.kwonlyargs
+        self.signature = str(inspect.signature(func))
+        # Actions taking meta see the graph, so are never treated as pure
+        self.cache_ttl = None if self.takes_meta else cache_ttl_of(func)
+
+    def convert(self, params):
+        """
+        Converts jac lists passed for JacSet params in place, and element
+        contexts passed to plain dicts as actions take and serialize them
+        """
+        from jaseci.jac.jac_set import JacSet
+
+        args, kwargs = params["args"], params["kwargs"]
+        for idx, val in enumerate(args):
+            if type(val) is SlotContext:
+                args[idx] = val.as_dict()
+        for name, val in kwargs.items():
+            if type(val) is SlotContext:
+                kwargs[name] = val.as_dict()
+        for idx, name in self.jac_sets:
+            if idx is not None and idx < len(params["args"]):
+                params["args"][idx] = JacSet(in_list=params["args"][idx])
+            if name in params["kwargs"]:
+                params["kwargs"][name] = JacSet(in_list=params["kwargs"][name])
+
+
+def cache_ttl_of(func):
+    """Cache ttl of an action marked cacheable, None if not cacheable"""
+    return getattr(func, "_jac_cache_ttl", None)
+
+
+def get_action_plan(name):
+    """
+    Call plan for live action name, None if not loaded. Plans are rebuilt
+    if the function behind name was swapped without going through unload
+    """
+    func = live_actions.get(name)
+    if func is None:
+        return None
+    plan = action_plans.get(name)
+    if plan is None or plan.func is not func:
+        plan = action_plans[name] = ActionPlan(func)
+    return plan
+
+
+def jaseci_action(
+    act_group=None,
+    aliases=list(),
+    allow_remote=False,
+    cacheable=False,
+    ttl=0,
+    batch=None,
+):
+    """
+    Decorator for Jaseci Action interface
+
+    cacheable marks the action as pure so results are memoized across
+    requests by argument, ttl is the lifetime of a cached result in seconds
+    (0 keeps it until evicted)
+
+    batch names a param taking a list, for actions returning one result per
+    item of it in order (a single value counting as a one item list). When
+    served remotely, concurrent calls are then run as one batched call
+    """
     caller_globals = dict(inspect.getmembers(inspect.currentframe().f_back))[
         "f_globals"
     ]
@@ -26,6 +109,10 @@ def jaseci_action(act_group=None, aliases=list(), allow_remote=False):
         caller_globals["serv_actions"] = serv_actions
 
     def decorator_func(func):
+        if cacheable:
+            func._jac_cache_ttl = ttl
+        if batch:
+            func._jac_batch_param = batch
         if allow_remote:
             mark_as_remote([func, act_group, aliases, caller_globals])
         return assimilate_action(func, act_group, aliases)
@@ -53,6 +140,7 @@ def assimilate_action(func, act_group=None, aliases=list()):
     act_group = [func.__module__.split(".")[-1]] if act_group is None else act_group
     action_name = f"{'.'.join(act_group+[func.__name__])}"
     live_actions[action_name] = func
+    get_action_plan(action_name)
     if func.__module__ != "js_remote_hook":
         if func.__module__ in live_action_modules:
             live_action_modules[func.__module__].append(action_name)
@@ -60,6 +148,7 @@ def assimilate_action(func, act_group=None, aliases=list()):
             live_action_modules[func.__module__] = [action_name]
     for i in aliases:
         live_actions[f"{'.'.join(act_group+[i])}"] = func
+        get_action_plan(f"{'.'.join(act_group+[i])}")
         if func.__module__ != "js_remote_hook":
             if func.__module__ in live_action_modules:
                 live_action_modules[func.__module__].append(
@@ -99,10 +188,14 @@ def load_module_actions(mod, loaded_module=None):
         for i in live_action_modules[mod]:
             if i in live_actions:
                 del live_actions[i]
+                action_plans.pop(i, None)
+                action_cache.forget(i)
     if loaded_module in live_action_modules:
         for i in live_action_modules[loaded_module]:
             if i in live_actions:
                 del live_actions[i]
+                action_plans.pop(i, None)
+                action_cache.forget(i)
 
     mod = importlib.import_module(mod)
     if mod:
@@ -129,6 +222,8 @@ def unload_module(mod):
         for i in live_action_modules[mod]:
             if i in live_actions:
                 del live_actions[i]
+                action_plans.pop(i, None)
+                action_cache.forget(i)
 
         # Iterate through the objects in the module __dict__ to manually delete them
         loaded_mod = sys.modules[mod]
@@ -153,6 +248,8 @@ def unload_action(name):
             if len(live_action_modules[mod]) < 1:
                 unload_module(mod)
         del live_actions[name]
+        action_plans.pop(name, None)
+        action_cache.forget(name)
         return True
     return False
 
@@ -228,10 +325,8 @@ def unload_remote_actions(url):
     """
     Get the list of actions from the given URL and then unload them.
     """
-    headers = {"content-type": "application/json"}
     try:
-        spec = requests.get(url.rstrip("/") + ACTIONS_SPEC_LOC, headers=headers)
-        spec = spec.json()
+        spec = get_client(url).spec()
         for i in spec.keys():
             unload_action(i)
         return True
@@ -241,12 +336,11 @@ def unload_remote_actions(url):
 
 def load_remote_actions(url):
     """Load all jaseci actions from live pod"""
-    headers = {"content-type": "application/json"}
     try:
-        spec = requests.get(url.rstrip("/") + ACTIONS_SPEC_LOC, headers=headers)
-        spec = spec.json()
+        spec = get_client(url).spec()
         for i in spec.keys():
             live_actions[i] = gen_remote_func_hook(url, i, spec[i])
+            get_action_plan(i)
         return True
 
     except Exception as e:
@@ -267,11 +361,7 @@ def gen_remote_func_hook(url, act_name, param_names):
         for i in kwargs.keys():
             if i in param_names:
                 params[i] = kwargs[i]
-        act_url = f"{url.rstrip('/')}/{act_name.split('.')[-1]}"
-        res = requests.post(
-            act_url, headers={"content-type": "application/json"}, json=params
-        )
-        return res.json()
+        return get_client(url).call(act_name.split(".")[-1], params)
 
     func.__module__ = "js_remote_hook"
 
@@ -2,10 +2,13 @@
 General action base class with automation for hot loading
 """
 from jaseci.utils.utils import logger, ColCodes as Cc
+from jaseci.actions.action_cache import action_cache
+from jaseci.actions.action_batcher import ActionBatcher
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from pydantic import validate_arguments
 from time import time
+from typing import List
 import inspect
 import uvicorn
 import os
@@ -14,6 +17,7 @@ remote_actions = {}
 registered_apis = []
 registered_endpoints = []
 ACTIONS_SPEC_LOC = "/jaseci_actions_spec/"
+BATCH_LOC = "/batch/"  # suffix of action endpoint taking a list of calls
 JS_ACTION_PREAMBLE = "js_action_"
 JS_ENDPOINT_PREAMBLE = "js_endpoint_"
 
@@ -57,7 +61,8 @@ def gen_api_service(app, func, act_group, aliases, caller_globals):
         if act_group is None
         else act_group
     )
-    remote_actions[f"{'.'.join(act_group+[func.__name__])}"] = varnames
+    action_name = f"{'.'.join(act_group+[func.__name__])}"
+    remote_actions[action_name] = varnames
 
     # Need to get pydatic model for func signature for fastAPI post
     model = validate_arguments(func).model
@@ -69,6 +74,10 @@ def gen_api_service(app, func, act_group, aliases, caller_globals):
             keep_fields[i] = model.__fields__[i]
     model.__fields__ = keep_fields
 
+    batch_param = getattr(func, "_jac_batch_param", None)
+    run = validate_arguments(func)
+    batcher = None if batch_param is None else ActionBatcher(run, batch_param)
+
     # Create duplicate funtion for api endpoint and inject in call site globals
     @app.post(f"/{func.__name__}/")
     def new_func(params: model):
@@ -76,7 +85,7 @@ def gen_api_service(app, func, act_group, aliases, caller_globals):
         logger.info(str(f"Incoming call to {func.__name__} with {pl_peek}"))
         start_time = time()
 
-        ret = validate_arguments(func)(**(params.__dict__))
+        ret = call_action(action_name, func, batcher.call if batcher else run, params)
         tot_time = time() - start_time
         logger.info(
             str(
@@ -86,12 +95,64 @@ def gen_api_service(app, func, act_group, aliases, caller_globals):
         )
         return ret
 
+    @app.post(f"/{func.__name__}{BATCH_LOC}")
+    def batch_func(params: List[model]):
+        logger.info(str(f"Incoming batch of {len(params)} calls to {func.__name__}"))
+        start_time = time()
+
+        ret = call_action_many(action_name, func, batcher, run, params)
+        tot_time = time() - start_time
+        logger.info(
+            str(
+                f"API batch call to {Cc.TG}{func.__name__}{Cc.EC}"
+                f" completed in {Cc.TY}{tot_time:.3f} seconds{Cc.EC}"
+            )
+        )
+        return ret
+
     for i in aliases:
         new_func = app.post(f"/{i}/")(new_func)
+        batch_func = app.post(f"/{i}{BATCH_LOC}")(batch_func)
         remote_actions[f"{'.'.join(act_group+[i])}"] = varnames
     caller_globals[f"{JS_ACTION_PREAMBLE}{func.__name__}"] = new_func
 
 
+def call_action(name, func, run, params):
+    """Runs one call of action served remotely, cached if it's cacheable"""
+    ttl = getattr(func, "_jac_cache_ttl", None)
+    if ttl is None:
+        return run(**params.__dict__)
+    return action_cache.call(name, run, [], params.__dict__, ttl)
+
+
+def call_action_many(name, func, batcher, run, params):
+    """
+    Runs a list of calls of action served remotely, batched if it opts in,
+    returns {"result": ...} per call or {"error": ...} for calls that raised
+    """
+    calls = [i.__dict__ for i in params]
+    if batcher:
+        many = batcher.call_many
+    else:
+        many = lambda calls: [run_caught(run, i) for i in calls]  # noqa: E731
+    ttl = getattr(func, "_jac_cache_ttl", None)
+    if ttl is None:
+        ret = many(calls)
+    else:
+        ret = action_cache.call_many(name, many, calls, ttl)
+    return [
+        {"error": str(i)} if isinstance(i, Exception) else {"result": i} for i in ret
+    ]
+
+
+def run_caught(run, kwargs):
+    """Result of run, or the exception it raised"""
+    try:
+        return run(**kwargs)
+    except Exception as e:
+        return e
+
+
 def gen_endpoint(app, func, endpoint, mount, caller_globals):
     """Helper for jaseci_action decorator"""
     # Create duplicate funtion for api endpoint and inject in call site globals
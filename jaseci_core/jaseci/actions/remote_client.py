@@ -0,0 +1,192 @@
+"""
+Client for remote action servers
+
+Each action server gets one client holding a keep-alive connection pool,
+with timeouts, a circuit breaker and retry with backoff of connections
+that fail before a request is sent, so no call ever runs twice. Concurrent
+calls to the same action (e.g., from parallel frontier branches) are
+coalesced into a single request to the action's batch endpoint, which
+returns a result or an error per call. Calls made one after another, as
+in a loop of one walker, are not coalesced, call_many sends a list of
+calls as one request.
+"""
+import os
+from concurrent.futures import Future
+from threading import Lock
+from time import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from jaseci.actions.remote_actions import ACTIONS_SPEC_LOC, BATCH_LOC
+from jaseci.utils.utils import logger
+
+REMOTE_ACTION_CONFIG = {
+    "pool_size": int(os.getenv("JSCI_REMOTE_ACTION_POOL_SIZE", "16")),
+    "connect_timeout": float(os.getenv("JSCI_REMOTE_ACTION_CONNECT_TIMEOUT", "5")),
+    "read_timeout": float(os.getenv("JSCI_REMOTE_ACTION_READ_TIMEOUT", "120")),
+    "retries": int(os.getenv("JSCI_REMOTE_ACTION_RETRIES", "2")),
+    "backoff": float(os.getenv("JSCI_REMOTE_ACTION_BACKOFF", "0.2")),
+    "breaker_threshold": int(os.getenv("JSCI_REMOTE_ACTION_BREAKER_THRESHOLD", "5")),
+    "breaker_cooldown": float(os.getenv("JSCI_REMOTE_ACTION_BREAKER_COOLDOWN", "30")),
+    "max_batch": int(os.getenv("JSCI_REMOTE_ACTION_MAX_BATCH", "64")),
+}
+
+HEADERS = {"content-type": "application/json"}
+
+clients = {}  # {url: RemoteActionClient, ...}
+clients_lock = Lock()
+
+
+class RemoteActionClient:
+    """Pooled client for one remote action server"""
+
+    def __init__(self, url, config=None):
+        self.url = url.rstrip("/")
+        self.config = config or REMOTE_ACTION_CONFIG
+        self.timeout = (self.config["connect_timeout"], self.config["read_timeout"])
+        self.session = self.build_session()
+        self.can_batch = True
+        self._failures = 0
+        self._open_until = 0
+        self._lock = Lock()
+        self._pending = {}  # {act_name: [(params, future), ...], ...}
+        self._flushing = set()
+
+    def build_session(self):
+        retry = Retry(
+            total=self.config["retries"],
+            connect=self.config["retries"],
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=self.config["backoff"],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.config["pool_size"],
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def spec(self):
+        """Action spec of server, {action name: [param names], ...}"""
+        return self.request("get", ACTIONS_SPEC_LOC).json()
+
+    def call(self, act_name, params):
+        """
+        Calls act_name with params, calls arriving while another call to
+        act_name is in flight are queued and sent together as a batch
+        """
+        fut = Future()
+        with self._lock:
+            self._pending.setdefault(act_name, []).append((params, fut))
+            lead = act_name not in self._flushing
+            if lead:
+                self._flushing.add(act_name)
+        if lead:
+            self.flush(act_name)
+        return fut.result()
+
+    def call_many(self, act_name, param_list):
+        """Calls act_name once per params in param_list, as one request"""
+        batch = [(i, Future()) for i in param_list]
+        self.send(act_name, batch)
+        return [fut.result() for _, fut in batch]
+
+    def flush(self, act_name):
+        """Sends queued calls to act_name until none are left"""
+        max_batch = self.config["max_batch"]
+        while True:
+            with self._lock:
+                queue = self._pending.pop(act_name, [])
+                if not queue:
+                    self._flushing.discard(act_name)
+                    return
+                if len(queue) > max_batch:
+                    self._pending[act_name] = queue[max_batch:]
+                    queue = queue[:max_batch]
+            self.send(act_name, queue)
+
+    def send(self, act_name, batch):
+        """
+        Sends batch of (params, future) in one request, one request each if
+        the server has no batch endpoint. Calls are never resent once the
+        server may have run them, a failed request fails all its calls
+        """
+        if len(batch) > 1 and self.can_batch:
+            try:
+                res = self.request(
+                    "post", f"/{act_name}{BATCH_LOC}", json=[i for i, _ in batch]
+                )
+                if res.status_code in [404, 405]:
+                    self.can_batch = False
+                elif res.status_code != 422:
+                    res.raise_for_status()
+                    for (_, fut), ret in zip(batch, res.json()):
+                        if "error" in ret:
+                            fut.set_exception(Exception(ret["error"]))
+                        else:
+                            fut.set_result(ret["result"])
+                    return
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                return
+            # Batch was refused unrun, calls sent alone each get their own error
+        for params, fut in batch:
+            try:
+                fut.set_result(self.request("post", f"/{act_name}", json=params).json())
+            except Exception as e:
+                fut.set_exception(e)
+
+    def request(self, method, path, **kwargs):
+        if self.circuit_open():
+            raise Exception(
+                f"Remote actions at {self.url} unavailable "
+                f"after {self._failures} failed calls"
+            )
+        try:
+            res = self.session.request(
+                method, f"{self.url}{path}", timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException:
+            self.record(ok=False)
+            raise
+        if res.status_code >= 500:
+            self.record(ok=False)
+            res.raise_for_status()
+        self.record(ok=True)
+        return res
+
+    def record(self, ok):
+        """Tracks consecutive failures, opening the circuit at threshold"""
+        with self._lock:
+            if ok:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.config["breaker_threshold"]:
+                self._open_until = time() + self.config["breaker_cooldown"]
+                logger.error(f"Remote actions at {self.url} failing, circuit open")
+
+    def circuit_open(self):
+        return time() < self._open_until
+
+
+def get_client(url):
+    """Shared client for action server at url"""
+    url = url.rstrip("/")
+    client = clients.get(url)
+    if client is None:
+        with clients_lock:
+            client = clients.get(url)
+            if client is None:
+                client = clients[url] = RemoteActionClient(url)
+    return client
@@ -36,6 +36,11 @@ def doc_activity(log: dict, query: str = "", suffix: str = ""):
     return elastic().doc_activity(log, query, suffix)
 
 
+@jaseci_action()
+def shipper_stats():
+    return elastic().shipper_stats()
+
+
 @jaseci_action()
 def search(body: dict, query: str = "", index: str = "", suffix: str = ""):
     return elastic().search(body, query, index, suffix)
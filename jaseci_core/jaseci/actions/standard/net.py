@@ -104,7 +104,7 @@ def pack(item_set: JacSet, destroy: bool = False):
     edge_set = JacSet()
     for i in item_set.obj_list():
         if isinstance(i, Node):
-            node_pack = {"name": i.name, "ctx": i.context}
+            node_pack = {"name": i.name, "ctx": dict(i.context)}
             idx_map[i.jid] = len(graph_dict["nodes"])
             graph_dict["nodes"].append(node_pack)
             for j in i.attached_edges():
@@ -115,7 +115,7 @@ def pack(item_set: JacSet, destroy: bool = False):
         if fnd.jid in idx_map.keys() and tnd.jid in idx_map.keys():
             edge_pack = {
                 "name": i.name,
-                "ctx": i.context,
+                "ctx": dict(i.context),
                 "connect": [idx_map[fnd.jid], idx_map[tnd.jid]],
                 "bi_dir": i.is_bidirected(),
             }
@@ -1,4 +1,9 @@
+import os
+from tempfile import TemporaryDirectory
+
 from jaseci.utils.test_core import CoreTest, jac_testcase
+from jaseci.actions.standard import vector
+from jaseci.actions.standard.vector import VectorIndex
 
 
 class VectorTest(CoreTest):
@@ -34,3 +39,77 @@ class VectorTest(CoreTest):
     def test_dimensionality_reduction(self, ret):
         ret = len(ret["report"][0][0])
         self.assertEqual(ret, 2)
+
+    @jac_testcase("vector.jac", "vector_index_test")
+    def test_vector_index(self, ret):
+        top = ret["report"][0]
+        self.assertEqual([i["id"] for i in top], ["a", "c"])
+        self.assertAlmostEqual(top[0]["score"], 0.995, places=3)
+        self.assertEqual([i["id"] for i in ret["report"][1][0]], ["c", "b"])
+        self.assertEqual(len(ret["report"][1][1]), 2)
+        self.assertEqual(ret["report"][2]["size"], 2)
+        self.assertTrue(ret["report"][3])
+
+    @jac_testcase("vector.jac", "vector_index_l2_test")
+    def test_vector_index_l2(self, ret):
+        self.assertEqual(ret["report"][0], ["0", "1", "2"])
+        self.assertEqual(ret["report"][1][0]["id"], "1")
+        self.assertAlmostEqual(ret["report"][1][0]["score"], 1.0, places=5)
+
+    def test_vector_index_persisted(self):
+        with TemporaryDirectory() as tmp:
+            path = f"{tmp}/idx"
+            idx = VectorIndex(2, "dot", path, capacity=1)
+            idx.add([[1, 0], [0, 2], [1, 1]], ["x", "y", "z"])
+            idx.remove(["x"])
+            loaded = VectorIndex.load(path)
+            self.assertEqual(loaded.info()["size"], 2)
+            res = loaded.query([0, 1], 2)
+            self.assertEqual([(i["id"], i["score"]) for i in res], [("y", 2), ("z", 1)])
+
+    def test_vector_index_log_compacted(self):
+        with TemporaryDirectory() as tmp:
+            path = f"{tmp}/idx"
+            idx = VectorIndex(2, "dot", path)
+            for i in range(1500):
+                idx.add([i, 1])
+                if i % 3 == 0:
+                    idx.remove([str(i // 2)])
+            self.assertLess(idx.logged, 1500)
+            with open(path + ".log") as f:
+                self.assertEqual(len(f.readlines()), idx.logged)
+            loaded = VectorIndex.load(path)
+            self.assertEqual(loaded.ids, idx.ids)
+            self.assertEqual(loaded.next_id, 1500)
+            self.assertEqual(loaded.query([1, 0], 1)[0]["id"], "1499")
+
+    def test_vector_index_per_master(self):
+        a, b = {"m_id": "urn:uuid:a"}, {"m_id": "urn:uuid:b"}
+        vector.index_create("faq", 2, meta=a)
+        vector.index_create("faq", 3, meta=b)
+        vector.index_add("faq", [[1, 0]], ["x"], meta=a)
+        self.assertEqual(vector.index_info("faq", meta=a)["size"], 1)
+        self.assertEqual(vector.index_info("faq", meta=b)["size"], 0)
+        vector.index_drop("faq", meta=a)
+        vector.index_drop("faq", meta=b)
+
+    def test_vector_index_persist_dir(self):
+        meta = {"m_id": "urn:uuid:1234"}
+        prev = vector.VECTOR_INDEX_DIR
+        with TemporaryDirectory() as tmp:
+            vector.VECTOR_INDEX_DIR = ""
+            try:
+                with self.assertRaises(ValueError):
+                    vector.index_create("faq", 2, persist=True, meta=meta)
+                vector.VECTOR_INDEX_DIR = tmp
+                with self.assertRaises(ValueError):
+                    vector.index_create("../faq", 2, persist=True, meta=meta)
+                vector.index_create("faq", 2, persist=True, meta=meta)
+                vector.index_add("faq", [[1, 0]], ["x"], meta=meta)
+                self.assertTrue(os.path.isfile(f"{tmp}/1234/faq.npy"))
+                vector.index_drop("faq", meta=meta)
+                ret = vector.index_create("faq", 2, persist=True, meta=meta)
+                self.assertEqual(ret["size"], 1)
+                vector.index_drop("faq", meta=meta)
+            finally:
+                vector.VECTOR_INDEX_DIR = prev
@@ -1,10 +1,17 @@
 """Built in actions for Jaseci"""
 import numpy as np
 from operator import itemgetter
-import pickle, base64
+from threading import Lock
+import pickle, base64, json, os, re
 
 from jaseci.actions.live_actions import jaseci_action
 
+# Indices are kept per master, persisted ones in a dir per master under
+# JSCI_VECTOR_INDEX_DIR, persisting is refused while it is not set
+VECTOR_INDEX_DIR = os.getenv("JSCI_VECTOR_INDEX_DIR", "")
+INDEX_NAME = re.compile(r"[A-Za-z0-9_-]{1,128}")
+vector_indices = {}  # {(master id, index name): VectorIndex, ...}
+
 
 def check_nested_list(lst):
     return all(isinstance(el, list) for el in lst)
@@ -24,10 +31,11 @@ def cosine_sim(vec_a: list, vec_b: list):
     if vec_a_nested or vec_b_nested:
         vec_a_np = np.array(vec_a) if vec_a_nested else np.array([vec_a] * len(vec_b))
         vec_b_np = np.array(vec_b) if vec_b_nested else np.array([vec_b] * len(vec_a))
-        sim = np.dot(vec_a_np, vec_b_np.T) / (
-            np.linalg.norm(vec_a_np, axis=1)[:, None] * np.linalg.norm(vec_b_np, axis=1)
+        # Row wise, only the diagonal of the full product is needed
+        sim = np.einsum("ij,ij->i", vec_a_np, vec_b_np) / (
+            np.linalg.norm(vec_a_np, axis=1) * np.linalg.norm(vec_b_np, axis=1)
         )
-        return sim.diagonal().tolist()
+        return sim.tolist()
 
     result = np.dot(vec_a, vec_b) / (np.linalg.norm(vec_a) * np.linalg.norm(vec_b))
     return float(result.astype(float))
@@ -54,9 +62,10 @@ def get_centroid(vec_list: list):
 
     Return - (centroid vector, cluster tightness)
     """
-    centroid = np.mean(vec_list, axis=0)
-    tightness = np.mean([cosine_sim(vec, centroid) for vec in vec_list]).astype(float)
-    return [centroid.tolist(), tightness]
+    vecs = np.asarray(vec_list, dtype=float)
+    centroid = vecs.mean(axis=0)
+    sims = vecs @ centroid / (np.linalg.norm(vecs, axis=1) * np.linalg.norm(centroid))
+    return [centroid.tolist(), float(sims.mean())]
 
 
 @jaseci_action()
@@ -120,6 +129,325 @@ def dim_reduce_apply(data: list, model: str):
     return ipca.transform(data_arr).tolist()
 
 
+@jaseci_action()
+def index_create(name: str, dim: int, metric: str = "cosine", persist=False, meta=None):
+    """
+    Create a named vector index kept in memory between calls, indices are
+    private to the master creating them
+    Param 1 - Name of the index
+    Param 2 - Dimension of the vectors
+    Param 3 (Optional) - Metric, one of cosine, dot or l2
+    Param 4 (Optional) - Persist the index to file (memory mapped) in the
+    dir set by JSCI_VECTOR_INDEX_DIR, loaded from there if persisted before,
+    name may then only have letters, digits, _ and -
+
+    Return - Info of the index, the existing one if name is taken
+    """
+    key = index_key(name, meta)
+    idx = vector_indices.get(key)
+    if idx is None:
+        path = index_path(*key) if persist else ""
+        if path and os.path.exists(path + ".json"):
+            idx = VectorIndex.load(path)
+        else:
+            idx = VectorIndex(dim, metric, path)
+        vector_indices[key] = idx
+    if idx.dim != dim or idx.metric != metric:
+        raise ValueError(
+            f"Index {name} exists with dim {idx.dim} and metric {idx.metric}!"
+        )
+    return idx.info()
+
+
+@jaseci_action()
+def index_add(name: str, vectors: list, ids: list = None, meta=None):
+    """
+    Add vectors to a vector index, replacing those with ids already in it
+    Param 1 - Name of the index
+    Param 2 - Vector or list of vectors
+    Param 3 (Optional) - Id or list of ids of the vectors (e.g., node jids),
+    generated if not given
+
+    Return - List of ids of the vectors added
+    """
+    return get_index(name, meta).add(vectors, ids)
+
+
+@jaseci_action()
+def index_remove(name: str, ids: list, meta=None):
+    """
+    Remove vectors from a vector index
+    Param 1 - Name of the index
+    Param 2 - List of ids of the vectors
+
+    Return - Number of vectors removed
+    """
+    return get_index(name, meta).remove(ids)
+
+
+@jaseci_action()
+def index_query(name: str, vectors: list, k: int = 10, meta=None):
+    """
+    Find the k nearest vectors in a vector index
+    Param 1 - Name of the index
+    Param 2 - Vector or list of vectors to query with
+    Param 3 (Optional) - Number of results per query vector
+
+    Return - List of {"id", "score"} most similar first (score is the
+    distance for l2), a list of those per vector if a list was given
+    """
+    return get_index(name, meta).query(vectors, k)
+
+
+@jaseci_action()
+def index_info(name: str, meta=None):
+    """
+    Get the settings and size of a vector index
+    Param 1 - Name of the index
+
+    Return - Dict of name, dim, metric, persist and size
+    """
+    return dict(get_index(name, meta).info(), name=name)
+
+
+@jaseci_action()
+def index_drop(name: str, meta=None):
+    """
+    Drop a vector index from memory, a persisted index stays on file
+    Param 1 - Name of the index
+
+    Return - True if the index existed
+    """
+    return vector_indices.pop(index_key(name, meta), None) is not None
+
+
+def index_key(name, meta):
+    return (meta["m_id"] if meta else None, name)
+
+
+def get_index(name, meta):
+    idx = vector_indices.get(index_key(name, meta))
+    if idx is None:
+        raise ValueError(f"Vector index {name} not found! Create it first.")
+    return idx
+
+
+def index_path(m_id, name):
+    """Path of files of a persisted index, always inside VECTOR_INDEX_DIR"""
+    if not VECTOR_INDEX_DIR:
+        raise ValueError("Set JSCI_VECTOR_INDEX_DIR to persist vector indices!")
+    if not INDEX_NAME.fullmatch(name):
+        raise ValueError(
+            f"Invalid name {name} for a persisted index! Use letters, digits, _ and -."
+        )
+    owner = re.sub(r"[^A-Za-z0-9_-]", "_", str(m_id).split(":")[-1])
+    os.makedirs(os.path.join(VECTOR_INDEX_DIR, owner), exist_ok=True)
+    return os.path.join(VECTOR_INDEX_DIR, owner, name)
+
+
+class VectorIndex:
+    """
+    Vectors in a contiguous float32 matrix with ids. Cosine indexes keep
+    rows normalized so every metric is scored with one matrix product.
+    With a path the matrix is a memory mapped path.npy, settings and ids
+    are snapshotted in path.json and changes since appended to path.log
+    """
+
+    metrics = ["cosine", "dot", "l2"]
+
+    def __init__(self, dim, metric="cosine", path="", capacity=64):
+        if metric not in self.metrics:
+            raise ValueError(f"Invalid metric {metric}! Use one of {self.metrics}.")
+        self.dim = dim
+        self.metric = metric
+        self.path = path
+        self.ids = []
+        self.pos = {}  # {id: row, ...}
+        self.next_id = 0
+        self.seq = 0  # snapshot the log applies to
+        self.logged = 0  # ids in the log
+        self.matrix = self.alloc(capacity)
+        self._lock = Lock()
+        if path:
+            self.snapshot()
+
+    @classmethod
+    def load(cls, path):
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        idx = cls.__new__(cls)
+        idx.dim, idx.metric, idx.path = meta["dim"], meta["metric"], path
+        idx.ids = meta["ids"]
+        idx.pos = {v: i for i, v in enumerate(idx.ids)}
+        idx.next_id = meta["next_id"]
+        idx.seq, idx.logged = meta["seq"], 0
+        if os.path.exists(path + ".log"):
+            with open(path + ".log") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:  # torn by a crash while appending
+                        break
+                    if entry["seq"] != idx.seq:
+                        continue
+                    idx.place(entry.get("add", []))
+                    idx.unplace(entry.get("remove", []), move_rows=False)
+                    idx.next_id = entry["next_id"]
+                    idx.logged += len(entry.get("add", entry.get("remove", [])))
+        idx.matrix = np.lib.format.open_memmap(path + ".npy", mode="r+")
+        idx._lock = Lock()
+        return idx
+
+    def alloc(self, capacity):
+        if self.path:
+            return np.lib.format.open_memmap(
+                self.path + ".npy",
+                mode="w+",
+                dtype=np.float32,
+                shape=(capacity, self.dim),
+            )
+        return np.zeros((capacity, self.dim), dtype=np.float32)
+
+    def grow(self, size):
+        rows = np.array(self.matrix[: len(self.ids)])
+        # Old mapping is dropped before its file is rewritten
+        self.matrix = None
+        self.matrix = self.alloc(max(size, 2 * len(rows), 64))
+        self.matrix[: len(rows)] = rows
+
+    def prepare(self, vectors):
+        """Vectors as a float32 matrix, rows normalized for cosine"""
+        arr = np.asarray(vectors, dtype=np.float32)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        if arr.ndim != 2 or arr.shape[1] != self.dim:
+            raise ValueError(f"Vectors must have dimension {self.dim}!")
+        if self.metric == "cosine":
+            norms = np.linalg.norm(arr, axis=1, keepdims=True)
+            arr = arr / np.where(norms == 0, 1, norms)
+        return arr
+
+    def place(self, ids):
+        """Rows of ids, appending rows for ids not in the index"""
+        rows = []
+        for i in ids:
+            row = self.pos.get(i)
+            if row is None:
+                row = self.pos[i] = len(self.ids)
+                self.ids.append(i)
+            rows.append(row)
+        return rows
+
+    def unplace(self, ids, move_rows=True):
+        """Removes ids, the last row fills each gap, returns ids removed"""
+        removed = []
+        for i in ids:
+            row = self.pos.pop(i, None)
+            if row is None:
+                continue
+            last = len(self.ids) - 1
+            if row != last:
+                if move_rows:
+                    self.matrix[row] = self.matrix[last]
+                self.ids[row] = self.ids[last]
+                self.pos[self.ids[row]] = row
+            self.ids.pop()
+            removed.append(i)
+        return removed
+
+    def add(self, vectors, ids=None):
+        arr = self.prepare(vectors)
+        with self._lock:
+            if ids is None:
+                ids = [str(self.next_id + i) for i in range(len(arr))]
+                self.next_id += len(arr)
+            elif not isinstance(ids, list):
+                ids = [ids]
+            if len(ids) != len(arr):
+                raise ValueError("Number of ids and vectors must match!")
+            rows = self.place(ids)
+            if len(self.ids) > len(self.matrix):
+                self.grow(len(self.ids))
+            self.matrix[rows] = arr
+            self.log("add", ids)
+        return ids
+
+    def remove(self, ids):
+        ids = ids if isinstance(ids, list) else [ids]
+        with self._lock:
+            removed = self.unplace(ids)
+            self.log("remove", removed)
+        return len(removed)
+
+    def query(self, vectors, k=10):
+        single = bool(vectors) and not isinstance(vectors[0], list)
+        q = self.prepare(vectors)
+        with self._lock:
+            n = len(self.ids)
+            mat = self.matrix[:n]
+            scores = q @ mat.T
+            if self.metric == "l2":
+                # Negated squared distance so higher is nearer for every metric
+                scores = 2 * scores - (q * q).sum(1)[:, None] - (mat * mat).sum(1)
+            k = min(k, n)
+            ret = [[] for _ in range(len(q))]
+            if k > 0:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                top_scores = np.take_along_axis(scores, top, axis=1)
+                order = np.argsort(-top_scores, axis=1)
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+                if self.metric == "l2":
+                    top_scores = np.sqrt(np.maximum(-top_scores, 0))
+                for res, rows, vals in zip(ret, top, top_scores):
+                    for row, val in zip(rows, vals):
+                        res.append({"id": self.ids[row], "score": float(val)})
+        return ret[0] if single else ret
+
+    def log(self, op, ids):
+        """
+        Flushes the mapped matrix and appends op on ids to path.log, which
+        is folded into a snapshot once it holds more ids than the index
+        """
+        if not self.path or not ids:
+            return
+        self.matrix.flush()
+        self.logged += len(ids)
+        if self.logged > max(len(self.ids), 1024):
+            self.snapshot()
+            return
+        entry = {op: ids, "next_id": self.next_id, "seq": self.seq}
+        with open(self.path + ".log", "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def snapshot(self):
+        """Writes settings and ids to path.json, starting an empty log"""
+        self.matrix.flush()
+        self.seq += 1
+        with open(self.path + ".json.tmp", "w") as f:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "metric": self.metric,
+                    "ids": self.ids,
+                    "next_id": self.next_id,
+                    "seq": self.seq,
+                },
+                f,
+            )
+        os.replace(self.path + ".json.tmp", self.path + ".json")
+        open(self.path + ".log", "w").close()
+        self.logged = 0
+
+    def info(self):
+        return {
+            "dim": self.dim,
+            "metric": self.metric,
+            "persist": bool(self.path),
+            "size": len(self.ids),
+        }
+
+
 class IncrementalPCA:
     def __init__(self, n_components):
         self.n_components = n_components
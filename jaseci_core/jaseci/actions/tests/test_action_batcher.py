@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, sleep
+from unittest import TestCase
+
+from jaseci.actions.action_batcher import ActionBatcher
+from jaseci.utils.utils import TestCaseHelper
+
+
+class ActionBatcherTests(TestCaseHelper, TestCase):
+    """Unit tests for dynamic batching of remote action calls"""
+
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+
+    def encode(self, text, scale=1):
+        text = [text] if isinstance(text, str) else text
+        self.calls.append(len(text))
+        sleep(0.05)
+        if "bad" in text:
+            raise ValueError("bad text")
+        return [len(i) * scale for i in text]
+
+    def call_all(self, batcher, calls):
+        def call(kwargs):
+            try:
+                return batcher.call(**kwargs)
+            except ValueError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(len(calls)) as pool:
+            return list(pool.map(call, calls))
+
+    def test_concurrent_calls_batched(self):
+        batcher = ActionBatcher(self.encode, "text", max_wait=0.1)
+        calls = [{"text": "a" * i} for i in range(1, 9)] + [{"text": ["ab", "abc"]}]
+        ret = self.call_all(batcher, calls)
+        self.assertEqual(ret, [[i] for i in range(1, 9)] + [[2, 3]])
+        self.assertLess(len(self.calls), 4)
+        self.assertEqual(sum(self.calls), 10)
+
+    def test_lone_call_not_delayed(self):
+        batcher = ActionBatcher(self.encode, "text", max_wait=1)
+        start = perf_counter()
+        self.assertEqual(batcher.call(text="ab"), [2])
+        self.assertLess(perf_counter() - start, 0.5)
+
+    def test_differing_args_not_mixed(self):
+        batcher = ActionBatcher(self.encode, "text", max_wait=0.1)
+        ret = self.call_all(batcher, [{"text": "ab"}, {"text": "ab", "scale": 2}])
+        self.assertEqual(ret, [[2], [4]])
+
+    def test_failed_batch_rerun_per_call(self):
+        batcher = ActionBatcher(self.encode, "text", max_wait=0.1)
+        ret = self.call_all(batcher, [{"text": "ab"}, {"text": "bad"}])
+        self.assertEqual(ret, [[2], "bad text"])
+
+    def test_call_many(self):
+        batcher = ActionBatcher(self.encode, "text")
+        ret = batcher.call_many([{"text": "ab"}, {"text": ["a", "abc"]}])
+        self.assertEqual(ret, [[2], [1, 3]])
+        self.assertEqual(self.calls, [3])
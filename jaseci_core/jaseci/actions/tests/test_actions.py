@@ -52,3 +52,102 @@ class JacActionsTests(TestCaseHelper, TestCase):
 
     def test_live_action_globals(self):
         self.assertGreater(len(jla.live_actions), 25)
+
+    def test_action_plan_resolved_once(self):
+        from jaseci.jac.jac_set import JacSet
+
+        def takes_set(items: JacSet, meta):
+            return items
+
+        # Not tied to this module, unloading would unload the module
+        takes_set.__module__ = "js_remote_hook"
+        jla.assimilate_action(takes_set, ["plantest"])
+        plan = jla.action_plans["plantest.takes_set"]
+        self.assertIs(jla.get_action_plan("plantest.takes_set"), plan)
+        self.assertTrue(plan.takes_meta)
+        params = {"args": [[]], "kwargs": {}}
+        plan.convert(params)
+        self.assertIsInstance(params["args"][0], JacSet)
+
+        swapped = lambda items: items  # noqa: E731
+        swapped.__module__ = "js_remote_hook"
+        jla.live_actions["plantest.takes_set"] = swapped
+        self.assertIsNot(jla.get_action_plan("plantest.takes_set"), plan)
+        self.assertFalse(jla.get_action_plan("plantest.takes_set").takes_meta)
+        jla.unload_action("plantest.takes_set")
+        self.assertNotIn("plantest.takes_set", jla.action_plans)
+        self.assertIsNone(jla.get_action_plan("plantest.takes_set"))
+
+    def test_cacheable_action_memoized(self):
+        from jaseci.actions.action_cache import ActionCache, action_cache
+
+        calls = []
+
+        def embed(text: str):
+            calls.append(text)
+            return [len(text)]
+
+        # Not tied to this module, unloading would unload the module
+        embed.__module__ = "js_remote_hook"
+        embed._jac_cache_ttl = 60
+        jla.assimilate_action(embed, ["cachetest"])
+        plan = jla.get_action_plan("cachetest.embed")
+        self.assertEqual(plan.cache_ttl, 60)
+        for _ in range(3):
+            ret = action_cache.call("cachetest.embed", embed, ["hi"], {}, 60)
+            self.assertEqual(ret, [2])
+        self.assertEqual(calls, ["hi"])
+        stats = action_cache.get_stats("cachetest.embed")
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+        jla.unload_action("cachetest.embed")
+        action_cache.call("cachetest.embed", embed, ["hi"], {}, 60)
+        self.assertEqual(calls, ["hi", "hi"])
+
+        small = ActionCache(max_items=2)
+        for i in range(3):
+            small.call("cachetest.embed", embed, [str(i)], {})
+        self.assertEqual(small.get_stats("cachetest.embed")["evictions"], 1)
+        small.call("cachetest.embed", embed, ["0"], {})
+        self.assertEqual(calls[-1], "0")
+
+    def test_action_cache_counts_from_threads(self):
+        from threading import Thread
+        from jaseci.actions.action_cache import ActionCache
+
+        cache = ActionCache()
+        threads = [
+            Thread(target=lambda: [cache.get("t", str(i)) for i in range(2000)])
+            for _ in range(8)
+        ]
+        for i in threads:
+            i.start()
+        for i in threads:
+            i.join()
+        self.assertEqual(cache.get_stats()["total"]["misses"], 16000)
+
+    def test_batch_call_results_per_call(self):
+        from types import SimpleNamespace
+
+        def half(val):
+            if val < 0:
+                raise ValueError("negative val")
+            return val / 2
+
+        params = [SimpleNamespace(val=i) for i in [2, -1, 4]]
+        self.assertEqual(
+            jra.call_action_many("half", half, None, half, params),
+            [{"result": 1}, {"error": "negative val"}, {"result": 2}],
+        )
+
+    def test_contexts_passed_as_dicts(self):
+        from jaseci.utils.slot_context import SlotContext
+
+        def act(a, b=None):
+            pass
+
+        params = {"args": [SlotContext({"x": 1})], "kwargs": {"b": SlotContext()}}
+        jla.ActionPlan(act).convert(params)
+        self.assertEqual(params, {"args": [{"x": 1}], "kwargs": {"b": {}}})
+        self.assertEqual(type(params["args"][0]), dict)
+        self.assertEqual(type(params["kwargs"]["b"]), dict)
@@ -0,0 +1,117 @@
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import sleep
+from unittest import TestCase
+
+from jaseci.actions.remote_client import REMOTE_ACTION_CONFIG, RemoteActionClient
+from jaseci.utils.stub_server import JsonHandler, start_server, stop_server
+from jaseci.utils.utils import TestCaseHelper
+
+
+class ActionHandler(JsonHandler):
+    """
+    Action server with a slow echo action, an optional batch endpoint and a
+    down action answering 503
+    """
+
+    def do_POST(self):  # noqa
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        log = self.server.calls
+        if self.path == "/echo/batch/" and self.server.batching:
+            log.append(("batch", len(body), self.client_address))
+            self.reply(200, [self.echo(i) for i in body])
+        elif self.path.startswith("/down"):
+            log.append(("down", len(body), self.client_address))
+            self.reply(503, {"detail": "Unavailable"})
+        elif self.path == "/echo":
+            log.append(("single", 1, self.client_address))
+            sleep(0.2)
+            self.reply(200, body["val"])
+        else:
+            self.reply(404, {"detail": "Not Found"})
+
+    def echo(self, params):
+        if params["val"] == "bad":
+            return {"error": "bad val"}
+        return {"result": params["val"]}
+
+
+class RemoteClientTests(TestCaseHelper, TestCase):
+    """Unit tests for pooled remote action client"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = start_server(ActionHandler, calls=[], batching=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.stop_server()
+        super().tearDown()
+
+    def stop_server(self):
+        if self.server:
+            stop_server(self.server)
+            self.server = None
+
+    def concurrent_calls(self, client, count):
+        with ThreadPoolExecutor(count) as pool:
+            futs = []
+            for i in range(count):
+                futs.append(pool.submit(client.call, "echo", {"val": i}))
+                sleep(0.02)
+            return [i.result() for i in futs]
+
+    def test_connection_reused(self):
+        client = RemoteActionClient(self.url)
+        self.assertEqual([client.call("echo", {"val": i}) for i in range(3)], [0, 1, 2])
+        self.assertEqual(len(set(i[2] for i in self.server.calls)), 1)
+
+    def test_concurrent_calls_coalesced(self):
+        client = RemoteActionClient(self.url)
+        self.assertEqual(self.concurrent_calls(client, 5), [0, 1, 2, 3, 4])
+        self.assertEqual(
+            [i[:2] for i in self.server.calls], [("single", 1), ("batch", 4)]
+        )
+
+    def test_call_many(self):
+        client = RemoteActionClient(self.url)
+        self.assertEqual(client.call_many("echo", [{"val": 7}, {"val": 8}]), [7, 8])
+        self.assertEqual([i[:2] for i in self.server.calls], [("batch", 2)])
+
+    def test_batch_errors_per_call(self):
+        client = RemoteActionClient(self.url)
+        batch = [({"val": i}, Future()) for i in [1, "bad", 3]]
+        client.send("echo", batch)
+        self.assertEqual(batch[0][1].result(), 1)
+        self.assertEqual(batch[2][1].result(), 3)
+        self.assertIn("bad val", str(batch[1][1].exception()))
+        self.assertEqual([i[:2] for i in self.server.calls], [("batch", 3)])
+
+    def test_failed_calls_not_resent(self):
+        client = RemoteActionClient(self.url, dict(REMOTE_ACTION_CONFIG, retries=2))
+        with self.assertRaises(Exception):
+            client.call("down", {"val": 1})
+        self.assertEqual(len(self.server.calls), 1)
+        self.server.calls = []
+        with self.assertRaises(Exception):
+            client.call_many("down", [{"val": 1}, {"val": 2}])
+        self.assertEqual([i[:2] for i in self.server.calls], [("down", 2)])
+
+    def test_no_batch_endpoint_falls_back(self):
+        self.server.batching = False
+        client = RemoteActionClient(self.url)
+        self.assertEqual(self.concurrent_calls(client, 3), [0, 1, 2])
+        self.assertFalse(client.can_batch)
+        self.assertEqual([i[0] for i in self.server.calls], ["single"] * 3)
+
+    def test_circuit_breaker(self):
+        config = dict(REMOTE_ACTION_CONFIG, retries=0, breaker_threshold=2)
+        self.stop_server()
+        client = RemoteActionClient(self.url, config)
+        for _ in range(2):
+            with self.assertRaises(Exception) as ctx:
+                client.call("echo", {"val": 1})
+            self.assertNotIn("unavailable", str(ctx.exception))
+        with self.assertRaises(Exception) as ctx:
+            client.call("echo", {"val": 1})
+        self.assertIn("unavailable", str(ctx.exception))
@@ -10,6 +10,65 @@ from jaseci.jac.ir.jac_code import JacCode
 from jaseci.utils.id_list import IdList
 
 
+class DispatchTable:
+    """
+    What walkers run on nodes of an architype, resolved once per sentinel
+    version: the flattened super chain, the names it is an instance of,
+    all abilities (the scope of ability calls) and, per walker, the entry
+    and exit abilities to trigger
+    """
+
+    __slots__ = ("archs", "types", "actions", "walkers")
+
+    def __init__(self, arch):
+        snt = arch.parent()
+        self.archs = [arch]
+        for i in arch.super_archs:
+            self.archs += snt.get_arch_by_name(i, kind=arch.kind).arch_with_supers()
+        self.types = frozenset(snt.derived_types_of(arch.kind, arch.name))
+        self.actions = IdList(arch, auto_save=False)
+        for i in self.archs:
+            self.actions += (
+                i.entry_action_ids + i.activity_action_ids + i.exit_action_ids
+            )
+        self.walkers = {}
+
+    def triggers(self, walker_name):
+        """
+        (entry, exit) lists of (action, ability) to trigger for walker,
+        ability is the action whose code runs or None for preset actions
+        """
+        if walker_name not in self.walkers:
+            self.walkers[walker_name] = (
+                self.resolve(walker_name, "entry_action_ids"),
+                self.resolve(walker_name, "exit_action_ids"),
+            )
+        return self.walkers[walker_name]
+
+    def resolve(self, walker_name, ids_field):
+        act_list = []
+        for i in self.archs:
+            act_list += getattr(i, ids_field).obj_list()
+        first = {}
+        for i in act_list:
+            first.setdefault(i.name, i)
+        triggers = []
+        already_executed = set()  # handles inhereted duplicates, (overriding)
+        for i in act_list:
+            if (
+                i.access_list
+                and walker_name not in i.access_list
+                or i.name in already_executed
+            ):
+                continue
+            if i.preset_in_out:  # All preset in and outs get executed
+                triggers.append((i, None))
+            else:
+                triggers.append((i, first[i.name]))
+                already_executed.add(i.name)
+        return triggers
+
+
 class Architype(Element, JacCode, ArchitypeInterp):
     """Architype class for Jaseci"""
 
@@ -35,27 +94,26 @@ class Architype(Element, JacCode, ArchitypeInterp):
         """
         return self.run_architype(jac_ast=self.get_jac_ast())
 
+    def dispatch_table(self):
+        """Dispatch table of this architype, kept by its sentinel"""
+        tables = getattr(self.parent(), "_dispatch", None)
+        if tables is None:
+            return DispatchTable(self)
+        if self.jid not in tables:
+            tables[self.jid] = DispatchTable(self)
+        return tables[self.jid]
+
     def get_all_actions(self):
-        actions = IdList(self, auto_save=False)
-        for i in self.arch_with_supers():
-            actions += i.entry_action_ids + i.activity_action_ids + i.exit_action_ids
-        return actions
+        return self.dispatch_table().actions
 
     def arch_with_supers(self):
-        archs = [self]
-        for i in self.super_archs:
-            obj = self.parent().arch_ids.get_obj_by_name(name=i, kind=self.kind)
-            archs += obj.arch_with_supers()
-        return archs
+        return list(self.dispatch_table().archs)
 
     def derived_types(self):
-        names = []
-        for i in self.arch_with_supers():
-            names += i.super_archs + [i.name]
-        return names
+        return self.dispatch_table().types
 
     def is_instance(self, name):
-        return name in self.derived_types()
+        return name in self.dispatch_table().types
 
     def destroy(self):
         """
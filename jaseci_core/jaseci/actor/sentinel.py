@@ -4,7 +4,6 @@ Sentinel class for Jaseci
 Each sentinel has an id, name, timestamp and it's set of walkers.
 """
 from jaseci.element.element import Element
-from jaseci.element.obj_mixins import Anchored
 from jaseci.utils.utils import (
     logger,
     ColCodes as Cc,
@@ -13,12 +12,16 @@ from jaseci.utils.utils import (
     perf_test_stop,
 )
 from jaseci.utils.id_list import IdList
-from jaseci.jac.ir.jac_code import JacCode, jac_ir_to_ast
+from jaseci.jac.ir.jac_code import JacCode, jac_ir_to_ast, publish_code, drop_code
 from jaseci.jac.interpreter.sentinel_interp import SentinelInterp
 from jaseci.actor.walker import Walker
 from jaseci.actor.architype import Architype
 
 
+def arch_key(kind, name):
+    return f"{kind}.{name}"
+
+
 class Sentinel(Element, JacCode, SentinelInterp):
     """
     Sentinel class for Jaseci
@@ -30,8 +33,11 @@ class Sentinel(Element, JacCode, SentinelInterp):
     def __init__(self, *args, **kwargs):
         self.version = None
         self.arch_ids = IdList(self)
+        self.arch_index = {}  # "kind.name" to architype jid
+        self.arch_types = {}  # "kind.name" to names it is an instance of
         self.global_vars = {}
         self.testcases = []
+        self._dispatch = {}  # architype jid to DispatchTable
         Element.__init__(self, *args, **kwargs)
         JacCode.__init__(self, code_ir=None)
         SentinelInterp.__init__(self)
@@ -42,9 +48,15 @@ class Sentinel(Element, JacCode, SentinelInterp):
         self.global_vars = {}
         self.testcases = []
         self.arch_ids.destroy_all()
+        self.arch_index = {}
+        self.arch_types = {}
         JacCode.reset(self)
         SentinelInterp.reset(self)
-        Anchored.flush_cache()
+        self.flush_dispatch()
+
+    def flush_dispatch(self):
+        """Drops dispatch tables, needed whenever architypes change"""
+        self._dispatch = {}
 
     def refresh(self):
         super().refresh()
@@ -52,8 +64,11 @@ class Sentinel(Element, JacCode, SentinelInterp):
 
     def register_code(self, text, dir="./", mode="default", opt_level=4):
         """
-        Registers a program (set of walkers and architypes) written in Jac
+        Registers a program (set of walkers and architypes) written in Jac,
+        its ASTs are published to the shared code cache and those of the
+        code it replaced are evicted
         """
+        old_sigs = self.code_sigs()
         self.reset()
         if mode == "ir":
             self.apply_ir(text)
@@ -61,8 +76,20 @@ class Sentinel(Element, JacCode, SentinelInterp):
             self.register(text, dir, opt_level=opt_level)
         if self.is_active:
             self.ir_load()
+        if self.is_active:
+            publish_code(self.code_objs(), self.code_redis())
+        drop_code(old_sigs - self.code_sigs())
         return self.is_active
 
+    def code_objs(self):
+        """Sentinel and its architypes, without filling arch_ids' cache"""
+        archs = self._h.get_obj_many(self._m_id, list(self.arch_ids))
+        return [self] + [i for i in archs if i]
+
+    def code_sigs(self):
+        """Sigs of sentinel and architype code"""
+        return {i.code_sig for i in self.code_objs() if i.code_sig}
+
     def load_arch_defaults(self):
         self.arch_ids.add_obj(
             Architype(m_id=self._m_id, h=self._h, name="root", kind="node", parent=self)
@@ -84,6 +111,7 @@ class Sentinel(Element, JacCode, SentinelInterp):
         """
         self.load_arch_defaults()
         self.run_start(self._jac_ast)
+        self.index_archs()
 
         if self.runtime_errors:
             logger.error(str(f"{self.name}: Runtime problem processing sentinel!"))
@@ -95,7 +123,9 @@ class Sentinel(Element, JacCode, SentinelInterp):
 
     def register_architype(self, code, opt_level=4):
         """Adds an architype based on jac code"""
-        tree = self.compile_jac(code, start_rule="architype", opt_level=opt_level)
+        tree = self.compile_jac(
+            code, dir="./", start_rule="architype", opt_level=opt_level
+        )
         if not tree:
             return None
         return self.load_architype(tree)
@@ -105,7 +135,7 @@ class Sentinel(Element, JacCode, SentinelInterp):
         Spawns a new architype from registered architypes and adds to
         live walkers
         """
-        src_arch = self.arch_ids.get_obj_by_name(name, kind=kind, silent=True)
+        src_arch = self.get_arch_by_name(name, kind=kind, silent=True)
         if not src_arch:
             logger.error(str(f"{self.name}: Unable to spawn {kind} architype {name}!"))
             return None
@@ -139,9 +169,78 @@ class Sentinel(Element, JacCode, SentinelInterp):
             Element.destroy(arch)
             return ret
 
+    def index_archs(self):
+        """
+        Rebuilds the (kind, name) index of architypes and the closure of
+        types each is an instance of
+        """
+        self.arch_index = {}
+        supers = {}
+        for i in self._h.get_obj_many(self._m_id, list(self.arch_ids)):
+            if i and arch_key(i.kind, i.name) not in self.arch_index:
+                self.arch_index[arch_key(i.kind, i.name)] = i.jid
+                supers[arch_key(i.kind, i.name)] = i.super_archs
+
+        def closure(key, seen):
+            kind, name = key.split(".", 1)
+            names = {name}
+            for i in supers.get(key, []):
+                names.add(i)
+                if arch_key(kind, i) not in seen:
+                    seen.add(arch_key(kind, i))
+                    names |= closure(arch_key(kind, i), seen)
+            return names
+
+        self.arch_types = {i: sorted(closure(i, {i})) for i in supers}
+
+    def check_index(self):
+        """Rebuilds the index if arch_ids changed without it"""
+        if len(self.arch_index) != len(self.arch_ids):
+            self.index_archs()
+
+    def index_arch(self, arch):
+        """Points the index at a newly loaded architype"""
+        self.arch_index.pop(arch_key(arch.kind, arch.name), None)
+        self.arch_index[arch_key(arch.kind, arch.name)] = arch.jid
+        self.arch_types = {}  # rebuilt on next lookup, supers may have changed
+
+    def get_arch_by_name(self, name, kind=None, silent=False):
+        """Returns architype by name and kind (first of any kind if None)"""
+        for retry in [False, True]:
+            if retry:
+                self.index_archs()
+            else:
+                self.check_index()
+            if kind:
+                jid = self.arch_index.get(arch_key(kind, name))
+            else:
+                jid = next(
+                    (v for k, v in self.arch_index.items() if k.endswith("." + name)),
+                    None,
+                )
+            ret = self._h.get_obj(self._m_id, jid) if jid else None
+            if ret or not jid:
+                break
+        if not ret and not silent:
+            logger.error(str(f"{self.name}: No architype for {[name, kind]}!"))
+        return ret
+
+    def arch_objs(self, kind):
+        """Architypes of kind in registration order"""
+        self.check_index()
+        ids = [v for k, v in self.arch_index.items() if k.startswith(kind + ".")]
+        return [i for i in self._h.get_obj_many(self._m_id, ids) if i]
+
+    def derived_types_of(self, kind, name):
+        """Names an architype is an instance of"""
+        self.check_index()
+        if not self.arch_types:
+            self.index_archs()
+        return self.arch_types.get(arch_key(kind, name), [name])
+
     def get_arch_for(self, obj):
         """Returns the architype that matches object"""
-        ret = self.arch_ids.get_obj_by_name(name=obj.name, kind=obj.kind)
+        ret = self.get_arch_by_name(name=obj.name, kind=obj.kind, silent=True)
         if ret is None:
             self.rt_error(f"Unable to find architype for {obj.name}, {obj.kind}")
         return ret
@@ -266,7 +365,6 @@ class Sentinel(Element, JacCode, SentinelInterp):
         """
         Destroys self from memory and persistent storage
         """
-        Anchored.flush_cache()
         for i in self.arch_ids.obj_list():
             i.destroy()
         super().destroy()
@@ -17,9 +17,45 @@ from jaseci.element.element import Element
 from jaseci.element.obj_mixins import Anchored
 from jaseci.utils.id_list import IdList
 from jaseci.jac.interpreter.walker_interp import WalkerInterp
+from jaseci.jac.machine.jac_profiler import JacProfiler
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy, deepcopy
+import json
+import os
 import uuid
 import hashlib
 
+# Threads shared by walkers running in parallel frontier mode
+FRONTIER_POOL_SIZE = int(os.getenv("JSCI_FRONTIER_POOL_SIZE", "0")) or None
+frontier_pool = None
+
+# Most reports a streamed walk buffers in one step
+REPORT_STREAM_CAP = int(os.getenv("JSCI_REPORT_STREAM_CAP", "10000"))
+
+
+def get_frontier_pool():
+    global frontier_pool
+    if frontier_pool is None:
+        frontier_pool = ThreadPoolExecutor(
+            max_workers=FRONTIER_POOL_SIZE, thread_name_prefix="jsci_frontier"
+        )
+    return frontier_pool
+
+
+class ReportStream:
+    """NDJSON lines of a streamed walk, the walk advances as they are read"""
+
+    content_type = "application/x-ndjson"
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __iter__(self):
+        return self.lines
+
+    def close(self):
+        self.lines.close()
+
 
 class Walker(Element, WalkerInterp, Anchored):
     """Walker class for Jaseci"""
@@ -37,6 +73,8 @@ class Walker(Element, WalkerInterp, Anchored):
         self.step_limit = 10000
         self.is_async = is_async
         self._to_await = False
+        self._branch_of = None  # walker this is a frontier branch of
+        self._branch_exc = None
         Element.__init__(self, **kwargs)
         WalkerInterp.__init__(self)
         Anchored.__init__(self)
@@ -86,7 +124,7 @@ class Walker(Element, WalkerInterp, Anchored):
             return False
 
         self.current_node = self.next_node_ids.pop_first_obj()
-        self.run_walker(jac_ast=self.get_architype().get_jac_ast())
+        self.run_walker_on_node(jac_ast=self.get_architype().get_jac_ast())
         if self.current_step < 200:
             self.log_history("visited", self.current_node.id)
         self.current_step += 1
@@ -115,6 +153,114 @@ class Walker(Element, WalkerInterp, Anchored):
                 self.destroy_node_ids.remove_obj(i)
             return True
 
+    def run_walker_on_node(self, jac_ast):
+        """Runs walker on current node, timed by node architype if profiling"""
+        if self._profiler is None:
+            return self.run_walker(jac_ast=jac_ast)
+        start = self._profiler.start()
+        try:
+            self.run_walker(jac_ast=jac_ast)
+        finally:
+            self._profiler.stop(start, nodes=self.current_node.name)
+
+    def step_frontier(self):
+        """
+        Take a step on every node queued (the frontier) in parallel, each
+        node runs on its own branch of this walker and branches are merged
+        back in frontier order once all have run
+        """
+        if len(self.next_node_ids) < 2:
+            return self.step()
+        if self.current_step > self.step_limit:
+            logger.error(
+                str(
+                    f"Walker {self.name} walked too many steps "
+                    + f"- {self.step_limit}"
+                )
+            )
+            return False
+
+        frontier = self.next_node_ids.obj_list()
+        self.next_node_ids.remove_all()
+        base_ctx = deepcopy(self.context)
+        branches = [self.frontier_branch(i, base_ctx) for i in frontier]
+        jac_ast = self.get_architype().get_jac_ast()
+        with self._h.threaded():
+            pool = get_frontier_pool()
+            list(pool.map(lambda b: b.run_branch(jac_ast), branches))
+        self.merge_branches(branches, base_ctx)
+        for i in branches:
+            if i._branch_exc:
+                raise i._branch_exc
+
+        if self.next_node_ids or self.yielded:
+            return bool(self.next_node_ids)
+        logger.debug(str(f"Final frontier of walker {self.name} complete"))
+        self.run_walker_exit(jac_ast)
+        for i in self.destroy_node_ids.obj_list():
+            if i.jid == self.current_node_id:
+                self.current_node_id = None
+            i.destroy()
+            self.destroy_node_ids.remove_obj(i)
+        return True
+
+    def frontier_branch(self, node, base_ctx):
+        """Copy of this walker with its own machine state placed on node"""
+        branch = copy(self)
+        branch._branch_of = self
+        branch._branch_exc = None
+        WalkerInterp.reset(branch)
+        branch.reset_vm()
+        branch.profile = {}
+        branch.context = deepcopy(base_ctx)
+        branch.next_node_ids = IdList(branch, auto_save=False)
+        branch.destroy_node_ids = IdList(branch, auto_save=False)
+        branch.ignore_node_ids = IdList(
+            branch, auto_save=False, in_list=self.ignore_node_ids
+        )
+        branch.current_node = node
+        return branch
+
+    def run_branch(self, jac_ast):
+        """Runs branch on a pool thread, hook calls are serialized"""
+        try:
+            with self._h.in_thread():
+                self.run_walker_on_node(jac_ast=jac_ast)
+        except Exception as e:
+            self._branch_exc = e
+        if self._stopped == "skip":
+            self._stopped = None
+
+    def merge_branches(self, branches, base_ctx):
+        """
+        Folds branches back in frontier order, later branches win
+        conflicting context writes, a disengage drops the next frontier
+        """
+        stop = False
+        for i in branches:
+            for k, v in i.context.items():
+                if k not in base_ctx or base_ctx[k] != v:
+                    self.context[k] = v
+            self.report += i.report
+            self.runtime_errors += i.runtime_errors
+            self.report_status = i.report_status or self.report_status
+            self.report_custom = i.report_custom or self.report_custom
+            for j in i.next_node_ids.obj_list():
+                self.next_node_ids.add_obj(j, allow_dups=True)
+            for j in i.ignore_node_ids.obj_list():
+                self.ignore_node_ids.add_obj(j, silent=True)
+            for j in i.destroy_node_ids.obj_list():
+                self.destroy_node_ids.add_obj(j, silent=True)
+            if self.current_step < 200:
+                self.log_history("visited", i.current_node.id)
+            self.current_step += 1
+            self.yielded = self.yielded or i.yielded
+            stop = stop or i._stopped == "stop"
+        if stop:
+            self.next_node_ids.remove_all()
+        self.current_node_id = branches[-1].current_node_id
+        self.profile["steps"] = self.current_step
+
     def prime(self, start_node, prime_ctx=None, request_ctx=None):
         """Place walker on node and get ready to step step"""
         if not self.yielded:
@@ -128,8 +274,18 @@ class Walker(Element, WalkerInterp, Anchored):
         self.profile["steps"] = self.current_step
         logger.debug(str(f"Walker {self.name} primed - {start_node}"))
 
-    def run(self, start_node=None, prime_ctx=None, request_ctx=None, profiling=False):
-        """Executes Walker to completion"""
+    def run(
+        self,
+        start_node=None,
+        prime_ctx=None,
+        request_ctx=None,
+        profiling=False,
+        parallel=False,
+    ):
+        """
+        Executes Walker to completion, parallel runs each frontier of nodes
+        on a thread pool (level by level, i.e., breadth first)
+        """
         if self.for_queue() and self._h.task.is_running():
             start_node = (
                 start_node
@@ -153,20 +309,15 @@ class Walker(Element, WalkerInterp, Anchored):
             }
 
         if profiling:
+            self._profiler = JacProfiler(self._h)
             pr = perf_test_start()
 
-        if start_node and (not self.yielded or not len(self.next_node_ids)):
-            self.prime(start_node, prime_ctx, request_ctx)
-        elif prime_ctx:
-            for i in prime_ctx.keys():
-                self.context[str(i)] = prime_ctx[i]
-
+        self.start_run(start_node, prime_ctx, request_ctx)
         report_ret = {"success": True}
-        WalkerInterp.reset(self)
-        self.yielded = False
 
+        step = self.step_frontier if parallel else self.step
         try:
-            while self.step() and not self.yielded:
+            while step() and not self.yielded:
                 pass
         except Exception as e:
             self.rt_error(f"Internal Exception: {e}", self._cur_jac_ast)
@@ -177,6 +328,68 @@ class Walker(Element, WalkerInterp, Anchored):
         if not self.report:
             logger.debug(str(f"Walker {self.name} did not have anything to report"))
         report_ret["report"] = self.report
+        self.end_run(report_ret)
+        if profiling:
+            self.profile["perf"] = perf_test_stop(pr)
+            self.profile["graph"] = perf_test_to_b64(pr)
+            self.profile["jac"] = self._profiler.stats()
+            self._profiler = None
+            report_ret["profile"] = self.profile
+
+        if self.for_queue():
+            return {"is_queued": False, "result": report_ret}
+
+        return report_ret
+
+    def run_stream(
+        self,
+        start_node=None,
+        prime_ctx=None,
+        request_ctx=None,
+        parallel=False,
+        report_cap=None,
+    ):
+        """
+        Executes Walker to completion as a generator of NDJSON, each step
+        yields a {"report": ...} line per report it made and a last line
+        holds the rest of run's result. Steps run as lines are consumed,
+        a step with more than report_cap reports is stopped
+        """
+        self.start_run(start_node, prime_ctx, request_ctx)
+        report_ret = {"success": True}
+
+        step = self.step_frontier if parallel else self.step
+        self._report_stream = report_cap or REPORT_STREAM_CAP
+        try:
+            more = True
+            while more and not self.yielded:
+                try:
+                    more = step()
+                except Exception as e:
+                    self.rt_error(f"Internal Exception: {e}", self._cur_jac_ast)
+                    report_ret["stack_trace"] = exc_stack_as_str_list()
+                    more = False
+                lines, self.report = self.report, []
+                if lines:
+                    yield "\n".join(lines) + "\n"
+        finally:
+            self._report_stream = 0
+
+        self.save()
+        self.end_run(report_ret)
+        yield json.dumps(report_ret) + "\n"
+
+    def start_run(self, start_node, prime_ctx, request_ctx):
+        if start_node and (not self.yielded or not len(self.next_node_ids)):
+            self.prime(start_node, prime_ctx, request_ctx)
+        elif prime_ctx:
+            for i in prime_ctx.keys():
+                self.context[str(i)] = prime_ctx[i]
+        WalkerInterp.reset(self)
+        self.yielded = False
+
+    def end_run(self, report_ret):
+        """Adds walk outcome besides reports to report_ret"""
         report_ret["final_node"] = self.current_node_id
         report_ret["yielded"] = self.yielded
 
@@ -187,15 +400,6 @@ class Walker(Element, WalkerInterp, Anchored):
         if len(self.runtime_errors):
             report_ret["errors"] = self.runtime_errors
             report_ret["success"] = False
-        if profiling:
-            self.profile["perf"] = perf_test_stop(pr)
-            self.profile["graph"] = perf_test_to_b64(pr)
-            report_ret["profile"] = self.profile
-
-        if self.for_queue():
-            return {"is_queued": False, "result": report_ret}
-
-        return report_ret
 
     def yield_walk(self):
         """Instructs walker to yield (stop walking and keep state)"""
@@ -245,4 +449,6 @@ class Walker(Element, WalkerInterp, Anchored):
         """
         Write self through hook to persistent storage
         """
+        if self._branch_of:  # branches are merged into their walker instead
+            return
         self._h.save_obj(caller_id=self._m_id, item=self, all_caches=self.is_async)
@@ -187,4 +187,5 @@ class ArchitypeApi:
         self.remove_arch_aliases(snt, arch)
         archid = arch.jid
         snt.arch_ids.destroy_obj(arch)
+        snt.flush_dispatch()
         return {"response": f"Architype {archid} successfully deleted", "success": True}
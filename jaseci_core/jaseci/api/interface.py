@@ -4,7 +4,7 @@ General master interface engine for client interfaces as mixin
 from inspect import signature, getdoc
 from jaseci.utils.utils import logger, is_jsonable, is_true, exc_stack_as_str_list
 from jaseci.element.element import Element
-from jaseci.actor.walker import Walker
+from jaseci.actor.walker import Walker, ReportStream
 import json
 
 
@@ -194,6 +194,8 @@ class Interface:
             return self.interface_error(
                 f"Internal Exception: {e}", stack=exc_stack_as_str_list()
             )
+        if isinstance(ret, ReportStream):
+            return ret
         if not is_jsonable(ret):
             return self.interface_error(f"Non-JSON API ret {type(ret)}: {ret}")
         return ret
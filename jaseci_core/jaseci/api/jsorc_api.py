@@ -197,6 +197,31 @@ class JsOrcApi:
         else:
             return {"success": False, "message": "No running JSORC service."}
 
+    @Interface.admin_api(cli_args=["name"])
+    def jsorc_actioncache_stats(self, name: str = ""):
+        """
+        Get hit, miss and eviction counters of cacheable actions
+        Counters of all actions with totals are returned if no name is given
+        """
+        hook = self._h
+        if hook.meta.run_svcs:
+            stats = hook.meta.app.get_action_cache_stats(name)
+            return {"success": True, "action_cache": stats}
+        else:
+            return {"success": False, "message": "No running JSORC service."}
+
+    @Interface.admin_api()
+    def jsorc_actioncache_clear(self):
+        """
+        Drop locally cached action results and reset their counters
+        """
+        hook = self._h
+        if hook.meta.run_svcs:
+            hook.meta.app.clear_action_cache()
+            return {"success": True}
+        else:
+            return {"success": False, "message": "No running JSORC service."}
+
     @Interface.admin_api()
     def jsorc_trackact_start(self):
         """ "
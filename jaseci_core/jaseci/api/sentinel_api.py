@@ -256,7 +256,7 @@ class SentinelApi:
 
     def attempt_auto_run(self, sent: Sentinel, walk_name, ctx):
         if (
-            sent.arch_ids.has_obj_by_name(walk_name, kind="walker")
+            sent.get_arch_by_name(walk_name, kind="walker", silent=True)
             and self.active_gph_id
         ):
             nd = self._h.get_obj(self._m_id, self.active_gph_id)
@@ -1,6 +1,46 @@
+import json
+from time import sleep
+
 from jaseci.graph.edge import Edge
 from jaseci.graph.node import Node
 from jaseci.utils.test_core import CoreTest
+from jaseci.hook import RedisHook
+from jaseci import benchmark
+
+
+class StoreCheckHook(RedisHook):
+    """RedisHook noting the most threads loading from the store at once"""
+
+    inside = most_inside = 0
+
+    def enter_store(self):
+        StoreCheckHook.inside += 1
+        StoreCheckHook.most_inside = max(StoreCheckHook.most_inside, self.inside)
+        sleep(0.001)
+
+    def get_obj_from_store(self, item_id):
+        self.enter_store()
+        try:
+            return super().get_obj_from_store(item_id)
+        finally:
+            StoreCheckHook.inside -= 1
+
+    def get_obj_many_from_store(self, item_ids):
+        self.enter_store()
+        try:
+            return super().get_obj_many_from_store(item_ids)
+        finally:
+            StoreCheckHook.inside -= 1
+
+
+class StoreCheckStore(benchmark.RedisStore):
+    """Redis store on fakeredis, a fresh StoreCheckHook per request"""
+
+    def build_hook(self):
+        hook = StoreCheckHook()
+        hook.meta = self.meta
+        hook.redis = self.redis
+        return hook
 
 
 class WalkerApiTest(CoreTest):
@@ -296,3 +336,119 @@ class WalkerApiTest(CoreTest):
         self.call(self.mast, ["walker_run", {"name": "error_walker_action"}])
         ret = self.call(self.mast, ["walker_run", {"name": "error_walker_action"}])
         self.assertIn('cannot execute the statement "disengage ; "', ret["errors"][0])
+
+    def test_walker_parallel_frontier(self):
+        self.call(
+            self.mast,
+            ["sentinel_register", {"code": self.load_jac("frontier.jac")}],
+        )
+        self.call(self.mast, ["walker_run", {"name": "build"}])
+        serial = self.call(self.mast, ["walker_run", {"name": "score"}])
+        ret = self.call(self.mast, ["walker_run", {"name": "score", "parallel": True}])
+        self.assertTrue(ret["success"])
+        self.assertEqual(ret["report"], serial["report"])
+        self.assertEqual(ret["report"], [0, 10, 20, 40, 50, 5])
+
+    def test_walker_parallel_frontier_commit_backed(self):
+        """Branches load from the store one at a time and their writes commit"""
+        try:
+            store = StoreCheckStore()
+        except ImportError:
+            self.skipTest("fakeredis not installed")
+        store.call(
+            "sentinel_register",
+            {"name": "frontier", "code": self.load_jac("frontier.jac"), "auto_run": ""},
+        )
+        store.snt = store.master().active_snt().jid
+        store.walk("build")
+        StoreCheckHook.most_inside = 0
+        ret = store.call(
+            "walker_run", {"name": "score", "snt": store.snt, "parallel": True}
+        )
+        self.assertEqual(ret["report"], [0, 10, 20, 40, 50, 5])
+        self.assertEqual(StoreCheckHook.most_inside, 1)
+        ret = store.walk("scores")
+        self.assertEqual(ret["report"], [0, 10, 20, 30, 40, 50])
+
+    def test_walker_parallel_frontier_disengage(self):
+        self.call(
+            self.mast,
+            ["sentinel_register", {"code": self.load_jac("frontier.jac")}],
+        )
+        self.call(self.mast, ["walker_run", {"name": "build"}])
+        ret = self.call(
+            self.mast, ["walker_run", {"name": "stopper", "parallel": True}]
+        )
+        self.assertEqual(ret["report"], [0, 1, 2, 3, 4, 5, "done"])
+
+    def test_walker_profiling(self):
+        self.call(
+            self.mast,
+            ["sentinel_register", {"code": self.load_jac("frontier.jac")}],
+        )
+        self.call(self.mast, ["walker_run", {"name": "build"}])
+        for parallel in [False, True]:
+            ret = self.call(
+                self.mast,
+                [
+                    "walker_run",
+                    {"name": "score", "profiling": True, "parallel": parallel},
+                ],
+            )
+            prof = ret["profile"]["jac"]
+            self.assertEqual(prof["nodes"]["item"]["calls"], 6)
+            self.assertEqual(prof["nodes"]["root"]["calls"], 1)
+            self.assertIn("node_ctx_block", prof["rules"])
+            line = [v for k, v in prof["lines"].items() if k.endswith(":15")][0]
+            self.assertEqual(line["calls"], 6)
+            self.assertGreaterEqual(line["incl_ms"], line["excl_ms"])
+            self.assertGreater(prof["touches"]["hook"], 0)
+
+    def test_walker_stream(self):
+        self.call(
+            self.mast,
+            ["sentinel_register", {"code": self.load_jac("frontier.jac")}],
+        )
+        self.call(self.mast, ["walker_run", {"name": "build"}])
+        stream = self.call(self.mast, ["walker_run", {"name": "stopper", "stream": 1}])
+        first = next(iter(stream))
+        self.assertEqual(first, '{"report": 0}\n')
+        rest = "".join(stream).splitlines()
+        lines = [json.loads(i) for i in [first] + rest]
+        self.assertEqual([i["report"] for i in lines[:-1]], [0, 1, 2, "done"])
+        self.assertTrue(lines[-1]["success"])
+        self.assertNotIn("report", lines[-1])
+
+        ret = self.call(self.mast, ["walker_run", {"name": "stopper"}])
+        self.assertEqual(ret["report"], [0, 1, 2, "done"])
+
+        before = len(self.mast._h.mem)
+        stream = self.call(self.mast, ["walker_run", {"name": "stopper", "stream": 1}])
+        self.assertEqual(next(iter(stream)), '{"report": 0}\n')
+        stream.close()
+        self.assertEqual(len(self.mast._h.mem), before)
+
+    def test_walker_stream_cap(self):
+        self.call(
+            self.mast,
+            ["sentinel_register", {"code": self.load_jac("frontier.jac")}],
+        )
+        self.call(self.mast, ["walker_run", {"name": "build"}])
+        wlk = self.mast.active_snt().run_architype(
+            "stopper", kind="walker", caller=self.mast
+        )
+        gph = self.mast._h.get_obj(self.mast._m_id, self.mast.active_gph_id)
+        lines = "".join(wlk.run_stream(start_node=gph, report_cap=1)).splitlines()
+        lines = [json.loads(i) for i in lines]
+        self.assertEqual([i["report"] for i in lines[:-1]], [0, 1, 2])
+        self.assertFalse(lines[-1]["success"])
+        self.assertIn("Over 1 reports in one step", lines[-1]["errors"][0])
+
+        wlk = self.mast.active_snt().run_architype(
+            "flooder", kind="walker", caller=self.mast
+        )
+        lines = "".join(wlk.run_stream(start_node=gph, report_cap=3)).splitlines()
+        lines = [json.loads(i) for i in lines]
+        self.assertEqual([i["report"] for i in lines[:-1]], [0, 1, 2])
+        self.assertEqual(len(lines[-1]["errors"]), 1)
+        self.assertFalse(wlk.context["caught"])
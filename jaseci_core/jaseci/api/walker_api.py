@@ -2,7 +2,7 @@
 Walker api functions as a mixin
 """
 from jaseci.api.interface import Interface
-from jaseci.actor.walker import Walker
+from jaseci.actor.walker import Walker, ReportStream
 from jaseci.graph.node import Node
 from jaseci.actor.sentinel import Sentinel
 from jaseci.utils.id_list import IdList
@@ -43,9 +43,7 @@ class WalkerApi:
         """
         Get total walkers known to sentinel
         """
-        objects = snt.arch_ids.obj_list()
-        walker_objects = list(filter(lambda obj: obj.kind == "walker", objects))
-        return len(walker_objects)
+        return len(snt.arch_objs(kind="walker"))
 
     @Interface.private_api()
     def walker_list(self, snt: Sentinel = None, detailed: bool = False):
@@ -53,9 +51,8 @@ class WalkerApi:
         List walkers known to sentinel
         """
         walks = []
-        for i in snt.arch_ids.obj_list():
-            if i.kind == "walker":
-                walks.append(i.serialize(detailed=detailed))
+        for i in snt.arch_objs(kind="walker"):
+            walks.append(i.serialize(detailed=detailed))
         return walks
 
     @Interface.private_api(cli_args=["name"])
@@ -161,14 +158,35 @@ class WalkerApi:
         ctx: dict = {},
         _req_ctx: dict = {},
         profiling: bool = False,
+        parallel: bool = False,
     ):
         """
-        Executes walker (assumes walker is primed)
+        Executes walker (assumes walker is primed), parallel runs each
+        frontier of nodes taken concurrently
         """
         return wlk.run(
-            start_node=prime, prime_ctx=ctx, request_ctx=_req_ctx, profiling=profiling
+            start_node=prime,
+            prime_ctx=ctx,
+            request_ctx=_req_ctx,
+            profiling=profiling,
+            parallel=parallel,
         )
 
+    def walker_stream(self, wlk, prime, ctx, _req_ctx, parallel):
+        """
+        Streamed walker_run, walker is kept or cleaned up once done or
+        once the stream is closed early, e.g., when the client disconnects
+        """
+        try:
+            yield from wlk.run_stream(
+                start_node=prime,
+                prime_ctx=ctx,
+                request_ctx=_req_ctx,
+                parallel=parallel,
+            )
+        finally:
+            wlk.register_yield_or_destroy(self.yielded_walkers_ids)
+
     @Interface.private_api(cli_args=["name"])
     def walker_run(
         self,
@@ -179,10 +197,13 @@ class WalkerApi:
         snt: Sentinel = None,
         profiling: bool = False,
         is_async: bool = None,
+        parallel: bool = False,
+        stream: bool = False,
     ):
         """
         Creates walker instance, primes walker on node, executes walker,
-        reports results, and cleans up walker instance.
+        reports results, and cleans up walker instance. With stream,
+        reports are returned as NDJSON lines while the walker runs.
         """
         wlk = self.yielded_walkers_ids.get_obj_by_name(name, silent=True)
         if wlk is None:
@@ -191,8 +212,15 @@ class WalkerApi:
             )
         if wlk is None:
             return self.bad_walk_response([f"Walker {name} not found!"])
+        if stream:
+            return ReportStream(self.walker_stream(wlk, nd, ctx, _req_ctx, parallel))
         res = self.walker_execute(
-            wlk=wlk, prime=nd, ctx=ctx, _req_ctx=_req_ctx, profiling=profiling
+            wlk=wlk,
+            prime=nd,
+            ctx=ctx,
+            _req_ctx=_req_ctx,
+            profiling=profiling,
+            parallel=parallel,
         )
         wlk.register_yield_or_destroy(self.yielded_walkers_ids)
         return res
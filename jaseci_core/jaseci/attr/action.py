@@ -4,9 +4,8 @@ Action class for Jaseci
 Each action has an id, name, timestamp and it's set of edges.
 """
 from .item import Item
-from jaseci.actions.live_actions import live_actions
-from jaseci.jac.jac_set import JacSet
-import inspect
+from jaseci.actions.live_actions import get_action_plan
+from jaseci.actions.action_cache import action_cache
 import time
 
 # ACTION_PACKAGE = 'jaseci.actions.'
@@ -28,62 +27,66 @@ class Action(Item):
         self.access_list = access_list
         Item.__init__(self, **kwargs)
 
-    def do_auto_conversions(self, args, params):
-        """
-        Automatically make conversions for jac to internal, e.g., list to jac_set
-        """
-
-        for i in args.annotations.keys():
-            if args.annotations[i] == JacSet:
-                idx = args.args.index(i)
-                if idx < len(params["args"]):
-                    params["args"][idx] = JacSet(in_list=params["args"][idx])
-                if i in params["kwargs"]:
-                    params["kwargs"][i] = JacSet(in_list=params["kwargs"][i])
-
     def trigger(self, param_list, scope, interp):
         """
         param_list should be passed as list of values to lib functions
         Also note that Jac stores preset_in_out as input/output list of hex
         ids since preset_in_out doesn't use _ids convention
         """
-        if not interp.check_builtin_action(self.value):
-            interp.rt_error(f"Cannot execute {self.value} - Not Found")
-            return None
-        func = live_actions[self.value]
-        args = inspect.getfullargspec(func)
-        self.do_auto_conversions(args, param_list)
-        args = args[0] + args[4]
+        plan = get_action_plan(self.value)
+        if plan is None:
+            if not interp.check_builtin_action(self.value):
+                interp.rt_error(f"Cannot execute {self.value} - Not Found")
+                return None
+            plan = get_action_plan(self.value)
+        func = plan.func
+        plan.convert(param_list)
         hook = scope.parent._h
         hook.meta.app.pre_action_call_hook() if hook.meta.run_svcs else None
         ts = time.time()
-        if "meta" in args:
-            result = func(
-                *param_list["args"],
-                **param_list["kwargs"],
-                meta={
-                    "m_id": scope.parent._m_id,
-                    "h": scope.parent._h,
-                    "scope": scope,
-                    "interp": interp,
-                },
-            )
-        else:
-            try:
-                result = func(*param_list["args"], **param_list["kwargs"])
-            except TypeError as e:
-                params = str(inspect.signature(func))
-                interp.rt_error(
-                    f"Invalid arguments {param_list} to action call {self.name}! Valid paramters are {params}.",
-                    interp._cur_jac_ast,
-                )
-                raise
-            except Exception as e:
-                interp.rt_error(
-                    f"Execption within action call {self.name}! {e}",
-                    interp._cur_jac_ast,
+        prof = interp._profiler
+        start = prof.start() if prof else None
+        try:
+            if plan.takes_meta:
+                result = func(
+                    *param_list["args"],
+                    **param_list["kwargs"],
+                    meta={
+                        "m_id": scope.parent._m_id,
+                        "h": scope.parent._h,
+                        "scope": scope,
+                        "interp": interp,
+                    },
                 )
-                raise
+            else:
+                try:
+                    if plan.cache_ttl is None:
+                        result = func(*param_list["args"], **param_list["kwargs"])
+                    else:
+                        result = action_cache.call(
+                            self.value,
+                            func,
+                            param_list["args"],
+                            param_list["kwargs"],
+                            ttl=plan.cache_ttl,
+                            redis=getattr(hook, "redis", None),
+                        )
+                except TypeError as e:
+                    params = plan.signature
+                    interp.rt_error(
+                        f"Invalid arguments {param_list} to action call {self.name}! Valid paramters are {params}.",
+                        interp._cur_jac_ast,
+                    )
+                    raise
+                except Exception as e:
+                    interp.rt_error(
+                        f"Execption within action call {self.name}! {e}",
+                        interp._cur_jac_ast,
+                    )
+                    raise
+        finally:
+            if prof:
+                prof.stop(start, actions=self.value)
         t = time.time() - ts
         hook.meta.app.post_action_call_hook(
             self.value, t
@@ -0,0 +1,418 @@
+"""
+Load and regression benchmarks of the walker engine
+
+Times core operations of the engine on each store it runs on: building a
+graph of N nodes and edges, take --> fan-out by degree, deep walks down a
+chain, action call overhead, sentinel_register of large programs and hook
+commit of N objects. Stores are memory (MemoryHook), redis (RedisHook on
+fakeredis) and orm (OrmHook of jaseci_serv on sqlite), those whose packages
+are not installed are skipped. Walks are timed as served, one walker_run
+followed by a commit of the hook, and on redis and orm every request gets a
+fresh hook as it does in jaseci_serv, so cold loads from the store are
+included. Redis commands and db statements issued are counted per round.
+
+Results are written as JSON laid out like pytest-benchmark's, a previous
+run can be passed in to flag cases that got slower
+
+    python -m jaseci.benchmark
+    python -m jaseci.benchmark --stores memory,redis --json bench.json
+    python -m jaseci.benchmark --quick --compare bench.json
+    jsctl bench --quick
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+from datetime import datetime
+from importlib import import_module
+from time import perf_counter
+
+import jaseci
+from jaseci.hook import MemoryHook, RedisHook
+from jaseci.jac.ir import compile_cache
+from jaseci.svc import MetaService, RedisService, ServiceState
+
+BENCH_JAC = """
+node item {
+    has val;
+}
+
+walker build_star {
+    has n;
+    hub = spawn here ++> node::item(val=-1);
+    for i=0 to i<n by i+=1:
+        spawn hub ++> node::item(val=i);
+    report hub;
+}
+
+walker build_chain {
+    has n;
+    head = spawn here ++> node::item(val=0);
+    last = head;
+    for i=1 to i<n by i+=1:
+        last = spawn last ++> node::item(val=i);
+    report head;
+}
+
+walker visit {
+    has seen = 0;
+    seen += 1;
+    take -->;
+    with exit {
+        report seen;
+    }
+}
+
+walker call_action {
+    has n;
+    for i=0 to i<n by i+=1:
+        x = std.round(1.25, 1);
+}
+
+walker call_none {
+    has n;
+    for i=0 to i<n by i+=1:
+        x = 1.25;
+}
+"""
+
+# Case params, full runs and --quick runs
+PARAMS = {
+    "graph_build": ([100, 1000], [50]),
+    "fanout": ([10, 100, 1000], [10, 100]),
+    "deep_walk": ([50, 200], [20]),
+    "action_call": ([1000], [100]),
+    "register": ([20, 100], [10]),
+    "commit": ([100, 1000], [50]),
+}
+
+STORES = {
+    "memory": "jaseci.benchmark.MemoryStore",
+    "redis": "jaseci.benchmark.RedisStore",
+    "orm": "jaseci_serv.base.benchmark.OrmStore",
+}
+
+
+class Bench:
+    """Times a function over rounds, like the pytest-benchmark fixture"""
+
+    def __init__(self, store, rounds):
+        self.store = store
+        self.rounds = rounds
+        self.times = []
+        self.extra = {}
+
+    def __call__(self, func, setup=None):
+        """Times func each round after an untimed setup and one warmup"""
+        counts = []
+        for i in range(self.rounds + 1):
+            if setup:
+                setup()
+            before = self.store.counters()
+            start = perf_counter()
+            func()
+            took = perf_counter() - start
+            if i:
+                self.times.append(took)
+                after = self.store.counters()
+                counts.append({k: v - before.get(k, 0) for k, v in after.items()})
+        for k in counts[0] if counts else []:
+            self.extra[k] = statistics.mean(i[k] for i in counts)
+
+    def stats(self):
+        return {
+            "min": min(self.times),
+            "max": max(self.times),
+            "mean": statistics.mean(self.times),
+            "median": statistics.median(self.times),
+            "stddev": statistics.stdev(self.times) if len(self.times) > 1 else 0,
+            "rounds": len(self.times),
+        }
+
+
+class MemoryStore:
+    """In memory store, requests share one hook"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.meta = MetaService(run_svcs=False)
+        self.hook = self.build_hook()
+        self.mast = self.meta.build_super_master(h=self.hook)
+        self.commit(self.hook)
+        self.mast.sentinel_register(name="bench", code=BENCH_JAC, auto_run="")
+        self.snt = self.mast.active_snt().jid
+        self.commit(self.hook)
+
+    def build_hook(self):
+        hook = MemoryHook()
+        hook.meta = self.meta
+        return hook
+
+    def request_hook(self):
+        return self.hook
+
+    def commit(self, hook):
+        hook.commit_all_cache_sync()
+        hook.commit()
+
+    def counters(self):
+        return {}
+
+    def master(self):
+        """Master as loaded by a request"""
+        hook = self.request_hook()
+        return hook.get_obj(self.mast.jid, self.mast.jid)
+
+    def call(self, api_name, params, mast=None):
+        """Serves one api call, a new request unless mast is given"""
+        mast = mast or self.master()
+        ret = mast.general_interface_to_api(api_name=api_name, params=params)
+        self.commit(mast._h)
+        return ret
+
+    def walk(self, name, nd=None, **ctx):
+        params = {"name": name, "ctx": ctx, "snt": self.snt}
+        if nd:
+            params["nd"] = nd
+        return self.call("walker_run", params)
+
+
+class RedisStore(MemoryStore):
+    """Redis store on fakeredis, counting the commands sent to it"""
+
+    name = "redis"
+
+    def __init__(self):
+        import fakeredis
+
+        class CountingRedis(fakeredis.FakeRedis):
+            calls = 0
+
+            def execute_command(self, *args, **kwargs):
+                CountingRedis.calls += 1
+                return super().execute_command(*args, **kwargs)
+
+        self.redis = RedisService(MemoryHook())
+        self.redis.app = CountingRedis(decode_responses=True)
+        self.redis.state = ServiceState.RUNNING
+        super().__init__()
+
+    def build_hook(self):
+        hook = RedisHook()
+        hook.meta = self.meta
+        hook.redis = self.redis
+        return hook
+
+    def request_hook(self):
+        return self.build_hook()
+
+    def counters(self):
+        return {"redis_calls": type(self.redis.app).calls}
+
+
+# Cases ##################
+
+
+def graph_build(bench, store, n):
+    """Walk spawning a star of n nodes and edges"""
+    bench(lambda: store.walk("build_star", n=n))
+    bench.extra["nodes"] = n + 1
+
+
+def fanout(bench, store, degree):
+    """take --> from a hub with degree children"""
+    hub = store.walk("build_star", n=degree)["report"][0]["jid"]
+    bench(lambda: store.walk("visit", nd=hub))
+    bench.extra["visited"] = store.walk("visit", nd=hub)["report"][-1]
+
+
+def deep_walk(bench, store, depth):
+    """take --> down a chain of depth nodes"""
+    head = store.walk("build_chain", n=depth)["report"][0]["jid"]
+    bench(lambda: store.walk("visit", nd=head))
+
+
+def action_call(bench, store, calls):
+    """Loop of calls to std.round, less the same loop without them"""
+    bench(lambda: store.walk("call_action", n=calls))
+    base = Bench(store, bench.rounds)
+    base(lambda: store.walk("call_none", n=calls))
+    base = base.stats()["median"]
+    bench.extra["per_call_us"] = (bench.stats()["median"] - base) / calls * 1e6
+
+
+def register(bench, store, archs):
+    """sentinel_register of a program with archs walkers and node types"""
+    code = large_program(archs)
+    names = iter(range(bench.rounds + 1))
+    bench(
+        lambda: store.call(
+            "sentinel_register",
+            {
+                "name": f"reg_{next(names)}",
+                "code": code,
+                "auto_run": "",
+                "set_active": False,
+            },
+        )
+    )
+    bench.extra["lines"] = code.count("\n")
+
+
+def commit(bench, store, n):
+    """Commit of a hook holding n new nodes"""
+    mast = None
+
+    def setup():
+        nonlocal mast
+        mast = store.master()
+        mast.general_interface_to_api(
+            api_name="walker_run",
+            params={"name": "build_star", "ctx": {"n": n - 1}, "snt": store.snt},
+        )
+
+    bench(lambda: store.commit(mast._h), setup)
+
+
+CASES = [graph_build, fanout, deep_walk, action_call, register, commit]
+
+
+def large_program(archs):
+    """Jac program with archs node types and walkers"""
+    code = []
+    for i in range(archs):
+        code.append(f"node kind_{i} {{ has a, b, c; can act with entry {{ }} }}")
+        code.append(
+            f"walker walk_{i} {{\n"
+            f"    has x = {i};\n"
+            f"    kind_{i} {{ x += here.a; take -->; }}\n"
+            f"    for j=0 to j<3 by j+=1:\n"
+            f"        if (x > j) {{ x -= 1; }} elif (x == j) {{ report x; }}\n"
+            f"    with exit {{ report x; }}\n"
+            f"}}"
+        )
+    return "\n".join(code)
+
+
+# Runner ##################
+
+
+def build_store(name):
+    """Store of name, None if packages it needs are not installed"""
+    mod, cls = STORES[name].rsplit(".", 1)
+    try:
+        return getattr(import_module(mod), cls)()
+    except ImportError as e:
+        print(f"Skipping {name} store: {e}", file=sys.stderr)
+        return None
+
+
+def run(stores=("memory", "redis", "orm"), cases=None, quick=False, rounds=5):
+    """Runs cases on stores, results in pytest-benchmark's JSON layout"""
+    cache_dir, compile_cache.JAC_CACHE_DIR = compile_cache.JAC_CACHE_DIR, ""
+    benchmarks = []
+    try:
+        for store_name in stores:
+            store = build_store(store_name)
+            if not store:
+                continue
+            for case in CASES:
+                if cases and case.__name__ not in cases:
+                    continue
+                for param in PARAMS[case.__name__][quick]:
+                    bench = Bench(store, rounds)
+                    case(bench, store, param)
+                    benchmarks.append(
+                        {
+                            "group": case.__name__,
+                            "name": f"{case.__name__}[{store_name}-{param}]",
+                            "params": {"store": store_name, "size": param},
+                            "stats": bench.stats(),
+                            "extra_info": bench.extra,
+                        }
+                    )
+    finally:
+        compile_cache.JAC_CACHE_DIR = cache_dir
+    return {
+        "machine_info": {
+            "python_version": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "commit_info": {"jaseci_version": jaseci.__version__},
+        "datetime": datetime.utcnow().isoformat(),
+        "benchmarks": benchmarks,
+    }
+
+
+def compare(results, base, threshold=0.2):
+    """Names of benchmarks whose median is over threshold slower than base"""
+    base = {i["name"]: i["stats"]["median"] for i in base["benchmarks"]}
+    slower = []
+    for i in results["benchmarks"]:
+        old = base.get(i["name"])
+        if old and i["stats"]["median"] > old * (1 + threshold):
+            slower.append(i["name"])
+    return slower
+
+
+def summarize(results, base=None):
+    base = {i["name"]: i["stats"]["median"] for i in (base or {}).get("benchmarks", [])}
+    lines = [f"{'benchmark':<34}{'median ms':>11}{'min ms':>10}{'change':>9}  extra"]
+    for i in results["benchmarks"]:
+        stats, old = i["stats"], base.get(i["name"])
+        change = f"{stats['median'] / old - 1:>+8.0%}" if old else f"{'':>8}"
+        extra = " ".join(f"{k}={v:.4g}" for k, v in i["extra_info"].items())
+        lines.append(
+            f"{i['name']:<34}{stats['median'] * 1000:>11.2f}"
+            f"{stats['min'] * 1000:>10.2f} {change}  {extra}"
+        )
+    return "\n".join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--stores", default="memory,redis,orm")
+    parser.add_argument("--cases", help="comma separated case names")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    parser.add_argument("--json", help="file to write results to")
+    parser.add_argument("--compare", help="results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(args)
+
+    results = run(
+        args.stores.split(","),
+        args.cases.split(",") if args.cases else None,
+        args.quick,
+        args.rounds,
+    )
+    return report(results, args.json, args.compare, args.threshold)
+
+
+def report(results, output=None, compare_to=None, threshold=0.2, echo=print):
+    """
+    Echoes summary of results against the run saved at compare_to and
+    saves them to output, returns 1 if any case got slower else 0
+    """
+    base = None
+    if compare_to:
+        with open(compare_to, "r") as f:
+            base = json.load(f)
+    echo(summarize(results, base))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        echo(f"[saved to {output}]")
+    if base:
+        slower = compare(results, base, threshold)
+        if slower:
+            echo(f"Slower than {compare_to}: {', '.join(slower)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
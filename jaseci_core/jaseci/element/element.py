@@ -17,10 +17,28 @@ from jaseci.element.obj_mixins import Hookable
 from jaseci.hook import MemoryHook
 from jaseci.utils.id_list import IdList
 from jaseci.utils.json_handler import JaseciJsonEncoder, json_str_to_jsci_dict
+from jaseci.utils.slot_context import SlotContext
 from jaseci.utils.utils import log_var_out, logger, camel_to_snake
 
 __version__ = "1.0.0"
 element_fields = None
+payload_plans = {}  # {class: (fields of object, fields of payload)}
+
+# Fields kept when serializing without detail
+key_fields = frozenset(
+    [
+        "name",
+        "kind",
+        "jid",
+        "j_type",
+        "context",
+        "code_sig",
+        "j_timestamp",
+        "version",
+        "to_node_id",
+        "from_node_id",
+    ]
+)
 
 
 class Element(Hookable):
@@ -133,35 +151,35 @@ class Element(Hookable):
         This grabs any fields that are added into inherited objects. Useful for
         saving and loading item.
         """
-        global element_fields
-        if element_fields is None:
-            element_fields = dir(Element(m_id=0, h=MemoryHook()))
-        obj_fields = []
-        for i in vars(self).keys():
-            if not i.startswith("_") and i not in element_fields:
-                obj_fields.append(i)
         obj_dict = {}
-        for i in obj_fields:
-            obj_dict[i] = getattr(self, i)
+        for i in self.payload_fields():
+            val = getattr(self, i)
+            obj_dict[i] = val.as_dict() if type(val) is SlotContext else val
         return json.dumps(obj_dict, cls=JaseciJsonEncoder)
 
+    def payload_fields(self):
+        """
+        Fields of jsci_payload, planned once per class and only replanned
+        for objects whose fields differ from the plan's
+        """
+        global element_fields
+        if element_fields is None:
+            element_fields = frozenset(dir(Element(m_id=0, h=MemoryHook())))
+        keys = vars(self).keys()
+        plan = payload_plans.get(type(self))
+        if plan is None or plan[0] != keys:
+            plan = (
+                frozenset(keys),
+                [i for i in keys if not i.startswith("_") and i not in element_fields],
+            )
+            payload_plans[type(self)] = plan
+        return plan[1]
+
     def serialize(self, deep=0, detailed=False):
         """
         Serialize Jaseci object
         """
         jdict = {}
-        key_fields = [
-            "name",
-            "kind",
-            "jid",
-            "j_type",
-            "context",
-            "code_sig",
-            "j_timestamp",
-            "version",
-            "to_node_id",
-            "from_node_id",
-        ]
         for i in vars(self).keys():
             if not i.startswith("_"):
                 if not detailed and i not in key_fields:
@@ -198,16 +216,19 @@ class Element(Hookable):
             if i in vars(self).keys():
                 setattr(self, i, jdict[i])
 
-    def get_deep_obj_list(self, objs=None):
+    def get_deep_obj_list(self, objs=None, seen=None):
         """Recursively get all contained Jaseci objects and return id_list"""
         if objs is None:
             objs = []
+        if seen is None:
+            seen = set(i.jid for i in objs)
         objs.append(self)
+        seen.add(self.jid)
         for i in self.__dict__.keys():
             if str(i).endswith("_ids") and isinstance(self.__dict__[i], IdList):
                 for j in self.__dict__[i].obj_list():
-                    if j not in objs:
-                        j.get_deep_obj_list(objs=objs)
+                    if j.jid not in seen:
+                        j.get_deep_obj_list(objs=objs, seen=seen)
         return objs
 
     def propagate_access(self, set_access=None):
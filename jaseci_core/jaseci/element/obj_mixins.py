@@ -11,17 +11,16 @@ import uuid
 class Anchored:
     """Utility class for objects that hold anchor values"""
 
-    arch_map = {}
-
     def __init__(self):
         self.context = {}
 
     def get_architype(self):
-        arch = self.get_arch_from_cache()  # Optimization
-        if arch and id(arch._h) == id(self._h):
-            return arch
+        return self.get_architype_for(self)
+
+    def get_architype_for(self, obj):
+        """Architype matching name and kind of obj, e.g., of an unloaded edge"""
         arch = (
-            self._h._machine.parent().get_arch_for(self)
+            self._h._machine.parent().get_arch_for(obj)
             if self._h._machine is not None
             and self._h._machine.parent() is not None
             and self._h._machine.parent().j_type == "sentinel"
@@ -29,23 +28,11 @@ class Anchored:
         )
         mast = self.get_master()
         if arch is None and mast.active_snt() is not None:
-            arch = mast.active_snt().get_arch_for(self)
+            arch = mast.active_snt().get_arch_for(obj)
         elif arch is None and self.parent() and self.parent().j_type == "sentinel":
-            arch = self.parent().get_arch_for(self)
-        self.cache_arch(arch)
+            arch = self.parent().get_arch_for(obj)
         return arch
 
-    def cache_arch(self, arch):
-        Anchored.arch_map[self.kind + self.name] = arch
-
-    def get_arch_from_cache(self):
-        if (self.kind + self.name) in Anchored.arch_map:
-            return Anchored.arch_map[self.kind + self.name]
-        return None
-
-    def flush_cache():
-        Anchored.arch_map = {}
-
     def anchor_value(self):
         """Returns value of anchor context object"""
         arch = self.get_architype()
@@ -6,14 +6,19 @@ and the to node it is pointing to.
 """
 from jaseci.element.element import Element
 from jaseci.element.obj_mixins import Anchored
+from jaseci.utils.slot_context import ContextField
 from jaseci.utils.utils import logger
 import uuid
-import sys
+
+# Edges with up to this many context fields are kept in their nodes
+FAST_EDGE_MAX_FIELDS = 42
 
 
 class Edge(Element, Anchored):
     """Edge class for Jaseci"""
 
+    context = ContextField()
+
     def __init__(self, **kwargs):
         self.from_node_id = None
         self.to_node_id = None
@@ -73,7 +78,12 @@ class Edge(Element, Anchored):
 
     def set_bidirected(self, bidirected: bool):
         """Sets/unsets edge to be bidirected"""
+        changed = bidirected != self.bidirected
         self.bidirected = bidirected
+        if changed:
+            for i in set([self.from_node_id, self.to_node_id]) - {None}:
+                node = self._h.get_obj(self._m_id, i)
+                node.smart_reindex_edge(self) if node else None
         self.save()
 
     def is_bidirected(self):
@@ -97,7 +107,7 @@ class Edge(Element, Anchored):
         return True
 
     def is_fast(self):
-        return sys.getsizeof(self.context) < 2000
+        return len(self.context) <= FAST_EDGE_MAX_FIELDS
 
     def save(self):
         """
@@ -5,10 +5,12 @@ Each node has an id, name, timestamp and it's set of edges.
 First node in list of 'member_node_ids' is designated root node
 """
 from collections import OrderedDict
+from types import SimpleNamespace
 from jaseci.element.element import Element
 from jaseci.element.obj_mixins import Anchored
 from jaseci.graph.edge import Edge
 from jaseci.utils.id_list import IdList
+from jaseci.utils.slot_context import ContextField
 from jaseci.utils.utils import logger
 
 import uuid
@@ -18,13 +20,102 @@ FROM = 1
 BI = 2
 
 
+class EdgeIndex:
+    """
+    Adjacency index of a node's edges by direction and edge name
+
+    Entries keep a sequence number so lookups come back in the order edges
+    were added to the node (the same order as smart_edges)
+    """
+
+    def __init__(self, node_id):
+        self.node_id = node_id
+        self.seq = 0
+        self.edges = {}  # {EDGEID: (SEQ, NAME, FROMID, TOID, BIDIRECTED)}
+        self.buckets = {TO: {}, FROM: {}, BI: {}}  # {DIR: {NAME: {EDGEID: SEQ}}}
+
+    def directions(self, from_id, to_id, bidirected):
+        """Directions edge is seen with from this node (self loops are both)"""
+        if bidirected:
+            return [BI]
+        dirs = []
+        if from_id == self.node_id:
+            dirs.append(TO)
+        if to_id == self.node_id:
+            dirs.append(FROM)
+        return dirs
+
+    def add(self, edge_id, name, from_id, to_id, bidirected, keep_order=False):
+        """Adds edge to index, re-adding an edge moves it to the end"""
+        seq = self.remove(edge_id)
+        if seq is None or not keep_order:
+            self.seq += 1
+            seq = self.seq
+        self.edges[edge_id] = (seq, name, from_id, to_id, bidirected)
+        for d in self.directions(from_id, to_id, bidirected):
+            self.buckets[d].setdefault(name, {})[edge_id] = seq
+
+    def remove(self, edge_id):
+        """Removes edge from index, returns its sequence number if found"""
+        entry = self.edges.pop(edge_id, None)
+        if entry is None:
+            return None
+        seq, name, from_id, to_id, bidirected = entry
+        for d in self.directions(from_id, to_id, bidirected):
+            bucket = self.buckets[d][name]
+            bucket.pop(edge_id, None)
+            if not len(bucket):
+                del self.buckets[d][name]
+        return seq
+
+    def names(self, direction):
+        return list(self.buckets[direction].keys())
+
+    def connects(self, edge_id, direction, node_id):
+        """Same semantic as Edge.connects from this node to node_id"""
+        _, _, from_id, to_id, _ = self.edges[edge_id]
+        if direction == TO:
+            return to_id == node_id
+        if direction == FROM:
+            return from_id == node_id
+        return node_id in (from_id, to_id)
+
+    def opposing_id(self, edge_id):
+        _, _, from_id, to_id, _ = self.edges[edge_id]
+        return from_id if to_id == self.node_id else to_id
+
+    def lookup(self, direction, names=None, node_id=None):
+        """
+        Ids of edges in direction having one of names (all if None) and
+        connecting to node_id if given, in the order they were added
+        """
+        bucket = self.buckets[direction]
+        found = []
+        for i in bucket.keys() if names is None else names:
+            found += bucket.get(i, {}).items()
+        found.sort(key=lambda x: x[1])
+        return [
+            i
+            for i, _ in found
+            if node_id is None or self.connects(i, direction, node_id)
+        ]
+
+    def all_ids(self):
+        """Ids of all edges in the order they were added"""
+        return sorted(self.edges.keys(), key=lambda x: self.edges[x][0])
+
+
 class Node(Element, Anchored):
     """Node class for Jaseci"""
 
+    context = ContextField()
+
     def __init__(self, dimension=0, **kwargs):
         self.edge_ids = IdList(self)
         self.fast_edges = {}  # {name: [[NODEID, DIR, EDGEID, CONTEXT],...]}
+        self.slow_edges = {}  # {name: [[NODEID, DIR, EDGEID],...]}
         self._fast_edge_ids = IdList(self)
+        self._edge_index = None
         self.parent_node_ids = IdList(self)
         self.member_node_ids = IdList(self)
         self.dimension = dimension  # Nodes are always hdgd 0
@@ -37,6 +128,7 @@ class Node(Element, Anchored):
         for i in obj_list:
             if i.is_fast() and i.jid in self.edge_ids:
                 self.edge_ids.remove_obj(i)
+                self.smart_remove_slow_edge(i)
                 self._fast_edge_ids.remove_obj(i)
                 self.smart_add_edge(i)
         return obj_list
@@ -47,49 +139,202 @@ class Node(Element, Anchored):
             self.smart_build_fast_edge_ids()
         return self._fast_edge_ids
 
+    @property
+    def edge_index(self):
+        if self._edge_index is None:
+            self.smart_build_edge_index()
+        return self._edge_index
+
+    def serialize(self, deep=0, detailed=False):
+        """Serialize node, contexts in its fast edge entries as plain dicts"""
+        jdict = super().serialize(deep, detailed)
+        if "fast_edges" in jdict:
+            jdict["fast_edges"] = {
+                k: [i[:3] + [dict(i[3])] if len(i) > 3 else list(i) for i in v]
+                for k, v in self.fast_edges.items()
+            }
+        return jdict
+
     def smart_build_fast_edge_ids(self):
-        self._fast_edge_ids = IdList(self, in_list=self.edge_ids)
-        for k in self.fast_edges.keys():
-            for v in self.fast_edges[k]:
-                link_order = [v[0], self.jid] if v[1] == FROM else [self.jid, v[0]]
-                edge = Edge(
-                    m_id=self._m_id, h=self._h, kind="edge", name=k, auto_save=False
-                )
-                edge.from_node_id = link_order[0]
-                edge.to_node_id = link_order[1]
-                edge.bidirected = v[1] == BI
-                edge.jid = v[2] if len(v) > 2 else uuid.uuid4().urn
-                edge.context = v[3] if len(v) > 3 else {}
-                edge.save()
-                self._fast_edge_ids.add_obj(edge)
+        self._fast_edge_ids = IdList(
+            self,
+            in_list=[i.jid for i in self.smart_edge_objs(self.edge_index.all_ids())],
+        )
+
+    def smart_build_fast_edge(self, name, details):
+        """
+        Returns edge object for a fast edge entry, reusing the cached object
+        if the edge was already built (e.g., from the other node's side)
+        """
+        if len(details) < 3:
+            details.append(uuid.uuid4().urn)
+        if len(details) < 4:
+            details.append({})
+        if self._h.has_id_in_mem_cache(details[2]):
+            return self._h.get_obj(self._m_id, details[2])
+        link_order = self.edge_entry_link_order(details)
+        edge = Edge(m_id=self._m_id, h=self._h, kind="edge", name=name, auto_save=False)
+        edge.from_node_id = link_order[0]
+        edge.to_node_id = link_order[1]
+        edge.bidirected = details[1] == BI
+        edge.jid = details[2]
+        edge.context = details[3]
+        details[3] = edge.context
+        edge.j_parent = self.jid
+        edge.save()
+        return edge
+
+    def edge_entry_link_order(self, details):
+        """From and to node ids of a fast or slow edge entry"""
+        return [details[0], self.jid] if details[1] == FROM else [self.jid, details[0]]
+
+    def smart_build_edge_index(self):
+        """
+        Builds adjacency index from edges already loaded, or from the
+        persisted slow and fast edge entries without loading any edges
+        """
+        index = EdgeIndex(self.jid)
+        if len(self._fast_edge_ids):
+            for i in self._fast_edge_ids.obj_list():
+                index.add(i.jid, i.name, i.from_node_id, i.to_node_id, i.bidirected)
+            self._edge_index = index
+            return
+        entries = self.smart_slow_edge_entries()
+        for i in self.edge_ids:
+            name, details = entries[i]
+            link_order = self.edge_entry_link_order(details)
+            index.add(i, name, link_order[0], link_order[1], details[1] == BI)
+        for k, entries in self.fast_edges.items():
+            for v in entries:
+                if len(v) < 3:
+                    v.append(uuid.uuid4().urn)
+                link_order = self.edge_entry_link_order(v)
+                index.add(v[2], k, link_order[0], link_order[1], v[1] == BI)
+        self._edge_index = index
+
+    def smart_slow_edge_entries(self):
+        """
+        Slow edge entries by edge id, entries missing for edge ids (nodes
+        saved before slow edges were kept) are filled in from their edges,
+        the fill is kept in memory until the node is next saved
+        """
+        entries = {v[2]: (k, v) for k, vs in self.slow_edges.items() for v in vs}
+        missing = [i for i in self.edge_ids if i not in entries]
+        if not len(missing):
+            return entries
+        for i, obj in zip(missing, self._h.get_obj_many(self._m_id, missing)):
+            if not obj:
+                logger.critical(self.edge_ids.obj_for_id_not_exist_error(i))
+            else:
+                self.smart_edge_to_slow_edge(obj)
+        self.edge_ids.heal()
+        return {v[2]: (k, v) for k, vs in self.slow_edges.items() for v in vs}
+
+    def smart_edge_objs(self, edge_ids):
+        """
+        Returns edge objects for ids, fast edges not yet in cache are built
+        from their fast edge entries
+        """
+        slow_ids = set(self.edge_ids)
+        missing = set(
+            i
+            for i in edge_ids
+            if i not in slow_ids and not self._h.has_id_in_mem_cache(i)
+        )
+        built = {}
+        if len(missing):
+            for k, entries in self.fast_edges.items():
+                for v in entries:
+                    if len(v) > 2 and v[2] in missing:
+                        built[v[2]] = self.smart_build_fast_edge(k, v)
+        objs = self._h.get_obj_many(self._m_id, [i for i in edge_ids if i not in built])
+        objs.reverse()
+        ret = []
+        for i in edge_ids:
+            obj = built[i] if i in built else objs.pop()
+            if obj:
+                ret.append(obj)
+        return ret
 
     def smart_add_edge(self, obj):
-        # make sure fast edges built
-        if not len(self._fast_edge_ids):
-            self.smart_build_fast_edge_ids()
-        # add new edge
-        self._fast_edge_ids.add_obj(obj)
+        # index keeps insertion order, edge objects list is built from it
+        # on demand so fast edges aren't all loaded to add one
+        self.edge_index.add(
+            obj.jid, obj.name, obj.from_node_id, obj.to_node_id, obj.bidirected
+        )
+        if len(self._fast_edge_ids):
+            self._fast_edge_ids.add_obj(obj)
         # then store how needed
         if obj.is_fast():
             self.smart_edge_to_fast_edge(obj)
-        else:
+        elif obj.jid not in self.edge_ids:
             self.edge_ids.add_obj(obj)
+            self.smart_edge_to_slow_edge(obj)
+
+    def fast_edge_direction(self, obj):
+        return (
+            BI if obj.is_bidirected() else TO if obj.from_node_id == self.jid else FROM
+        )
 
     def smart_edge_to_fast_edge(self, obj):
         if obj.name not in self.fast_edges:
             self.fast_edges[obj.name] = []
         details = [
-            obj.opposing_node(self).jid,
-            BI if obj.is_bidirected() else TO if obj.from_node() == self else FROM,
+            obj.from_node_id if obj.to_node_id == self.jid else obj.to_node_id,
+            self.fast_edge_direction(obj),
             obj.jid,
             obj.context,
         ]
         self.fast_edges[obj.name].append(details)
 
+    def smart_edge_to_slow_edge(self, obj):
+        if obj.name not in self.slow_edges:
+            self.slow_edges[obj.name] = []
+        details = [
+            obj.from_node_id if obj.to_node_id == self.jid else obj.to_node_id,
+            self.fast_edge_direction(obj),
+            obj.jid,
+        ]
+        self.slow_edges[obj.name].append(details)
+
+    def smart_remove_slow_edge(self, obj):
+        self.smart_remove_slow_edge_id(obj.jid, obj.name)
+
+    def smart_remove_slow_edge_id(self, edge_id, name=None):
+        for k in [name] if name in self.slow_edges else list(self.slow_edges):
+            entries = self.slow_edges[k]
+            for i in entries:
+                if i[2] == edge_id:
+                    entries.remove(i)
+                    if not len(entries):
+                        del self.slow_edges[k]
+                    return
+
+    def smart_reindex_edge(self, obj):
+        """Refreshes direction of edge after it changes to/from bidirected"""
+        entries = self.fast_edges if obj.is_fast() else self.slow_edges
+        for i in entries.get(obj.name, []):
+            if len(i) > 2 and i[2] == obj.jid:
+                i[1] = self.fast_edge_direction(obj)
+        if self._edge_index is not None:
+            self._edge_index.add(
+                obj.jid,
+                obj.name,
+                obj.from_node_id,
+                obj.to_node_id,
+                obj.bidirected,
+                keep_order=True,
+            )
+        self.save()
+
     def smart_remove_edge(self, obj):
         if obj.is_fast():
             pluck = None
             for i in self.fast_edges[obj.name]:
+                if len(i) > 2 and i[2] == obj.jid:
+                    pluck = i
+                    break
+            for i in self.fast_edges[obj.name] if pluck is None else []:
                 other_node_id = obj.to_node_id if i[1] == TO else obj.from_node_id
                 if i[0] == other_node_id:
                     if obj.is_bidirected() or not (
@@ -102,11 +347,16 @@ class Node(Element, Anchored):
                 del self.fast_edges[obj.name]
         elif obj and obj.jid in self.edge_ids:
             self.edge_ids.remove_obj(obj)
-        self.clear_fast_edge_ids()
+            self.smart_remove_slow_edge(obj)
+        if obj.jid in self._fast_edge_ids:
+            self._fast_edge_ids.remove_obj(obj)
+        if self._edge_index is not None:
+            self._edge_index.remove(obj.jid)
         self.save()
 
     def clear_fast_edge_ids(self):
         self._fast_edge_ids = IdList(self)
+        self._edge_index = None
 
     def attach(self, node_obj, edge_set=None, as_outbound=True, as_bidirected=False):
         """
@@ -299,29 +549,50 @@ class Node(Element, Anchored):
                     return False
         return True
 
+    def indexed_edges(self, directions, edge_type=None, node_obj=None):
+        """
+        Returns edges in directions (TO, FROM, BI) using the adjacency index,
+        optionally only edges of edge_type (or types derived from it) and
+        edges connecting to node_obj. Only matching edges are loaded
+        """
+        index = self.edge_index
+        edge_ids = []
+        for d in directions:
+            names = None
+            if edge_type is not None:
+                names = [i for i in index.names(d) if self.edge_name_is_a(i, edge_type)]
+            edge_ids += index.lookup(d, names, node_obj.jid if node_obj else None)
+        return self.smart_edge_objs(edge_ids)
+
+    def edge_name_is_a(self, name, edge_type):
+        """
+        Checks edge type once per edge name rather than per edge, by the
+        edge architype of name so no edge has to be loaded
+        """
+        if name == edge_type:
+            return True
+        arch = self.get_architype_for(SimpleNamespace(name=name, kind="edge"))
+        return arch is not None and arch.is_instance(edge_type)
+
+    def indexed_nodes(self, directions):
+        """Returns nodes on the far side of edges in directions"""
+        index = self.edge_index
+        node_ids = []
+        for d in directions:
+            node_ids += [index.opposing_id(i) for i in index.lookup(d)]
+        return self._h.get_obj_many(self._m_id, node_ids)
+
     def outbound_edges(self, node_obj=None):
         """Returns list of all edges out of node"""
-        edge_set = []
-        for e in self.smart_edges:
-            if not e.is_bidirected() and e.connects(self, node_obj):
-                edge_set.append(e)
-        return edge_set
+        return self.indexed_edges([TO], node_obj=node_obj)
 
     def inbound_edges(self, node_obj=None):
         """Returns list of all edges in to node"""
-        edge_set = []
-        for e in self.smart_edges:
-            if not e.is_bidirected() and e.connects(node_obj, self):
-                edge_set.append(e)
-        return edge_set
+        return self.indexed_edges([FROM], node_obj=node_obj)
 
     def bidirected_edges(self, node_obj=None):
         """Returns list of all edges between nodes"""
-        edge_set = []
-        for e in self.smart_edges:
-            if e.is_bidirected() and e.connects(self, node_obj):
-                edge_set.append(e)
-        return edge_set
+        return self.indexed_edges([BI], node_obj=node_obj)
 
     def attached_edges(self, node_obj=None, silent=False):
         """
@@ -330,11 +601,7 @@ class Node(Element, Anchored):
         silent is used to indicate whther the edge is intened to be used.
         (effectively turns off error checking when false)
         """
-        edge_set = (
-            self.outbound_edges(node_obj)
-            + self.inbound_edges(node_obj)
-            + self.bidirected_edges(node_obj)
-        )
+        edge_set = self.indexed_edges([TO, FROM, BI], node_obj=node_obj)
         if not silent and edge_set is None:
             logger.error(str(f"No edges found between {self} and {node_obj}"))
         return edge_set
@@ -342,7 +609,8 @@ class Node(Element, Anchored):
     def outbound_nodes(self, edge_set=None):
         """Returns list of all nodes connected by edges out"""
         if edge_set is None:
-            edge_set = self.smart_edges
+            return self.indexed_nodes([TO])
+        self.prefetch_opposing_nodes(edge_set)
         ret_list = []
         for e in edge_set:
             if not e.is_bidirected() and e.connects(source=self):
@@ -352,7 +620,8 @@ class Node(Element, Anchored):
     def inbound_nodes(self, edge_set=None):
         """Returns list of all nodes connected by edges in"""
         if edge_set is None:
-            edge_set = self.smart_edges
+            return self.indexed_nodes([FROM])
+        self.prefetch_opposing_nodes(edge_set)
         ret_list = []
         for e in edge_set:
             if not e.is_bidirected() and e.connects(target=self):
@@ -362,7 +631,8 @@ class Node(Element, Anchored):
     def bidirected_nodes(self, edge_set=None):
         """Returns list of all nodes connected by edges"""
         if edge_set is None:
-            edge_set = self.smart_edges
+            return self.indexed_nodes([BI])
+        self.prefetch_opposing_nodes(edge_set)
         ret_list = []
         for e in edge_set:
             if e.is_bidirected():
@@ -371,11 +641,20 @@ class Node(Element, Anchored):
 
     def attached_nodes(self):
         """Returns list of all nodes connected"""
-        edge_set = self.smart_edges
-        ret_list = []
-        for e in edge_set:
-            ret_list.append(e.opposing_node(self))
-        return ret_list
+        index = self.edge_index
+        return self._h.get_obj_many(
+            self._m_id, [index.opposing_id(i) for i in index.all_ids()]
+        )
+
+    def prefetch_opposing_nodes(self, edge_set):
+        """Loads nodes on the far side of edges into cache with one batch"""
+        self._h.get_obj_many(
+            self._m_id,
+            [
+                e.from_node_id if e.to_node_id == self.jid else e.to_node_id
+                for e in edge_set
+            ],
+        )
 
     def dimension_matches(self, node_obj, silent=True):
         """Test if dimension matches another node"""
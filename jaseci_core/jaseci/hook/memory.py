@@ -1,6 +1,24 @@
 from json import dumps, loads
+from contextlib import contextmanager
+from functools import wraps
+from threading import RLock
 import sys
 from jaseci.utils.utils import find_class_and_import
+from jaseci.utils.id_list import IdList
+from jaseci.utils.mem_cache import MemCache, MEM_CACHE_CONFIG, deep_size
+
+
+def locked(func):
+    """Hook method run holding the hook's lock, when it has one"""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._lock is None:
+            return func(self, *args, **kwargs)
+        with self._lock:
+            return func(self, *args, **kwargs)
+
+    return wrapper
 
 
 class MemoryHook:
@@ -11,13 +29,17 @@ class MemoryHook:
     to the objects. They return jaseci core types.
     """
 
+    mem_cache_config = MEM_CACHE_CONFIG
+
     def __init__(self):
         from jaseci.actions.live_actions import get_global_actions
 
-        self.mem = {"global": {}}
+        self.mem = self.build_mem_cache()
         self._machine = None
+        self._lock = None
         self.save_obj_list = set()
         self.save_glob_dict = {}
+        self.hook_touch_count = 0
 
     ####################################################
     #               COMMON GETTER/SETTER               #
@@ -25,30 +47,55 @@ class MemoryHook:
 
     # --------------------- OBJ ---------------------- #
 
+    @locked
     def get_obj(self, caller_id, item_id, override=False):
         """
         Get item from session cache by id, then try store
         TODO: May need to make this an object copy so you cant do mem writes
         """
+        self.hook_touch_count += 1
         ret = self.get_obj_from_store(item_id)
         if override or (ret is not None and ret.check_read_access(caller_id)):
             return ret
 
+    @locked
+    def get_obj_many(self, caller_id, item_ids, override=False):
+        """
+        Get list of items from session cache by ids, then try store with a
+        single batched lookup for the misses. Returned list is aligned with
+        item_ids and holds None for items not found or not accessible
+        """
+        self.hook_touch_count += len(item_ids)
+        found = self.get_obj_many_from_store(item_ids)
+        ret = []
+        for i in item_ids:
+            obj = found.get(i)
+            if override or (obj is not None and obj.check_read_access(caller_id)):
+                ret.append(obj)
+            else:
+                ret.append(None)
+        return ret
+
+    @locked
     def has_obj(self, item_id):
         """
         Checks for object existance
         """
         return self.has_obj_in_store(item_id)
 
+    @locked
     def save_obj(self, caller_id, item, all_caches=False):
         """Save item to session cache, then to store"""
+        self.hook_touch_count += 1
         if item.check_write_access(caller_id):
-            self.commit_obj_to_cache(item, all_caches=all_caches)
             if item._persist:
                 self.save_obj_list.add(item)
+            self.commit_obj_to_cache(item, all_caches=all_caches)
 
+    @locked
     def destroy_obj(self, caller_id, item):
         """Destroy item from session cache then  store"""
+        self.hook_touch_count += 1
         if item.check_write_access(caller_id):
             self.decommit_obj_from_cache(item)
             if item._persist:
@@ -56,12 +103,14 @@ class MemoryHook:
 
     # --------------------- GLOB --------------------- #
 
+    @locked
     def get_glob(self, name):
         """
         Get global config from session cache by id, then try store
         """
         return self.get_glob_from_store(name)
 
+    @locked
     def has_glob(self, name):
         """
         Checks for global config existance
@@ -77,6 +126,7 @@ class MemoryHook:
         else:
             return default
 
+    @locked
     def save_glob(self, name, value, persist=True):
         """Save global config to session cache, then to store"""
         self.commit_glob_to_cache(name, value)
@@ -84,10 +134,12 @@ class MemoryHook:
         if persist:
             self.save_glob_dict[name] = value
 
+    @locked
     def list_glob(self):
         """Lists all configs present"""
         return self.list_glob_from_store()
 
+    @locked
     def destroy_glob(self, name, persist=True):
         """Destroy global config from session cache then store"""
         self.decommit_glob_from_cache(name)
@@ -95,6 +147,26 @@ class MemoryHook:
         if persist:
             self.destroy_glob_from_store(name)
 
+    # -------------------- THREADS ------------------- #
+
+    @contextmanager
+    def threaded(self):
+        """
+        Serializes calls into the hook while walker branches run on pool
+        threads, each running its work within in_thread
+        """
+        outer = self._lock
+        self._lock = outer or RLock()
+        try:
+            yield
+        finally:
+            self._lock = outer
+
+    @contextmanager
+    def in_thread(self):
+        """Wraps the work a pool thread does with the hook"""
+        yield
+
     # ----------------- SERVICE GLOB ----------------- #
 
     def service_glob(self, name, val):
@@ -118,6 +190,13 @@ class MemoryHook:
 
         return None
 
+    def get_obj_many_from_store(self, item_ids):
+        """
+        Get dict of items keyed by id from externally hooked general store,
+        ids not found are left out
+        """
+        return {i: self.mem[i] for i in item_ids if i in self.mem}
+
     def has_obj_in_store(self, item_id):
         """
         Checks for object existance in store
@@ -169,6 +248,7 @@ class MemoryHook:
             self.commit_glob_to_cache(name=i, value=self.save_glob_dict[i])
 
         self.save_glob_dict = {}
+        self.trim_mem_cache()
 
     ###################################################
     #   CACHE CONTROL (SHOULD NOT OVERRIDEN ON ORM)   #
@@ -184,15 +264,19 @@ class MemoryHook:
 
     # --------------------- OBJ --------------------- #
 
+    @locked
     def has_id_in_mem_cache(self, id):
         return id is not None and id in self.mem
 
     def commit_obj_to_cache(self, item, all_caches=False):
         self.mem[item.jid] = item
 
+    def commit_obj_list_to_cache(self, items, all_caches=True):
+        for i in items:
+            self.commit_obj_to_cache(i, all_caches=all_caches)
+
     def commit_all_cache_sync(self):
-        for i in self.save_obj_list:
-            self.commit_obj_to_cache(i, all_caches=True)
+        self.commit_obj_list_to_cache(self.save_obj_list)
 
     def decommit_obj_from_cache(self, item):
         self.mem.pop(item.jid)
@@ -201,19 +285,99 @@ class MemoryHook:
     # ------------------ UTILITIES ------------------- #
     ####################################################
 
-    def get_object_distribution(self):
+    def get_object_distribution(self, sizes=False):
+        """
+        Count of cached objects per type, with sizes set each entry is
+        a dict of count and deep size estimate in bytes
+        """
         dist = {}
-        for i in self.mem.keys():
-            t = type(self.mem[i])
-            if t in dist.keys():
+        for i in list(self.mem.keys()):
+            t = type(dict.__getitem__(self.mem, i))
+            if sizes:
+                if t not in dist:
+                    dist[t] = {"count": 0, "bytes": 0}
+                dist[t]["count"] += 1
+                dist[t]["bytes"] += self.mem_item_size(i)
+            elif t in dist.keys():
                 dist[t] += 1
             else:
                 dist[t] = 1
         return dist
 
+    def mem_item_size(self, key):
+        if isinstance(self.mem, MemCache):
+            return self.mem.item_size(key)
+        return deep_size(self.mem[key])
+
     def mem_size(self):
+        """Size of mem cache in kb, deep estimate when cache is bounded"""
+        if isinstance(self.mem, MemCache) and self.mem.max_bytes:
+            return self.mem.total_bytes() / 1024
         return sys.getsizeof(self.mem) / 1024
 
+    def mem_deep_size(self):
+        """Deep size estimate of all cached objects in kb"""
+        return sum(self.mem_item_size(i) for i in list(self.mem.keys())) / 1024
+
+    ###################################################
+    #                  CACHE BOUNDS                   #
+    ###################################################
+
+    def build_mem_cache(self, items=None):
+        """
+        Build mem cache per mem_cache_config, unbounded caches stay a
+        plain dict so lookups carry no bookkeeping
+        """
+        config = self.mem_cache_config
+        if config.get("mode", "unbounded") == "unbounded":
+            mem = {}
+        else:
+            mem = MemCache(
+                evictable=self.is_evictable, on_evict=self.drop_evicted_refs, **config
+            )
+        mem["global"] = {}
+        if items:
+            mem.update(items)
+        return mem
+
+    def set_mem_cache(self, mode="unbounded", max_objs=0, max_bytes=0):
+        """Reconfigure mem cache bounds keeping currently cached items"""
+        self.mem_cache_config = {
+            "mode": mode,
+            "max_objs": max_objs,
+            "max_bytes": max_bytes,
+        }
+        self.mem = self.build_mem_cache(items=dict(self.mem))
+
+    def is_evictable(self, item):
+        """
+        Whether item may be dropped from mem cache, mem is the only store
+        for this hook so nothing is
+        """
+        return False
+
+    def drop_evicted_refs(self, items):
+        """
+        Resets object caches of id lists on evicted items and on their
+        cached parents, so objects evicted are not kept alive by the objects
+        still cached
+        """
+        holders = {id(i): i for i in items}
+        for i in items:
+            parent = dict.get(self.mem, getattr(i, "j_parent", None) or "")
+            if parent is not None:
+                holders[id(parent)] = parent
+        for i in holders.values():
+            for j in vars(i).values() if hasattr(i, "__dict__") else []:
+                if type(j) is IdList and len(j.cached_objects):
+                    j.cache_reset()
+
+    def trim_mem_cache(self):
+        """Evict now clean items if mem cache is over its bounds"""
+        if isinstance(self.mem, MemCache):
+            return self.mem.trim()
+        return 0
+
     ###################################################
     #                  CLASS CONTROL                  #
     ###################################################
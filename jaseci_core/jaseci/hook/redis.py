@@ -40,18 +40,41 @@ class RedisHook(MemoryHook):
             loaded_obj = self.redis.get(item_id)
             if loaded_obj:
                 self.red_touch_count += 1
-                jdict = json.loads(loaded_obj, cls=JaseciJsonDecoder)
-                j_type = jdict["j_type"]
-                j_master = jdict["j_master"]
-                class_for_type = self.find_class_and_import(j_type, core_mod)
-                ret_obj = class_for_type(h=self, m_id=j_master, auto_save=False)
-                ret_obj.json_load(loaded_obj)
-
-                super().commit_obj_to_cache(ret_obj)
-                return ret_obj
+                return self.load_obj_from_redis(loaded_obj)
 
         return obj
 
+    def get_obj_many_from_store(self, item_ids):
+        """
+        Get dict of items keyed by id from externally hooked general store,
+        misses in memory are fetched with a single redis MGET
+        """
+        objs = super().get_obj_many_from_store(item_ids)
+        missing = [i for i in dict.fromkeys(item_ids) if i not in objs]
+
+        if missing and self.redis.is_running():
+            for item_id, loaded_obj in zip(missing, self.redis.mget(missing)):
+                if loaded_obj:
+                    self.red_touch_count += 1
+                    objs[item_id] = self.load_obj_from_redis(loaded_obj)
+
+        return objs
+
+    def load_obj_from_redis(self, loaded_obj):
+        """
+        Build jaseci object from redis json blob and commit it to mem cache
+        """
+        jdict = json.loads(loaded_obj, cls=JaseciJsonDecoder)
+        j_type = jdict["j_type"]
+        j_master = jdict["j_master"]
+        j_access = jdict.get("j_access")
+        class_for_type = self.find_class_and_import(j_type, core_mod)
+        ret_obj = class_for_type(h=self, m_id=j_master, mode=j_access, auto_save=False)
+        ret_obj.json_load(loaded_obj)
+
+        super().commit_obj_to_cache(ret_obj)
+        return ret_obj
+
     def has_obj_in_store(self, item_id):
         """
         Checks for object existance in store
@@ -119,6 +142,20 @@ class RedisHook(MemoryHook):
         if all_caches and item._persist and self.redis.is_running():
             self.redis.set(item.jid, item.json(detailed=True))
 
+    def commit_obj_list_to_cache(self, items, all_caches=True):
+        """
+        Commit items to mem cache then write persisted ones to redis with
+        a single MSET
+        """
+        push = all_caches and self.redis.is_running()
+        blobs = {}
+        for i in items:
+            super().commit_obj_to_cache(i)
+            if push and i._persist:
+                blobs[i.jid] = i.json(detailed=True)
+        if blobs:
+            self.redis.mset(blobs)
+
     def decommit_obj_from_cache(self, item):
         super().decommit_obj_from_cache(item)
 
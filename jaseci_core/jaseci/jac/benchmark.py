@@ -0,0 +1,97 @@
+"""
+Parse time benchmark for the Jac front end
+
+Builds the ast of every .jac file under the given paths (by default the
+repo's examples/ and the test fixtures across the repo) with full LL
+prediction and with SLL first prediction. Each mode starts from empty
+prediction caches, the first round is reported as cold and the rest as
+warm. The compile cache is turned off so every file is parsed
+
+    python -m jaseci.jac.benchmark
+    python -m jaseci.jac.benchmark path/to/code --rounds 5
+"""
+import argparse
+import glob
+import os
+from time import perf_counter
+
+from antlr4.dfa.DFA import DFA
+from antlr4.PredictionContext import PredictionContextCache
+
+from jaseci.jac.ir import compile_cache
+from jaseci.jac.ir.ast_builder import JacAstBuilder, JacATNSimulator
+from jaseci.jac.jac_parse.jacLexer import jacLexer
+from jaseci.jac.jac_parse.jacParser import jacParser
+
+REPO_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+
+def default_paths():
+    """examples/ and test fixtures when run from a source checkout"""
+    paths = [os.path.join(REPO_DIR, "examples")]
+    paths += glob.glob(os.path.join(REPO_DIR, "**/tests/**/"), recursive=True)
+    return [i for i in paths if os.path.isdir(i)]
+
+
+def find_files(paths):
+    files = set()
+    for path in paths:
+        if os.path.isfile(path):
+            files.add(os.path.realpath(path))
+        for i in glob.glob(os.path.join(path, "**/*.jac"), recursive=True):
+            files.add(os.path.realpath(i))
+    return sorted(files)
+
+
+def reset_caches():
+    """Clears antlr's prediction caches so the next parse starts cold"""
+    for recog in [jacParser, jacLexer]:
+        recog.decisionsToDFA = [
+            DFA(ds, i) for i, ds in enumerate(recog.atn.decisionToState)
+        ]
+    jacParser.sharedContextCache = PredictionContextCache()
+    JacATNSimulator.ll_decisions.clear()
+
+
+def parse_all(sources):
+    """Seconds to build asts of sources, and number with parse errors"""
+    errors = 0
+    start = perf_counter()
+    for path, text in sources:
+        JacAstBuilder._ast_head_map = {}
+        tree = JacAstBuilder(
+            mod_name=os.path.basename(path),
+            mod_dir=os.path.dirname(path) + "/",
+            jac_text=text,
+        )
+        errors += bool(tree._parse_errors)
+    return perf_counter() - start, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("paths", nargs="*", help="files or dirs of jac code")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    compile_cache.JAC_CACHE_DIR = ""
+    sources = []
+    for path in find_files(args.paths or default_paths()):
+        with open(path, "r") as f:
+            sources.append((path, f.read()))
+    lines = sum(text.count("\n") + 1 for _, text in sources)
+    print(f"{len(sources)} files, {lines} lines")
+
+    print(f"{'mode':>6} {'cold s':>8} {'warm s':>8} {'lines/s':>9} {'errors':>7}")
+    for mode in ["ll", "sll"]:
+        JacAstBuilder.sll_first = mode == "sll"
+        reset_caches()
+        cold, errors = parse_all(sources)
+        warm = [parse_all(sources)[0] for _ in range(max(args.rounds - 1, 1))]
+        warm = sum(warm) / len(warm)
+        print(f"{mode:>6} {cold:>8.2f} {warm:>8.2f} {lines / warm:>9.0f} {errors:>7}")
+    JacAstBuilder.sll_first = True
+
+
+if __name__ == "__main__":
+    main()
@@ -169,7 +169,7 @@ class ArchitypeInterp(Interp):
         for i in self.super_archs:
             super_jac_ast = (
                 self.parent()
-                .arch_ids.get_obj_by_name(name=i, kind=item.kind)
+                .get_arch_by_name(name=i, kind=item.kind)
                 .get_jac_ast()
                 .kid[-1]
             )
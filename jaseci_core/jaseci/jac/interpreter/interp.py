@@ -4,22 +4,23 @@ Interpreter for jac code in AST form
 This interpreter should be inhereted from the class that manages state
 referenced through self.
 """
-from jaseci.utils.utils import is_jsonable, parse_str_token, uuid_re
+from jaseci.utils.utils import parse_str_token, uuid_re
 from jaseci.element.element import Element
-from jaseci.graph.node import Node
+from jaseci.graph.node import Node, TO, FROM, BI
 from jaseci.graph.edge import Edge
 from jaseci.attr.action import Action
 from jaseci.jac.jac_set import JacSet
+from jaseci.utils.slot_context import SlotContext
 from jaseci.jac.ir.jac_code import jac_ast_to_ir, jac_ir_to_ast
 from jaseci.jac.machine.jac_scope import JacScope
 from jaseci.jac.jsci_vm.machine import VirtualMachine
+from jaseci.jac.jsci_vm.decoder import decode_bytecode
 from jaseci.jac.machine.machine_state import TryException
 
 from jaseci.jac.machine.jac_value import JacValue
 from jaseci.jac.machine.jac_value import jac_elem_unwrap as jeu
 from jaseci.jac.machine.jac_value import jac_wrap_value as jwv
-from copy import copy, deepcopy
-from base64 import b64decode
+from copy import deepcopy
 
 from jaseci.jac.jsci_vm.op_codes import JsCmp
 
@@ -85,7 +86,7 @@ class Interp(VirtualMachine):
                 action_name = self.run_dotted_name(kid[0])
             kid = kid[1:]
             if len(kid) > 0 and kid[0].name == "preset_in_out":
-                preset_in_out = jac_ast_to_ir(kid[0])
+                preset_in_out = jac_ast_to_ir(kid[0], binary=True)
                 kid = kid[1:]
             if len(kid) > 0 and kid[0].name == "event_clause":
                 action_type, access_list = self.run_event_clause(kid[0])
@@ -100,7 +101,7 @@ class Interp(VirtualMachine):
                     m_id=self._m_id,
                     h=self._h,
                     name=action_name,
-                    value=jac_ast_to_ir(kid[0]),
+                    value=jac_ast_to_ir(kid[0], binary=True),
                     preset_in_out=preset_in_out,
                     access_list=access_list,
                 )
@@ -205,6 +206,8 @@ class Interp(VirtualMachine):
         """
         code_block: LBRACE statement* RBRACE | COLON statement;
         """
+        if self._stopped or self.attempt_bytecode(jac_ast):
+            return
         kid = self.set_cur_ast(jac_ast)
         for i in kid:
             if i.name == "statement" and not self._loop_ctrl:
@@ -226,7 +229,7 @@ class Interp(VirtualMachine):
             | report_action
             | walker_action;
         """
-        if self._stopped:
+        if self._stopped or self.attempt_bytecode(jac_ast):
             return
         kid = self.set_cur_ast(jac_ast)
         self.run_rule(kid[0])
@@ -334,7 +337,7 @@ class Interp(VirtualMachine):
             self.run_expression(kid[3])
             lst = self.pop().value
 
-            if isinstance(lst, (list, dict)):
+            if isinstance(lst, (list, dict, SlotContext)):
                 for i in lst:
                     self._loop_ctrl = None
                     var.value = i
@@ -356,7 +359,7 @@ class Interp(VirtualMachine):
             source = self.pop().value
 
             lst = None
-            if isinstance(source, dict):
+            if isinstance(source, (dict, SlotContext)):
                 lst = source.items()
             elif isinstance(source, list):
                 lst = enumerate(source)
@@ -468,10 +471,7 @@ class Interp(VirtualMachine):
                 self.rt_error("Invalid report attribute to set", kid[2])
         else:
             self.run_expression(kid[1])
-            report = jwv(self.pop().value, serialize_mode=True)
-            if not is_jsonable(report):
-                self.rt_error(f"Report {report} not Json serializable", kid[0])
-            self.report.append(copy(report))
+            self.perform_report(self.pop(), kid[0])
 
     def run_expression(self, jac_ast):
         """
@@ -827,40 +827,18 @@ class Interp(VirtualMachine):
                 if kid[1].name == "built_in":
                     return self.run_built_in(kid[1], atom_res)
                 elif kid[1].name == "NAME":
-                    d = atom_res.value
-                    n = kid[1].token_text()
-                    if self.rt_check_type(d, [dict, Element, JacSet], kid[0]):
-                        if isinstance(d, Element):
-                            self._write_candidate = d
-                        if not isinstance(d, JacSet):
-                            ret = JacValue(self, ctx=d, name=n)
-                        else:
-                            plucked = []
-                            for i in d:
-                                if n in i.context.keys():
-                                    plucked.append(i.context[n])
-                                else:
-                                    self.rt_error(
-                                        f"Some elements in set does not have {n}",
-                                        kid[1],
-                                    )
-                            ret = JacValue(self, value=plucked)
-                        return ret
-                    else:
-                        self.rt_error(f"Invalid variable {n}", kid[0])
+                    return self.perform_attr(atom_res, kid[1].token_text(), kid[1])
             elif kid[0].name == "index_slice":
-                if not self.rt_check_type(atom_res.value, [list, str, dict], kid[0]):
+                if not self.rt_check_type(
+                    atom_res.value, [list, str, dict, SlotContext], kid[0]
+                ):
                     return atom_res
                 return self.run_index_slice(kid[0], atom_res)
             elif kid[0].name == "LPAREN":
                 param_list = {"args": [], "kwargs": {}}
                 if kid[1].name == "param_list":
                     param_list = self.run_param_list(kid[1]).value
-                if isinstance(atom_res.value, Action):
-                    ret = atom_res.value.trigger(param_list, self._jac_scope, self)
-                    return JacValue(self, value=ret)
-                else:
-                    self.rt_error("Unable to execute ability", kid[0])
+                return self.perform_call(atom_res, param_list, kid[0])
             elif kid[0].name == "ability_op":
                 arch = self.run_ability_op(kid[0], atom_res)
                 if len(kid) > 2:
@@ -884,7 +862,7 @@ class Interp(VirtualMachine):
             kind = atom_res.value.kind
             name = kid[1].token_text()
             if name in base_arch.derived_types():
-                return self.parent().arch_ids.get_obj_by_name(name=name, kind=kind)
+                return self.parent().get_arch_by_name(name=name, kind=kind)
             else:
                 self.rt_error(f"{name} is not a super arch of {base_arch.name}")
                 return None
@@ -1039,7 +1017,7 @@ class Interp(VirtualMachine):
         """
         kid = self.set_cur_ast(jac_ast)
         if kid[0].name == "KW_KEYS":
-            if isinstance(atom_res.value, dict):
+            if isinstance(atom_res.value, (dict, SlotContext)):
                 return JacValue(self, value=list(atom_res.value.keys()))
             else:
                 self.rt_error(
@@ -1049,11 +1027,11 @@ class Interp(VirtualMachine):
         elif len(kid) > 1 and kid[1].name == "name_list":
             filter_on = self.run_name_list(kid[1])
             d = atom_res.value
-            if self.rt_check_type(d, [dict], kid[0]):
+            if self.rt_check_type(d, [dict, SlotContext], kid[0]):
                 d = {k: d[k] for k in d if k in filter_on}
                 return JacValue(self, value=d)
         else:
-            if not self.rt_check_type(atom_res.value, [dict], kid[0]):
+            if not self.rt_check_type(atom_res.value, [dict, SlotContext], kid[0]):
                 return atom_res
             kid = kid[1:]
             if kid[0].name == "DBL_COLON":
@@ -1384,9 +1362,8 @@ class Interp(VirtualMachine):
         if not location:
             location = self.current_node
         result = JacSet()
-        for i in location.outbound_edges() + location.bidirected_edges():
-            if len(kid) > 2 and not i.get_architype().is_instance(kid[2].token_text()):
-                continue
+        edge_type = kid[2].token_text() if len(kid) > 2 else None
+        for i in location.indexed_edges([TO, BI], edge_type=edge_type):
             result.add_obj(i)
         if len(kid) > 2 and kid[3].name == "filter_ctx":
             result = self.run_filter_ctx(kid[3], result)
@@ -1404,9 +1381,8 @@ class Interp(VirtualMachine):
         if not location:
             location = self.current_node
         result = JacSet()
-        for i in location.inbound_edges() + location.bidirected_edges():
-            if len(kid) > 2 and not i.get_architype().is_instance(kid[2].token_text()):
-                continue
+        edge_type = kid[2].token_text() if len(kid) > 2 else None
+        for i in location.indexed_edges([FROM, BI], edge_type=edge_type):
             result.add_obj(i)
         if len(kid) > 2 and kid[3].name == "filter_ctx":
             result = self.run_filter_ctx(kid[3], result)
@@ -1425,9 +1401,8 @@ class Interp(VirtualMachine):
         if not location:
             location = self.current_node
         result = JacSet()
-        for i in location.attached_edges():
-            if len(kid) > 2 and not i.get_architype().is_instance(kid[2].token_text()):
-                continue
+        edge_type = kid[2].token_text() if len(kid) > 2 else None
+        for i in location.indexed_edges([TO, FROM, BI], edge_type=edge_type):
             result.add_obj(i)
         if len(kid) > 2 and kid[3].name == "filter_ctx":
             result = self.run_filter_ctx(kid[3], result)
@@ -1473,35 +1448,11 @@ class Interp(VirtualMachine):
         kid = self.set_cur_ast(jac_ast)
         self.run_expression(kid[1])
         idx = self.pop().value
-        if kid[2].name == "RSQUARE":
-            if not self.rt_check_type(idx, [int, str], kid[1]):
-                self.rt_error(
-                    f"Index of type {type(idx)} not valid. "
-                    f"Indicies must be an integer or string!",
-                    kid[1],
-                )
-                return atom_res
-            try:
-                return JacValue(self, ctx=atom_res.value, name=idx)
-            except Exception:
-                self.rt_error("List index out of range", kid[1])
-                return atom_res
-        else:
+        end = None
+        if kid[2].name != "RSQUARE":
             self.run_expression(kid[3])
             end = self.pop().value
-            if not self.rt_check_type(idx, [int], kid[1]) or not self.rt_check_type(
-                end, [int], kid[3]
-            ):
-                self.rt_error(
-                    "List slice range not valid. " "Indicies must be an integers!",
-                    kid[1],
-                )
-                return atom_res
-            try:
-                return JacValue(self, ctx=atom_res.value, name=idx, end=end)
-            except Exception:
-                self.rt_error("List slice out of range", kid[1])
-                return atom_res
+        return self.perform_index(atom_res, idx, end, kid[1])
 
     def run_dict_val(self, jac_ast):
         """
@@ -1651,7 +1602,9 @@ class Interp(VirtualMachine):
         walker_spawn: expression KW_SYNC? walker_ref spawn_ctx?;
         """
         kid = self.set_cur_ast(jac_ast)
-        is_await = kid[1].name == "KW_SYNC" and bool(kid.pop(1))
+        is_await = kid[1].name == "KW_SYNC"
+        if is_await:
+            kid = kid[:1] + kid[2:]
         self.run_expression(kid[0])
         location = self.pop().value
         if isinstance(location, Node):
@@ -1663,7 +1616,9 @@ class Interp(VirtualMachine):
             if len(kid) > 2:
                 self.run_spawn_ctx(kid[2], walk)
 
+            walk._profiler = self._profiler  # spawned walkers profiled with us
             res = walk.run()
+            walk._profiler = None
 
             if walk.for_queue() and not res["is_queued"]:
                 res["result"] = walk.anchor_value()
@@ -1796,12 +1751,22 @@ class Interp(VirtualMachine):
 
     # Helper Functions ##################
     def attempt_bytecode(self, jac_ast):
-        if hasattr(jac_ast, "bytecode") and jac_ast.bytecode:
-            self.run_bytecode(b64decode(jac_ast.bytecode.encode()))
-            return True
-        return False
+        bytecode = getattr(jac_ast, "bytecode", None)
+        if not bytecode:
+            return False
+        program = getattr(jac_ast, "_program", None)
+        if program is None:  # decoded once per node, shared by same bytecode
+            program = jac_ast._program = decode_bytecode(bytecode)
+        if not program:  # bytecode of an unknown format version, walk the ast
+            return False
+        self._cur_jac_ast = jac_ast
+        self.run_bytecode(bytecode, program)
+        return True
 
     def call_ability(self, nd, name, act_list):
+        self.run_ability(nd=nd, ability=act_list.get_obj_by_name(name))
+
+    def run_ability(self, nd, ability):
         m = Interp(parent_override=self.parent(), caller=self)
         m.current_node = nd
         arch = nd.get_architype()
@@ -1810,23 +1775,22 @@ class Interp(VirtualMachine):
         )
         m._jac_scope.inherit_agent_refs(self._jac_scope, nd)
         try:
-            m.run_code_block(jac_ir_to_ast(act_list.get_obj_by_name(name).value))
+            m.run_code_block(jac_ir_to_ast(ability.value))
         except Exception as e:
             self.rt_error(f"Internal Exception: {e}", m._cur_jac_ast)
         self.inherit_runtime_state(m)
 
-    def visibility_prune(self, node_set=None):
-        """Returns all nodes that shouldnt be ignored"""
-        ret = JacSet()
-        if node_set is None:
-            node_set = self.current_node.attached_nodes()
-        for i in node_set:
-            if i not in self.ignore_node_ids.obj_list():
-                ret.add_obj(i)
-        return ret
-
     def run_rule(self, jac_ast, *args):
         """Helper to run rule if exists in execution context"""
+        if self._profiler is None:
+            return self.exec_rule(jac_ast, *args)
+        start = self._profiler.start((jac_ast.loc[2], jac_ast.loc[0]))
+        try:
+            return self.exec_rule(jac_ast, *args)
+        finally:
+            self._profiler.stop(start, rules=jac_ast.name)
+
+    def exec_rule(self, jac_ast, *args):
         try:
             val = getattr(self, f"run_{jac_ast.name}")(jac_ast, *args)
             # TODO: Rewrite after stack integration
@@ -4,6 +4,7 @@ Sentinel interpreter for jac code in AST form
 This interpreter should be inhereted from the class that manages state
 referenced through self.
 """
+from copy import copy
 from jaseci.actor.architype import Architype
 from jaseci.jac.interpreter.interp import Interp
 from jaseci.utils.utils import parse_str_token
@@ -69,7 +70,11 @@ class SentinelInterp(Interp):
         """
         kid = self.set_cur_ast(jac_ast)
 
-        is_async = kid[0].name == "KW_ASYNC" and bool(kid.pop(0))
+        is_async = kid[0].name == "KW_ASYNC"
+        if is_async:
+            # Trimmed copy, jac_ast may be shared through the ast cache
+            jac_ast = copy(jac_ast)
+            jac_ast.kid = kid = kid[1:]
 
         name = kid[1].token_text()
         kind = kid[0].token_text()
@@ -87,11 +92,14 @@ class SentinelInterp(Interp):
             for i in kid[2:]:
                 if i.name == "NAME":
                     arch.super_archs.append(i.token_text())
-        if self.arch_ids.has_obj_by_name(arch.name, kind=arch.kind):
-            self.arch_ids.destroy_obj_by_name(arch.name, kind=arch.kind)
+        old_arch = self.get_arch_by_name(arch.name, kind=arch.kind, silent=True)
+        if old_arch:
+            self.arch_ids.destroy_obj(old_arch)
         self.arch_ids.add_obj(arch)
+        self.index_arch(arch)
         self.arch_has_preproc(kid[-1], arch)
         self.arch_can_compile(kid[-1], arch)
+        self.flush_dispatch()
         return arch
 
     # Note: Sentinels only registers the attr_stmts
@@ -164,7 +172,7 @@ class SentinelInterp(Interp):
         kid = kid[4:] if kid[1].name == "NAME" else kid[3:]
         if kid[0].name == "graph_ref":
             graph_name = kid[0].kid[-1].token_text()
-            if not self.arch_ids.has_obj_by_name(graph_name, kind="graph"):
+            if not self.get_arch_by_name(graph_name, kind="graph", silent=True):
                 self.rt_error(f"Graph {graph_name} not found!", kid[0])
                 return
             testcase["graph_ref"] = graph_name
@@ -174,7 +182,7 @@ class SentinelInterp(Interp):
         kid = kid[2:]
         if kid[0].name == "walker_ref":
             walker_name = kid[0].kid[-1].token_text()
-            if not self.arch_ids.has_obj_by_name(name=walker_name, kind="walker"):
+            if not self.get_arch_by_name(walker_name, kind="walker", silent=True):
                 self.rt_error(f"Walker {walker_name} not found!", kid[0])
                 return
             testcase["walker_ref"] = walker_name
@@ -9,7 +9,6 @@ from jaseci.jac.interpreter.interp import Interp
 from jaseci.jac.jac_set import JacSet
 from jaseci.jac.machine.jac_scope import JacScope
 from jaseci.jac.ir.jac_code import jac_ir_to_ast
-from jaseci.utils.id_list import IdList
 
 
 class WalkerInterp(Interp):
@@ -40,11 +39,9 @@ class WalkerInterp(Interp):
             for i in kid:
                 if i.name == "attr_stmt":
                     self.run_attr_stmt(jac_ast=i, obj=self)
-        archs = self.current_node.get_architype().arch_with_supers()
-        act_list = IdList(self)
-        for i in archs:
-            act_list += i.entry_action_ids
-        self.auto_trigger_node_actions(nd=self.current_node, act_list=act_list)
+        table = self.current_node.get_architype().dispatch_table()
+        entry_triggers, exit_triggers = table.triggers(self.name)
+        self.auto_trigger_node_actions(nd=self.current_node, triggers=entry_triggers)
 
         for i in kid:
             if i.name == "walk_entry_block":
@@ -55,14 +52,18 @@ class WalkerInterp(Interp):
                 self.run_walk_activity_block(i)
 
         # self.trigger_activity_actions()
-        archs = self.current_node.get_architype().arch_with_supers()
-        act_list = IdList(self)
-        for i in archs:
-            act_list += i.exit_action_ids
-        self.auto_trigger_node_actions(nd=self.current_node, act_list=act_list)
+        self.auto_trigger_node_actions(nd=self.current_node, triggers=exit_triggers)
 
         if not self.yielded and kid[-2].name == "walk_exit_block":
-            self.run_walk_exit_block(kid[-2])
+            if not self._branch_of:  # frontiers run exit once all are merged
+                self.run_walk_exit_block(kid[-2])
+
+    def run_walker_exit(self, jac_ast):
+        """Runs just the walker's exit block, i.e., after a parallel frontier"""
+        kid = self.set_cur_ast(jac_ast)
+        block = jac_ast if jac_ast.name == "walker_block" else kid[-1]
+        if block.kid[-2].name == "walk_exit_block":
+            self.scope_and_run(block.kid[-2], self.run_walk_exit_block)
 
     def run_node_ctx_block(self, jac_ast):
         """
@@ -120,13 +121,7 @@ class WalkerInterp(Interp):
         """
         kid = self.set_cur_ast(jac_ast)
         self.run_expression(kid[1])
-        result = self.pop().value
-        if isinstance(result, Node):
-            self.ignore_node_ids.add_obj(result)
-        elif isinstance(result, JacSet):
-            self.ignore_node_ids.add_obj_list(result)
-        else:
-            self.rt_error(f"{result} is not ignorable type (i.e., nodes)", kid[1])
+        self.perform_ignore(self.pop().value, kid[1])
 
     def run_take_action(self, jac_ast):
         """
@@ -139,30 +134,9 @@ class WalkerInterp(Interp):
             style = kid[2].token_text()
             kid = kid[2:]
         self.run_expression(kid[1])
-        result = self.pop().value
-        before = len(self.next_node_ids)
-        if isinstance(result, Node):
-            if style in ["b", "bfs"]:
-                self.next_node_ids.add_obj(result, allow_dups=True)
-            elif style in ["d", "dfs"]:
-                self.next_node_ids.add_obj(result, push_front=True, allow_dups=True)
-            else:
-                self.rt_error(f"{style} is invalid take operation", kid[0])
-        elif isinstance(result, JacSet):
-            if style in ["b", "bfs"]:
-                self.next_node_ids.add_obj_list(result, allow_dups=True)
-            elif style in ["d", "dfs"]:
-                self.next_node_ids.add_obj_list(
-                    result, push_front=True, allow_dups=True
-                )
-            else:
-                self.rt_error(f"{style} is invalid take operation", kid[0])
-        elif result:
-            self.rt_error(f"{result} is not destination type (i.e., nodes)", kid[1])
-        after = len(self.next_node_ids)
-        if before >= after and kid[2].name == "else_stmt":
-            self.run_else_stmt(kid[2])
-        after = len(self.next_node_ids)
+        if not self.perform_take(self.pop().value, style, kid[1]):
+            if kid[2].name == "else_stmt":
+                self.run_else_stmt(kid[2])
 
     def run_disengage_action(self, jac_ast):
         """
@@ -171,8 +145,7 @@ class WalkerInterp(Interp):
         kid = self.set_cur_ast(jac_ast)
         if kid[1].name == "report_action":
             self.run_report_action(kid[1])
-        self._stopped = "stop"
-        self.next_node_ids.remove_all()
+        self.perform_disengage()
 
     def run_yield_action(self, jac_ast):
         """
@@ -221,21 +194,48 @@ class WalkerInterp(Interp):
             dest.write(kid[-1])
 
     # Helper Functions ##################
-    def auto_trigger_node_actions(self, nd, act_list):
-        already_executed = []  # handles inhereted duplicates, (overriding)
-        for i in act_list.obj_list():
-            if (
-                i.access_list
-                and self.name not in i.access_list
-                or i.name in already_executed
-            ):
-                continue
-            if i.preset_in_out:
-                self.run_preset_in_out(jac_ir_to_ast(i.preset_in_out), nd, i)
+    def perform_take(self, result, style="b", jac_ast=None):
+        """Queues node(s) to visit next, returns whether any were added"""
+        before = len(self.next_node_ids)
+        if isinstance(result, Node):
+            if style in ["b", "bfs"]:
+                self.next_node_ids.add_obj(result, allow_dups=True)
+            elif style in ["d", "dfs"]:
+                self.next_node_ids.add_obj(result, push_front=True, allow_dups=True)
+            else:
+                self.rt_error(f"{style} is invalid take operation", jac_ast)
+        elif isinstance(result, JacSet):
+            if style in ["b", "bfs"]:
+                self.next_node_ids.add_obj_list(result, allow_dups=True)
+            elif style in ["d", "dfs"]:
+                self.next_node_ids.add_obj_list(
+                    result, push_front=True, allow_dups=True
+                )
+            else:
+                self.rt_error(f"{style} is invalid take operation", jac_ast)
+        elif result:
+            self.rt_error(f"{result} is not destination type (i.e., nodes)", jac_ast)
+        return len(self.next_node_ids) > before
+
+    def perform_ignore(self, result, jac_ast=None):
+        if isinstance(result, Node):
+            self.ignore_node_ids.add_obj(result)
+        elif isinstance(result, JacSet):
+            self.ignore_node_ids.add_obj_list(result)
+        else:
+            self.rt_error(f"{result} is not ignorable type (i.e., nodes)", jac_ast)
+
+    def perform_disengage(self):
+        self._stopped = "stop"
+        self.next_node_ids.remove_all()
+
+    def auto_trigger_node_actions(self, nd, triggers):
+        """Runs (action, ability) triggers from the node's dispatch table"""
+        for act, ability in triggers:
+            if ability is None:
+                self.run_preset_in_out(jac_ir_to_ast(act.preset_in_out), nd, act)
             else:
-                self.call_ability(nd=nd, name=i.name, act_list=act_list)
-            if not i.preset_in_out:  # All preset in and outs get executed
-                already_executed.append(i.name)
+                self.run_ability(nd=nd, ability=ability)
 
     def scope_and_run(self, jac_ast, run_func):
         """
@@ -1,19 +1,26 @@
 import os
-from antlr4 import ParseTreeListener
+from antlr4 import ParseTreeListener, PredictionMode
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
 from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 from jaseci.utils.utils import logger, parse_str_token
-from jaseci.jac.jac_parse.jacParser import jacParser, ParseTreeWalker
+from jaseci.jac.jac_parse.jacParser import jacParser
 from jaseci.jac.jac_parse.jacLexer import jacLexer
 from antlr4 import InputStream, CommonTokenStream
 from jaseci.jac.ir.ast import Ast
+from jaseci.jac.ir import compile_cache
+from jaseci.jac.ir.passes.pt_prune_pass import ParseTreePrunePass
 
 
 class JacAstBuilder:
     """
-    Jac Code to AST Tree
+    Jac Code to AST Tree, single child expression chains are pruned unless
+    prune is False (opt_level 0)
     """
 
     _ast_head_map = {}
+    sll_first = True
 
     def __init__(
         self,
@@ -21,40 +28,127 @@ class JacAstBuilder:
         mod_dir="./",
         jac_text=None,
         start_rule="start",
+        src_path=None,
+        prune=True,
     ):
         self.root = Ast(mod_name)
+        self.prune = prune
         self._parse_errors = []
         self._start_rule = start_rule
         self._mod_dir = mod_dir
         self.dependencies = []
+        # {file path: content hash} of this module's file and all imports
+        self.sources = {}
+        self.imports = []  # [(import_module ast, imported elements), ...]
+        if src_path and jac_text:
+            self.sources[src_path] = compile_cache.text_hash(jac_text)
         if jac_text:
             self.jac_code_to_ast(jac_text)
 
     def jac_code_to_ast(self, jac_str):
-        """Parse language and build ast from string"""
+        """
+        Parse language and build ast from string. Parses with the faster SLL
+        prediction first (see JacATNSimulator) and only reparses with full LL
+        if that fails, the ast is built from parser events so no parse tree
+        is kept
+        """
         JacAstBuilder._ast_head_map[self._mod_dir + self.root.loc[2]] = self
         input_stream = InputStream(jac_str)
         lexer = jacLexer(input_stream)
         stream = CommonTokenStream(lexer)
-        errors = JacTreeError(self)
         parser = jacParser(stream)
+        parser._interp = JacATNSimulator(
+            parser, parser.atn, parser.decisionsToDFA, parser.sharedContextCache
+        )
+        parser.buildParseTrees = False
         parser.removeErrorListeners()
-        parser.addErrorListener(errors)
-        tree = getattr(parser, self._start_rule)()
-        builder = JacTreeBuilder(self)
-        walker = ParseTreeWalker()
-        walker.walk(builder, tree)
+        if not (self.sll_first and self.parse_sll(parser)):
+            parser.addErrorListener(JacTreeError(self))
+            self.parse(parser)
 
         if self._parse_errors:
             logger.error(str(f"Parse errors encountered - {self}"))
 
+    def parse_sll(self, parser):
+        """Parses in SLL mode, False with state rolled back if that fails"""
+        errors, sources = list(self._parse_errors), dict(self.sources)
+        parser._interp.sll_first = True
+        parser._errHandler = JacBailErrorStrategy()
+        try:
+            self.parse(parser)
+            return True
+        except ParseCancellationException:
+            self._parse_errors, self.sources = errors, sources
+            parser.reset()
+            parser._interp.sll_first = False
+            parser._interp.predictionMode = PredictionMode.LL
+            parser._errHandler = DefaultErrorStrategy()
+            return False
+
+    def parse(self, parser):
+        """Runs start rule, building the ast as the parser goes"""
+        self.root.kid = []
+        self.dependencies = []
+        self.imports = []
+        parser.addParseListener(JacTreeBuilder(self))
+        try:
+            getattr(parser, self._start_rule)()
+        finally:
+            parser.removeParseListeners()
+
+
+class JacATNSimulator(ParserATNSimulator):
+    """
+    Predicts with SLL, except for decisions where full LL context has been
+    seen to pick a different alternative than SLL would. These are learned
+    from LL parses and shared across parsers
+    """
+
+    ll_decisions = set()
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.sll_first = False
+
+    def adaptivePredict(self, input, decision, outerContext):  # noqa
+        if self.sll_first:
+            self.predictionMode = (
+                PredictionMode.LL
+                if decision in self.ll_decisions
+                else PredictionMode.SLL
+            )
+        return super().adaptivePredict(input, decision, outerContext)
+
+    def execATNWithFullContext(  # noqa
+        self, dfa, D, s0, input, startIndex, outerContext  # noqa
+    ):
+        alt = super().execATNWithFullContext(
+            dfa, D, s0, input, startIndex, outerContext
+        )
+        if D.configs.conflictingAlts and alt != min(D.configs.conflictingAlts):
+            self.ll_decisions.add(dfa.decision)
+        return alt
+
+
+class JacBailErrorStrategy(BailErrorStrategy):
+    """Bails on first error without sending rule exits for partial rules"""
+
+    def recover(self, recognizer, e):
+        recognizer.removeParseListeners()
+        super().recover(recognizer, e)
+
+    def recoverInline(self, recognizer):
+        recognizer.removeParseListeners()
+        return super().recoverInline(recognizer)
+
 
 class JacTreeBuilder(ParseTreeListener):
-    """Converter class from Antlr trees to Jaseci Tree"""
+    """Builds Jaseci Tree from Antlr parser events"""
 
     def __init__(self, builder):
         self.builder = builder
         self.node_stack = []
+        self.last_exit = None
 
     def run_import_module(self, jac_ast):
         """
@@ -77,17 +171,23 @@ class JacTreeBuilder(ParseTreeListener):
         elif os.path.isfile(fn):
             with open(fn, "r") as file:
                 jac_text = file.read()
-            pre_build = JacAstBuilder(
-                jac_text=jac_text,
-                mod_name=mod_name,
-                mod_dir=mdir,
-            )
+            pre_build = self.load_cached_module(full_path, mod_name, mdir, jac_text)
+            if pre_build is None:
+                pre_build = JacAstBuilder(
+                    jac_text=jac_text,
+                    mod_name=mod_name,
+                    mod_dir=mdir,
+                    src_path=full_path,
+                    prune=self.builder.prune,
+                )
+                compile_cache.save_module(full_path, pre_build)
         else:
             err = (
                 f"Module not found for import! {mod_name} from" + f" {from_mod} - {fn}"
             )
             self.builder._parse_errors.append(err)
         if pre_build:
+            self.builder.sources.update(pre_build.sources)
             self.builder._parse_errors += pre_build._parse_errors
             self.builder.dependencies += pre_build.dependencies
             import_elements = list(
@@ -103,6 +203,37 @@ class JacTreeBuilder(ParseTreeListener):
         else:
             return []
 
+    def add_imports(self, jac_ast, parent):
+        """Resolves import_module and adds imported elements to parent"""
+        ret = self.run_import_module(jac_ast)
+        self.builder.imports.append((jac_ast, ret))
+        for i in ret:
+            if i not in parent.kid:
+                parent.kid.append(i)
+
+    def load_cached_module(self, full_path, mod_name, mod_dir, jac_text):
+        """
+        Builder for module from compile cache, None if not cached. Cached
+        modules keep their import_module nodes, these are resolved again
+        here so imports are shared with the rest of the compile
+        """
+        prune = self.builder.prune
+        root = compile_cache.load_module(full_path, jac_text, prune)
+        if root is None:
+            return None
+        pre_build = JacAstBuilder(mod_name=mod_name, mod_dir=mod_dir, prune=prune)
+        pre_build.sources[full_path] = compile_cache.text_hash(jac_text)
+        JacAstBuilder._ast_head_map[mod_dir + mod_name] = pre_build
+        kid, root.kid = root.kid, []
+        pre_build.root = root
+        tree = JacTreeBuilder(pre_build)
+        for i in kid:
+            if i.name == "import_module":
+                tree.add_imports(i, root)
+            else:
+                root.kid.append(i)
+        return pre_build
+
     def run_import_items(self, jac_ast, import_elements):
         """
         import_items:
@@ -182,7 +313,7 @@ class JacTreeBuilder(ParseTreeListener):
         return ret
 
     def enterEveryRule(self, ctx):  # noqa
-        """Visits every node in antlr parse tree"""
+        """Called by parser as it enters each rule"""
         if len(self.node_stack) == 0:
             new_node = self.builder.root
         else:
@@ -191,30 +322,42 @@ class JacTreeBuilder(ParseTreeListener):
         new_node.loc[0] = ctx.start.line
         new_node.loc[1] = ctx.start.column
 
-        if len(self.node_stack) and new_node.name != "import_module":
+        if self.last_exit is not None and self.last_exit.parentCtx is ctx:
+            # Left recursive rule (atom atom_trailer) wrapping the node that
+            # just exited
+            new_node.kid.append(self.node_stack[-1].kid[-1])
+            self.node_stack[-1].kid[-1] = new_node
+        elif len(self.node_stack) and new_node.name != "import_module":
             self.node_stack[-1].kid.append(new_node)
         self.node_stack.append(new_node)
 
     def exitEveryRule(self, ctx):  # noqa
-        """Overloaded function that visits every node on exit"""
+        """
+        Called by parser as it exits each rule, single child chains of
+        expression rules are pruned here if the builder prunes
+        """
         top = self.node_stack.pop()
+        self.last_exit = ctx
         if top.name == "import_module":
-            for i in self.run_import_module(top):
-                if i not in self.node_stack[-1].kid:
-                    self.node_stack[-1].kid.append(i)
+            self.add_imports(top, self.node_stack[-1])
+        elif (
+            self.builder.prune
+            and top.name in ParseTreePrunePass.prune_able
+            and len(top.kid) == 1
+        ):
+            self.node_stack[-1].kid[-1] = top.kid[0]
 
     def visitTerminal(self, node):  # noqa
-        """Visits terminals as walker walks, adds ast node"""
+        """Called by parser as it matches each token, adds ast node"""
+        symbol = node.getSymbol()
+        name = jacParser.symbolicNames[symbol.type]
+        if name in ParseTreePrunePass.cull_able:
+            return
         new_node = Ast(mod_name=self.builder.root.loc[2])
-        new_node.name = jacParser.symbolicNames[node.getSymbol().type]
-        new_node.loc[0] = node.getSymbol().line
-        new_node.loc[1] = node.getSymbol().column
-
-        token = {
-            "symbol": jacParser.symbolicNames[node.getSymbol().type],
-            "text": node.getSymbol().text,
-        }
-        new_node.loc[3]["token"] = token
+        new_node.name = name
+        new_node.loc[0] = symbol.line
+        new_node.loc[1] = symbol.column
+        new_node.loc[3]["token"] = {"symbol": name, "text": symbol.text}
 
         self.node_stack[-1].kid.append(new_node)
 
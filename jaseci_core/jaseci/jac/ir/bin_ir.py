@@ -0,0 +1,166 @@
+"""
+Binary IR for Jac ASTs
+
+Nodes are struct packed in preorder against a string table, each node
+records the byte length of its subtree so decoding can skip over kids and
+materialize them lazily, on first access to kid (i.e. when first run)
+"""
+import json
+from struct import Struct
+from base64 import b64encode, b64decode
+from jaseci.jac.ir.ast import Ast
+
+BIN_IR_PREFIX = "jbir:"
+MAGIC = b"JBIR\x01"
+
+# name, line, col, file, token text+1, bytecode+1, extra json+1, kids, kids len
+NODE = Struct("<IIIIIIIII")
+COUNT = Struct("<I")
+
+
+class LazyAst(Ast):
+    """Ast node whose kids are decoded from binary IR on first access"""
+
+    def __init__(self, mod_name, src=None, kids_at=0, num_kids=0):
+        Ast.__init__(self, mod_name)
+        self._src = src
+        self._kids_at = kids_at
+        self._num_kids = num_kids
+
+    @property
+    def kid(self):
+        if self._src is not None:
+            src, self._src = self._src, None
+            self._kid = src.decode_nodes(self._kids_at, self._num_kids)
+        return self._kid
+
+    @kid.setter
+    def kid(self, val):
+        self._src = None
+        self._kid = val
+
+
+class BinIrEncoder:
+    def __init__(self):
+        self.strings = {}
+        self.table = []
+
+    def str_idx(self, val):
+        if val not in self.strings:
+            self.strings[val] = len(self.table)
+            self.table.append(val)
+        return self.strings[val]
+
+    def opt_idx(self, val):
+        return 0 if val is None else self.str_idx(val) + 1
+
+    def encode_node(self, node):
+        kids = b"".join(self.encode_node(i) for i in node.kid)
+        token, extra = None, {}
+        for k, v in vars(node).items():
+            if k in ["name", "kid", "loc", "bytecode"] or k.startswith("_"):
+                continue
+            extra[k] = v
+        loc3 = node.loc[3]
+        if loc3:
+            tok = loc3.get("token", {})
+            if list(loc3) == ["token"] and tok.get("symbol") == node.name:
+                token = tok.get("text", "")
+            else:
+                extra["loc3"] = loc3
+        bytecode = getattr(node, "bytecode", None)
+        return (
+            NODE.pack(
+                self.str_idx(node.name),
+                node.loc[0],
+                node.loc[1],
+                self.str_idx(node.loc[2]),
+                self.opt_idx(token),
+                self.opt_idx(bytecode if bytecode else None),
+                self.opt_idx(json.dumps(extra) if extra else None),
+                len(node.kid),
+                len(kids),
+            )
+            + kids
+        )
+
+    def encode(self, jac_ast, gram_hash):
+        body = self.encode_node(jac_ast) if jac_ast is not None else b""
+        table = [COUNT.pack(len(self.table))]
+        for i in self.table:
+            i = i.encode()
+            table.append(COUNT.pack(len(i)) + i)
+        return MAGIC + gram_hash.encode() + b"".join(table) + body
+
+
+class BinIrDecoder:
+    def __init__(self, data):
+        self.data = data
+        self.gram_hash = data[len(MAGIC) : len(MAGIC) + 32].decode()
+        pos = len(MAGIC) + 32
+        count = COUNT.unpack_from(data, pos)[0]
+        pos += COUNT.size
+        self.table = []
+        for _ in range(count):
+            size = COUNT.unpack_from(data, pos)[0]
+            pos += COUNT.size
+            self.table.append(data[pos : pos + size].decode())
+            pos += size
+        self.root_at = pos
+
+    def root(self):
+        if self.root_at >= len(self.data):
+            return None
+        return self.decode_nodes(self.root_at, 1)[0]
+
+    def decode_nodes(self, pos, count):
+        nodes, table = [], self.table
+        for _ in range(count):
+            name, line, col, fn, tok, code, extra, kids, size = NODE.unpack_from(
+                self.data, pos
+            )
+            pos += NODE.size
+            node = LazyAst(table[fn], self if kids else None, pos, kids)
+            node.name = table[name]
+            node.loc[0], node.loc[1] = line, col
+            if tok:
+                text = table[tok - 1]
+                node.loc[3]["token"] = {"symbol": node.name, "text": text}
+            if code:
+                node.bytecode = table[code - 1]
+            if extra:
+                extra = json.loads(table[extra - 1])
+                if "loc3" in extra:
+                    node.loc[3] = extra.pop("loc3")
+                for k, v in extra.items():
+                    setattr(node, k, v)
+            nodes.append(node)
+            pos += size
+        return nodes
+
+
+def jac_ast_to_bin(jac_ast, gram_hash):
+    """Binary IR for jac_ast"""
+    return BinIrEncoder().encode(jac_ast, gram_hash)
+
+
+def jac_bin_to_ast(data):
+    """Returns (gram_hash, lazily decoded AST) for binary IR"""
+    if not data.startswith(MAGIC):
+        raise ValueError("Not Jac binary IR")
+    dec = BinIrDecoder(data)
+    return dec.gram_hash, dec.root()
+
+
+def is_bin_ir(ir):
+    return isinstance(ir, (bytes, bytearray)) or (
+        isinstance(ir, str) and ir.startswith(BIN_IR_PREFIX)
+    )
+
+
+def bin_ir_to_str(data):
+    return BIN_IR_PREFIX + b64encode(data).decode()
+
+
+def bin_ir_from_str(ir):
+    return b64decode(ir[len(BIN_IR_PREFIX) :].encode())
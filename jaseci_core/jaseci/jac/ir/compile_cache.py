@@ -0,0 +1,175 @@
+"""
+On disk cache of compiled Jac
+
+Imported modules are kept as parsed binary IR keyed by file path and
+content, with their own imports left unresolved, so only modified files
+are re-parsed. Whole compiles are kept as post-pass IR keyed
+by code, name, dir, start rule and opt_level, checked against the hashes
+of the files they imported. Every key includes the grammar hash, the
+bytecode version and the jaseci version so entries built by other
+releases are never served.
+
+The cache is off unless JSCI_JAC_CACHE_DIR is set, e.g. ~/.jaseci/jac_cache.
+Entries are pruned least recently used first once the cache grows past
+JSCI_JAC_CACHE_MAX_MB (256 by default).
+"""
+import json
+import os
+from hashlib import sha256
+from tempfile import mkstemp
+
+from jaseci.jac.ir.bin_ir import jac_ast_to_bin, jac_bin_to_ast
+from jaseci.utils.utils import logger
+
+JAC_CACHE_DIR = os.getenv("JSCI_JAC_CACHE_DIR", "")
+JAC_CACHE_MAX_BYTES = int(os.getenv("JSCI_JAC_CACHE_MAX_MB", "256")) * 2**20
+
+# Bytes held by each cache dir, counted by walking the dir on its first
+# write then kept up by writes, so the dir is only walked again once over
+cache_bytes = {}
+
+
+def text_hash(text):
+    return sha256(text.encode()).hexdigest()
+
+
+def file_hash(path):
+    try:
+        with open(path, "r") as f:
+            return text_hash(f.read())
+    except OSError:
+        return None
+
+
+def entry_path(kind, *parts):
+    """File for cache entry of kind keyed by parts, None if cache is off"""
+    if not JAC_CACHE_DIR:
+        return None
+    from jaseci import __version__
+    from jaseci.jac.ir.jac_code import grammar_hash
+    from jaseci.jac.jsci_vm.op_codes import BYTECODE_VERSION
+
+    key = [grammar_hash, BYTECODE_VERSION, __version__, *parts]
+    key = text_hash(json.dumps(key))
+    return os.path.join(JAC_CACHE_DIR, kind, key[:2], key)
+
+
+def read_entry(path):
+    """
+    (header, ast) of entry at path, None if missing or if any source it
+    was built from changed
+    """
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            header, data = f.read().split(b"\n", 1)
+        header = json.loads(header)
+        for src, src_hash in header["sources"].items():
+            if file_hash(src) != src_hash:
+                return None
+        os.utime(path)  # marks entry as recently used for pruning
+        return header, jac_bin_to_ast(data)[1]
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable Jac cache entry {path}: {e}")
+        return None
+
+
+def write_entry(path, header, jac_ast):
+    if not path:
+        return
+    from jaseci.jac.ir.jac_code import grammar_hash
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = mkstemp(dir=os.path.dirname(path))
+        data = json.dumps(header).encode() + b"\n"
+        data += jac_ast_to_bin(jac_ast, grammar_hash)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        used = cache_bytes.get(JAC_CACHE_DIR)
+        if used is None or used + len(data) > JAC_CACHE_MAX_BYTES:
+            cache_bytes[JAC_CACHE_DIR] = prune()
+        else:
+            cache_bytes[JAC_CACHE_DIR] = used + len(data)
+    except Exception as e:
+        logger.warning(f"Unable to write Jac cache entry {path}: {e}")
+
+
+def prune():
+    """
+    Removes least recently used entries while cache is over its size,
+    returns bytes left in the cache
+    """
+    entries, total = [], 0
+    for root, _, files in os.walk(JAC_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= JAC_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+    return total
+
+
+def load_module(full_path, jac_text, prune=True):
+    """Parsed AST of a module from cache, None if not cached"""
+    entry = read_entry(entry_path("mod", full_path, text_hash(jac_text), prune))
+    return entry[1] if entry else None
+
+
+def save_module(full_path, builder):
+    """
+    Caches a module parsed without errors by JacAstBuilder. Elements it
+    imported are swapped back for the import_module nodes they came from
+    so the cached module doesn't go stale when an import changes
+    """
+    if builder._parse_errors:
+        return
+    root = builder.root
+    imported = {id(i) for _, ret in builder.imports for i in ret}
+    kid = [i for i in root.kid if id(i) not in imported]
+    pos = 1 if kid and kid[0].name == "ver_label" else 0
+    kid[pos:pos] = [i for i, _ in builder.imports]
+    full_kid, root.kid = root.kid, kid
+    try:
+        write_entry(
+            entry_path("mod", full_path, builder.sources[full_path], builder.prune),
+            {"sources": {}},
+            root,
+        )
+    finally:
+        root.kid = full_kid
+
+
+def compile_path(code, name, dir, start_rule, opt_level):
+    return entry_path(
+        "code",
+        text_hash(code),
+        name,
+        os.path.realpath(dir) if dir else None,
+        start_rule,
+        opt_level,
+    )
+
+
+def load_compiled(path):
+    """Post-pass AST of a compile from cache, None if an import changed"""
+    entry = read_entry(path)
+    return entry[1] if entry else None
+
+
+def save_compiled(path, sources, jac_ast):
+    write_entry(path, {"sources": sources}, jac_ast)
@@ -6,9 +6,16 @@ from jaseci.utils.utils import logger
 from jaseci.jac.ir.ast_builder import JacAstBuilder
 from jaseci.jac.ir.passes.schedule import multi_pass_optimizer
 from jaseci.jac.ir.ast import Ast
+from jaseci.jac.ir.bin_ir import jac_ast_to_bin, jac_bin_to_ast, is_bin_ir
+from jaseci.jac.ir.bin_ir import bin_ir_to_str, bin_ir_from_str
+from jaseci.jac.ir import compile_cache
+from jaseci.jac.jsci_vm.op_codes import BYTECODE_VERSION
 import hashlib
+import os
 from pathlib import Path
 from os.path import dirname
+from weakref import WeakKeyDictionary
+from collections import OrderedDict
 
 from jaseci.jac.ir.passes.printer_pass import PrinterPass
 
@@ -17,13 +24,30 @@ grammar_hash = hashlib.md5(
     Path(dirname(__file__) + "/../jac.g4").read_text().encode()
 ).hexdigest()
 
+# Decoded ASTs shared process wide, keyed by code_sig (or the IR itself),
+# ASTs are not mutated once compiled so all holders of the IR share one,
+# least recently used entries are evicted past AST_CACHE_MAX
+AST_CACHE_MAX = 1024
+ast_cache = OrderedDict()
+
+# Shared tier of the AST cache for workers hooked to the same Redis, binary
+# IR keyed by grammar hash, bytecode version and code_sig, published when
+# code is registered so other workers decode it lazily instead of parsing
+# json IR. Keys are content addressed, superseded code expires by TTL
+JAC_CODE_REDIS_TTL = int(os.getenv("JSCI_JAC_CODE_REDIS_TTL", "604800"))
+REDIS_PREFIX = f"jac_code:{grammar_hash}:{BYTECODE_VERSION}:"
+
+# Json IR already encoded for an AST, architypes loaded from a cached
+# sentinel AST (e.g. on every master syncing the global sentinel) reuse it
+ir_cache = WeakKeyDictionary()
+
 
 class JacJsonEnc(json.JSONEncoder):
     """Custom Json encoder for Jac ASTs"""
 
     def default(self, obj):
         if isinstance(obj, Ast):
-            retd = {}
+            retd = {"name": obj.name, "kid": obj.kid, "loc": obj.loc}
             for i in obj.__dict__.keys():
                 if not i.startswith("_"):
                     retd[i] = obj.__dict__[i]
@@ -47,14 +71,86 @@ class JacJsonDec(json.JSONDecoder):
         return obj
 
 
-def jac_ast_to_ir(jac_ast: Ast):
-    """Convert AST to IR string"""
-    return json.dumps(cls=JacJsonEnc, obj={"gram_hash": grammar_hash, "ir": jac_ast})
+def jac_ast_to_ir(jac_ast: Ast, binary=False):
+    """Convert AST to IR string, binary IR is decoded lazily when loaded"""
+    if binary:
+        return bin_ir_to_str(jac_ast_to_bin(jac_ast, grammar_hash))
+    ir = ir_cache.get(jac_ast) if isinstance(jac_ast, Ast) else None
+    if ir is None:
+        ir = json.dumps(cls=JacJsonEnc, obj={"gram_hash": grammar_hash, "ir": jac_ast})
+        if isinstance(jac_ast, Ast):
+            ir_cache[jac_ast] = ir
+    return ir
+
+
+def jac_ir_to_ast(ir: str, sig=None, redis=None):
+    """
+    Convert IR string (json or binary) to AST, decoded once per process
+    for each sig (the IR itself if not given), from the shared tier when
+    redis is given and another worker published the sig
+    """
+    key = sig if sig else ir
+    jac_ast = ast_cache.get(key)
+    if jac_ast is not None:
+        try:
+            ast_cache.move_to_end(key)
+        except KeyError:
+            pass
+    else:
+        shared = None
+        if sig and redis is not None and redis.is_running():
+            shared = redis.get(REDIS_PREFIX + sig)
+        jac_ast = load_ir(shared if shared else ir)
+        if jac_ast is not None:
+            cache_ast(key, jac_ast)
+    return jac_ast
+
+
+def cache_ast(key, jac_ast):
+    ast_cache[key] = jac_ast
+    while len(ast_cache) > AST_CACHE_MAX:
+        try:
+            ast_cache.popitem(last=False)
+        except KeyError:
+            break
+
+
+def publish_code(codes, redis):
+    """
+    Publishes binary IR of JacCode objects to the shared tier, with one
+    MGET so sigs already published by other workers aren't re-encoded
+    """
+    if redis is None or not redis.is_running():
+        return
+    codes = {i.code_sig: i for i in codes if i.code_sig and i._jac_ast is not None}
+    keys = [REDIS_PREFIX + i for i in codes]
+    if not keys:
+        return
+    for key, code, found in zip(keys, codes.values(), redis.mget(keys)):
+        if not found:
+            redis.setex(
+                key, JAC_CODE_REDIS_TTL, jac_ast_to_ir(code._jac_ast, binary=True)
+            )
 
 
-def jac_ir_to_ast(ir: str):
-    """Convert IR string to AST"""
-    ir_load = json.loads(cls=JacJsonDec, s=ir)
+def drop_code(sigs):
+    """
+    Evicts superseded sigs from the process AST cache, shared entries are
+    left as workers still holding the old code may load them
+    """
+    for sig in sigs:
+        ast_cache.pop(sig, None)
+
+
+def load_ir(ir):
+    """Decodes IR string to AST"""
+    if is_bin_ir(ir):
+        gram_hash, jac_ast = jac_bin_to_ast(
+            bin_ir_from_str(ir) if isinstance(ir, str) else bytes(ir)
+        )
+        ir_load = {"gram_hash": gram_hash, "ir": jac_ast}
+    else:
+        ir_load = json.loads(cls=JacJsonDec, s=ir)
     if (
         not isinstance(ir_load, dict)
         or "gram_hash" not in ir_load
@@ -83,7 +179,11 @@ class JacCode:
         JacCode.__init__(self)
 
     def refresh(self):
-        self._jac_ast = jac_ir_to_ast(self.code_ir) if self.code_ir else None
+        self._jac_ast = (
+            jac_ir_to_ast(self.code_ir, self.code_sig, self.code_redis())
+            if self.code_ir
+            else None
+        )
         if self._jac_ast:
             self.is_active = True
         else:
@@ -99,12 +199,33 @@ class JacCode:
             else jac_ast_to_ir(ir)
         )
         self.code_sig = hashlib.md5(self.code_ir.encode()).hexdigest()
+        if isinstance(ir, Ast) and self.code_sig not in ast_cache:
+            cache_ast(self.code_sig, ir)  # no need to decode what was encoded
         JacCode.refresh(self)  # should disregard overloaded versions
 
+    def code_redis(self):
+        """Redis of the shared AST cache tier, None if not hooked to one"""
+        return getattr(getattr(self, "_h", None), "redis", None)
+
     def compile_jac(self, code, dir, start_rule="start", opt_level=4):
-        """Generate AST tree from Jac code text"""
+        """
+        Generate AST tree from Jac code text, from the compile cache if the
+        same code was compiled before and none of its imports changed
+        """
+        cache_path = compile_cache.compile_path(
+            code, self.name, dir, start_rule, opt_level
+        )
+        cached = compile_cache.load_compiled(cache_path)
+        if cached is not None:
+            self.errors = []
+            return cached
+
         tree = JacAstBuilder(
-            jac_text=code, start_rule=start_rule, mod_name=self.name, mod_dir=dir
+            jac_text=code,
+            start_rule=start_rule,
+            mod_name=self.name,
+            mod_dir=dir,
+            prune=opt_level > 0,
         )
         # Must clear this state across compiles (so fresh imports dont use stale data)
         JacAstBuilder._ast_head_map = {}
@@ -120,6 +241,7 @@ class JacCode:
             tree.root, opt_level=opt_level
         )  # run analysis and optimizers
 
+        compile_cache.save_compiled(cache_path, tree.sources, tree.root)
         return tree.root
 
     def get_jac_ast(self):
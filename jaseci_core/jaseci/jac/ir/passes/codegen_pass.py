@@ -1,5 +1,6 @@
 from jaseci.jac.ir.passes import IrPass
-from jaseci.jac.jsci_vm.op_codes import JsCmp, JsOp, JsType
+from jaseci.jac.jsci_vm.op_codes import JsCmp, JsEdgeDir, JsOp, JsType
+from jaseci.jac.jsci_vm.op_codes import BYTECODE_HEADER
 from struct import pack
 
 from jaseci.utils.utils import parse_str_token
@@ -21,15 +22,34 @@ def to_bytes(val):
         return val.to_bytes(byte_length(val), "little")
 
 
+def rel_bytes(val):
+    """Fixed width signed operand for jump offsets"""
+    return val.to_bytes(4, "little", signed=True)
+
+
+def name_bytes(name):
+    return [byte_length(name), to_bytes(name)]
+
+
 def has_bytecode(node):
     if not hasattr(node, "bytecode"):
         return False
     return True
 
 
+def code_of(node):
+    """
+    Bytecode of node, either runnable bytecode (executed by attempt_bytecode)
+    or a fragment (_frag) only used when assembling its parent
+    """
+    if has_bytecode(node):
+        return node.bytecode
+    return getattr(node, "_frag", None)
+
+
 def is_bytecode_complete(node):
     for i in node.kid:
-        if not i.is_terminal() and not has_bytecode(i) and i.name != "cmp_op":
+        if not i.is_terminal() and code_of(i) is None and i.name != "cmp_op":
             return False
     return True
 
@@ -40,30 +60,64 @@ class CodeGenPass(IrPass):
         self.debug_info = debug_info
         self.cur_loc = None
         self.create_var_mode = 0
+        self.walker_depth = 0
+        self.expr_depth = 0
+        self.ability_depth = 0
 
-    def emit(self, node, *items):
-        if not has_bytecode(node):
-            node.bytecode = bytearray()
-        node_loc = [node.loc[0], node.loc[2]]
-        if self.debug_info and self.cur_loc != node_loc:
-            debug_inst = [
-                JsOp.DEBUG_INFO,
-                byte_length(node_loc[0]),
-                to_bytes(node_loc[0]),
-            ]
-            if not self.cur_loc or self.cur_loc[1] != node_loc[1]:
-                debug_inst += [byte_length(node_loc[1]), to_bytes(node_loc[1])]
-            else:
-                debug_inst += [0]
-            self.cur_loc = node_loc
-            items = debug_inst + list(items)
+    def assemble(self, *items):
+        code = bytearray()
         for i in items:
             if type(i) in [bytes, bytearray]:
-                node.bytecode += bytearray(i)
+                code += bytearray(i)
             elif type(i) is str:
-                node.bytecode += bytearray(i, "utf-8")
+                code += bytearray(i, "utf-8")
             else:
-                node.bytecode.append(i)
+                code.append(i)
+        return code
+
+    def emit(self, node, *items, frag=False):
+        """
+        Appends items to node's bytecode, frag emits to the fragment used
+        by parent rules that are not themselves run through bytecode
+
+        Bytecode starts at the location of the rule being run, so locations
+        are only marked for outermost expressions and action calls (where
+        interpreted code reports its runtime errors)
+        """
+        attr = "_frag" if frag else "bytecode"
+        if not hasattr(node, attr):
+            setattr(node, attr, bytearray())
+        if hasattr(node, "_outermost"):
+            items = self.debug_items(node) + list(items)
+        getattr(node, attr).extend(self.assemble(*items))
+
+    def debug_items(self, node):
+        """DEBUG_INFO marking node's location, empty if already marked"""
+        node_loc = [node.loc[0], node.loc[2], node.loc[1], node.name]
+        if not self.debug_info or self.cur_loc == node_loc:
+            return []
+        debug_inst = [
+            JsOp.DEBUG_INFO,
+            byte_length(node_loc[0]),
+            to_bytes(node_loc[0]),
+        ]
+        if not self.cur_loc or self.cur_loc[1] != node_loc[1]:
+            debug_inst += [byte_length(node_loc[1]), to_bytes(node_loc[1])]
+        else:
+            debug_inst += [0]
+        debug_inst += [byte_length(node_loc[2]), to_bytes(node_loc[2])]
+        debug_inst += [byte_length(node_loc[3]), to_bytes(node_loc[3])]
+        self.cur_loc = node_loc
+        return debug_inst
+
+    def after_pass(self):
+        """Marks runnable bytecode with the format version once assembled"""
+        nodes = [self.ir]
+        while nodes:
+            node = nodes.pop()
+            if getattr(node, "bytecode", None):
+                node.bytecode = bytearray(BYTECODE_HEADER) + node.bytecode
+            nodes.extend(node.kid)
 
     def enter_node(self, node):
         # print("entering", node)
@@ -77,18 +131,32 @@ class CodeGenPass(IrPass):
         if hasattr(node, "_create_flag"):
             self.create_var_mode -= 1
 
+    def enter_walker_block(self, node):
+        self.walker_depth += 1
+
+    def exit_walker_block(self, node):
+        self.walker_depth -= 1
+
+    def enter_can_stmt(self, node):
+        self.ability_depth += 1
+
+    def exit_can_stmt(self, node):
+        self.ability_depth -= 1
+
     def enter_expression(self, node):
         kid = node.kid
-        if len(kid) > 1 and kid[-1].name == "assignment":
-            kid[-1]._create_flag = True
+        if not self.expr_depth:
+            node._outermost = True
+        self.expr_depth += 1
+        if len(kid) > 1:
+            kid[0]._create_flag = True
             self.create_var_mode += 1
 
-    def exit_expression(self, node):  # TODO: Incomplete
+    def exit_expression(self, node):
         kid = node.kid
+        self.expr_depth -= 1
         if is_bytecode_complete(node):
-            for i in reversed(node.kid):
-                if has_bytecode(i):
-                    self.emit(node, i.bytecode)
+            self.emit(node, *[code_of(i) for i in kid])
             if len(kid) > 1 and kid[1].name == "assignment":
                 self.emit(node, JsOp.ASSIGN)
             elif len(kid) > 1 and kid[1].name == "copy_assign":
@@ -98,95 +166,79 @@ class CodeGenPass(IrPass):
 
     def exit_assignment(self, node):
         if is_bytecode_complete(node):
-            if has_bytecode(node.kid[-1]):
-                self.emit(node, node.kid[-1].bytecode)
+            self.emit(node, code_of(node.kid[-1]))
 
     def exit_copy_assign(self, node):
         if is_bytecode_complete(node):
-            if has_bytecode(node.kid[-1]):
-                self.emit(node, node.kid[-1].bytecode)
+            self.emit(node, code_of(node.kid[-1]))
 
     def exit_inc_assign(self, node):
         if is_bytecode_complete(node):
-            if has_bytecode(node.kid[-1]):
-                self.emit(node, node.kid[-1].bytecode)
+            self.emit(node, code_of(node.kid[-1]))
+
+    def emit_operations(self, node, ops):
+        """
+        Emits operands left to right with the operator after each right
+        operand, i.e., a - b + c as a b SUBTRACT c ADD
+        """
+        kid = node.kid
+        self.emit(node, code_of(kid[0]))
+        for op, operand in zip(kid[1::2], kid[2::2]):
+            self.emit(node, code_of(operand), *ops(op))
 
     def exit_logical(self, node):
-        if is_bytecode_complete(node):
-            for i in reversed(node.kid):
-                if has_bytecode(i):
-                    self.emit(node, i.bytecode)
-            for i in node.kid:
-                if i.name == "KW_AND":
-                    self.emit(node, JsOp.AND)
-                elif i.name == "KW_OR":
-                    self.emit(node, JsOp.OR)
+        """Short circuits like the interpreter, operands are only run if needed"""
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        code = self.assemble(code_of(kid[0]))
+        for op, operand in zip(kid[1::2], kid[2::2]):
+            jump = (
+                JsOp.JUMP_IF_FALSE_OR_POP
+                if op.name == "KW_AND"
+                else JsOp.JUMP_IF_TRUE_OR_POP
+            )
+            operand = code_of(operand)
+            code += self.assemble(jump, rel_bytes(5 + len(operand)), operand)
+        self.emit(node, code)
 
     def exit_compare(self, node):
-        if is_bytecode_complete(node):
-            for i in reversed(node.kid):
-                if has_bytecode(i):
-                    self.emit(node, i.bytecode)
-            for i in node.kid:
-                if i.name == "NOT":
-                    self.emit(node, JsOp.COMPARE, JsCmp.NOT)
-                elif i.name == "cmp_op" and i.kid[0].name == "EE":
-                    self.emit(node, JsOp.COMPARE, JsCmp.EE)
-                elif i.name == "cmp_op" and i.kid[0].name == "LT":
-                    self.emit(node, JsOp.COMPARE, JsCmp.LT)
-                elif i.name == "cmp_op" and i.kid[0].name == "GT":
-                    self.emit(node, JsOp.COMPARE, JsCmp.GT)
-                elif i.name == "cmp_op" and i.kid[0].name == "LTE":
-                    self.emit(node, JsOp.COMPARE, JsCmp.LTE)
-                elif i.name == "cmp_op" and i.kid[0].name == "GTE":
-                    self.emit(node, JsOp.COMPARE, JsCmp.GTE)
-                elif i.name == "cmp_op" and i.kid[0].name == "NE":
-                    self.emit(node, JsOp.COMPARE, JsCmp.NE)
-                elif i.name == "cmp_op" and i.kid[0].name == "KW_IN":
-                    self.emit(node, JsOp.COMPARE, JsCmp.IN)
-                elif i.name == "cmp_op" and i.kid[0].name == "nin":
-                    self.emit(node, JsOp.COMPARE, JsCmp.NIN)
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        if kid[0].name == "NOT":
+            self.emit(node, code_of(kid[1]), JsOp.COMPARE, JsCmp.NOT)
+        else:
+            cmps = {"KW_IN": JsCmp.IN, "nin": JsCmp.NIN}
+            self.emit_operations(
+                node,
+                lambda op: [
+                    JsOp.COMPARE,
+                    cmps.get(op.kid[0].name, None) or JsCmp[op.kid[0].name],
+                ],
+            )
 
     def exit_arithmetic(self, node):
+        ops = {"PLUS": JsOp.ADD, "MINUS": JsOp.SUBTRACT}
         if is_bytecode_complete(node):
-            for i in reversed(node.kid):
-                if has_bytecode(i):
-                    self.emit(node, i.bytecode)
-            for i in node.kid:
-                if i.name == "PLUS":
-                    self.emit(node, JsOp.ADD)
-                elif i.name == "MINUS":
-                    self.emit(node, JsOp.SUBTRACT)
+            self.emit_operations(node, lambda op: [ops[op.name]])
 
     def exit_term(self, node):
+        ops = {"STAR_MUL": JsOp.MULTIPLY, "DIV": JsOp.DIVIDE, "MOD": JsOp.MODULO}
         if is_bytecode_complete(node):
-            for i in reversed(node.kid):
-                if has_bytecode(i):
-                    self.emit(node, i.bytecode)
-            for i in node.kid:
-                if i.name == "STAR_MUL":
-                    self.emit(node, JsOp.MULTIPLY)
-                elif i.name == "DIV":
-                    self.emit(node, JsOp.DIVIDE)
-                elif i.name == "MOD":
-                    self.emit(node, JsOp.MODULO)
+            self.emit_operations(node, lambda op: [ops[op.name]])
 
     def exit_factor(self, node):
         if is_bytecode_complete(node):
-            self.emit(node, node.kid[-1].bytecode)
+            self.emit(node, code_of(node.kid[-1]))
             if node.kid[0].name == "MINUS":
                 self.emit(node, JsOp.NEGATE)
 
     def exit_power(self, node):
         if is_bytecode_complete(node):
-            for i in reversed(node.kid):
-                if has_bytecode(i):
-                    self.emit(node, i.bytecode)
-            for i in node.kid:
-                if i.name == "POW":
-                    self.emit(node, JsOp.POWER)
+            self.emit_operations(node, lambda op: [JsOp.POWER])
 
-    def exit_atom(self, node):  # TODO: Incomplete
+    def exit_atom(self, node):
         kid = node.kid
         if kid[0].name == "INT":
             val = int(kid[0].token_text())
@@ -221,6 +273,294 @@ class CodeGenPass(IrPass):
                 self.emit(node, JsOp.CREATE_VAR, byte_length(name), to_bytes(name))
             else:
                 self.emit(node, JsOp.LOAD_VAR, byte_length(name), to_bytes(name))
+        elif not is_bytecode_complete(node):
+            return
+        elif kid[0].name == "LPAREN":
+            self.emit(node, code_of(kid[1]))
+        elif kid[0].name in ["list_val", "dict_val", "node_edge_ref", "any_type"]:
+            self.emit(node, code_of(kid[0]))
+        elif kid[0].name == "atom":
+            self.emit(node, *[code_of(i) for i in kid])
+
+    def exit_atom_trailer(self, node):
+        kid = node.kid
+        if kid[0].name == "DOT" and kid[1].name == "NAME":
+            self.emit(
+                node,
+                JsOp.LOAD_ATTR,
+                int(self.create_var_mode > 0),
+                *name_bytes(kid[1].token_text()),
+                frag=True,
+            )
+        elif kid[0].name == "index_slice" and is_bytecode_complete(node):
+            self.emit(node, code_of(kid[0]), frag=True)
+        elif kid[0].name == "LPAREN" and is_bytecode_complete(node):
+            args, kwargs = 0, []
+            if kid[1].name == "param_list":
+                for i in kid[1].kid:
+                    if i.name == "expr_list":
+                        args = len([j for j in i.kid if j.name != "COMMA"])
+                    elif i.name == "kw_expr_list":
+                        kwargs = [j.token_text() for j in i.kid if j.name == "NAME"]
+            items = [JsOp.ACTION_CALL, args, len(kwargs)]
+            for i in kwargs:
+                items += name_bytes(i)
+            items += [byte_length(node.loc[0]), to_bytes(node.loc[0])]
+            items += [byte_length(node.loc[1]), to_bytes(node.loc[1])]
+            code, last = bytearray(), node
+            if kid[1].name == "param_list":
+                code = code_of(kid[1])
+                last = [i for i in kid[1].kid[-1].kid if i.name != "COMMA"][-1]
+            # Actions report against the last arg run, errors raise at the call
+            self.emit(node, code, *self.debug_items(last), *items, frag=True)
+
+    def exit_index_slice(self, node):
+        kid = node.kid
+        if len(kid) == 3 and is_bytecode_complete(node):
+            self.emit(
+                node,
+                code_of(kid[1]),
+                JsOp.LOAD_INDEX,
+                int(self.create_var_mode > 0),
+                frag=True,
+            )
+
+    def exit_param_list(self, node):
+        if is_bytecode_complete(node):
+            self.emit(
+                node, *[code_of(i) for i in node.kid if i.name != "COMMA"], frag=True
+            )
+
+    def exit_expr_list(self, node):
+        if is_bytecode_complete(node):
+            self.emit(
+                node, *[code_of(i) for i in node.kid if i.name != "COMMA"], frag=True
+            )
+
+    def exit_kw_expr_list(self, node):
+        if is_bytecode_complete(node):
+            self.emit(
+                node, *[code_of(i) for i in node.kid if not i.is_terminal()], frag=True
+            )
+
+    def exit_list_val(self, node):
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        count = 0
+        if kid[1].name == "expr_list":
+            count = len([i for i in kid[1].kid if i.name != "COMMA"])
+            self.emit(node, code_of(kid[1]), frag=True)
+        self.emit(node, JsOp.BUILD_LIST, rel_bytes(count), frag=True)
+
+    def exit_dict_val(self, node):
+        if not is_bytecode_complete(node):
+            return
+        pairs = [i for i in node.kid if i.name == "kv_pair"]
+        for i in pairs:
+            self.emit(node, code_of(i), frag=True)
+        self.emit(node, JsOp.BUILD_DICT, rel_bytes(len(pairs)), frag=True)
+
+    def exit_kv_pair(self, node):
+        if is_bytecode_complete(node):
+            self.emit(node, code_of(node.kid[0]), code_of(node.kid[2]), frag=True)
+
+    def exit_node_edge_ref(self, node):
+        kid = node.kid
+        if len(kid) == 1 and kid[0].name == "edge_ref":
+            ref = kid[0].kid[0]
+            if len(ref.kid) > 3 and not ref.kid[3].is_terminal():
+                return
+            name = ref.kid[2].token_text() if len(ref.kid) > 2 else ""
+            direction = {
+                "edge_to": JsEdgeDir.TO,
+                "edge_from": JsEdgeDir.FROM,
+                "edge_any": JsEdgeDir.ANY,
+            }[ref.name]
+            self.emit(node, JsOp.LOAD_EDGE_REF, direction, *name_bytes(name), frag=True)
+
+    # Statements are compiled when all of their parts compile, only
+    # statement and code_block get runnable bytecode, other rules emit
+    # fragments as they're only ever run from those
+
+    def exit_statement(self, node):
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        self.emit(node, code_of(kid[0]))
+        if kid[0].name == "expression":
+            self.emit(node, JsOp.POP)
+
+    def exit_code_block(self, node):
+        if is_bytecode_complete(node):
+            self.emit(node, *[code_of(i) for i in node.kid if i.name == "statement"])
+            if not node.bytecode:
+                self.emit(node, JsOp.NOP)
+
+    def exit_if_stmt(self, node):
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        branches = [(code_of(kid[1]), code_of(kid[2]))]
+        rest = bytearray()
+        for i in kid[3:]:
+            if i.name == "elif_stmt":
+                branches.append((code_of(i.kid[1]), code_of(i.kid[2])))
+            else:
+                rest = code_of(i)
+        for cond, block in reversed(branches):
+            jump = (
+                self.assemble(JsOp.JUMP, rel_bytes(5 + len(rest)))
+                if len(rest)
+                else bytearray()
+            )
+            rest = self.assemble(
+                cond,
+                JsOp.JUMP_IF_FALSE,
+                rel_bytes(5 + len(block) + len(jump)),
+                block,
+                jump,
+                rest,
+            )
+        self.emit(node, rest, frag=True)
+
+    def exit_elif_stmt(self, node):
+        if is_bytecode_complete(node):
+            node._frag = bytearray()  # assembled by if_stmt
+
+    def exit_else_stmt(self, node):
+        if is_bytecode_complete(node):
+            self.emit(node, code_of(node.kid[1]), frag=True)
+
+    def exit_while_stmt(self, node):
+        if not is_bytecode_complete(node):
+            return
+        self.emit_loop(node, cond=code_of(node.kid[1]), body=code_of(node.kid[2]))
+
+    def exit_for_stmt(self, node):
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        if kid[1].name == "expression":
+            self.emit(node, code_of(kid[1]), JsOp.POP, frag=True)
+            self.emit_loop(
+                node,
+                cond=code_of(kid[3]),
+                body=code_of(kid[6]),
+                step=self.assemble(code_of(kid[5]), JsOp.POP),
+            )
+        else:
+            names = [i.token_text() for i in kid if i.name == "NAME"]
+            items = [JsOp.SET_ITER, len(names)]
+            for i in names:
+                items += name_bytes(i)
+            self.emit(node, code_of(kid[-2]), frag=True)
+            self.emit_loop(node, setup=self.assemble(*items), body=code_of(kid[-1]))
+
+    def emit_loop(self, node, body, cond=None, step=bytearray(), setup=bytearray()):
+        """
+        Emits loop as
+            SETUP_LOOP setup (cond JUMP_IF_FALSE | FOR_ITER) body step
+            LOOP_NEXT POP_LOOP
+        where break jumps to POP_LOOP and continue to step
+        """
+        test = (
+            self.assemble(cond, JsOp.JUMP_IF_FALSE)
+            if cond is not None
+            else self.assemble(JsOp.FOR_ITER)
+        )
+        test += rel_bytes(4 + len(body) + len(step) + 6)
+        top = 9 + len(setup)
+        cont = top + len(test) + len(body)
+        end = cont + len(step) + 5
+        self.emit(
+            node,
+            JsOp.SETUP_LOOP,
+            rel_bytes(end),
+            rel_bytes(cont),
+            setup,
+            test,
+            body,
+            step,
+            JsOp.LOOP_NEXT,
+            rel_bytes(top - (end - 5)),
+            JsOp.POP_LOOP,
+            frag=True,
+        )
+
+    def exit_ctrl_stmt(self, node):
+        op = {"KW_BREAK": JsOp.BREAK, "KW_CONTINUE": JsOp.CONTINUE}
+        self.emit(node, op.get(node.kid[0].name, JsOp.SKIP), frag=True)
+
+    def exit_try_stmt(self, node):
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        handler = self.assemble(JsOp.CATCH, *name_bytes(""))
+        if len(kid) > 2:
+            handler = code_of(kid[2])
+        block = code_of(kid[1])
+        self.emit(
+            node,
+            JsOp.SETUP_TRY,
+            rel_bytes(5 + len(block) + 1 + 5),
+            block,
+            JsOp.POP_TRY,
+            JsOp.JUMP,
+            rel_bytes(5 + len(handler)),
+            handler,
+            frag=True,
+        )
+
+    def exit_else_from_try(self, node):
+        kid = node.kid
+        if is_bytecode_complete(node):
+            name = kid[2].token_text() if len(kid) > 2 else ""
+            self.emit(node, JsOp.CATCH, *name_bytes(name), code_of(kid[-1]), frag=True)
+
+    def exit_report_action(self, node):
+        kid = node.kid
+        if kid[1].name == "expression" and is_bytecode_complete(node):
+            self.emit(node, code_of(kid[1]), JsOp.REPORT, frag=True)
+
+    def exit_walker_action(self, node):
+        """Abilities run on plain interpreters so only walker bodies compile"""
+        if is_bytecode_complete(node) and self.walker_depth and not self.ability_depth:
+            self.emit(node, code_of(node.kid[0]), frag=True)
+
+    def exit_ignore_action(self, node):
+        if is_bytecode_complete(node):
+            self.emit(node, code_of(node.kid[1]), JsOp.IGNORE, frag=True)
+
+    def exit_take_action(self, node):
+        kid = node.kid
+        if not is_bytecode_complete(node):
+            return
+        style = "b"
+        if kid[1].name == "COLON":
+            style = kid[2].token_text()
+            kid = kid[2:]
+        self.emit(node, code_of(kid[1]), JsOp.TAKE, *name_bytes(style), frag=True)
+        if kid[2].name == "else_stmt":
+            other = code_of(kid[2])
+            self.emit(
+                node,
+                JsOp.JUMP_IF_FALSE,
+                rel_bytes(10),
+                JsOp.JUMP,
+                rel_bytes(5 + len(other)),
+                other,
+                frag=True,
+            )
+        else:
+            self.emit(node, JsOp.POP, frag=True)
+
+    def exit_disengage_action(self, node):
+        kid = node.kid
+        if is_bytecode_complete(node):
+            if kid[1].name == "report_action":
+                self.emit(node, code_of(kid[1]), frag=True)
+            self.emit(node, JsOp.DISENGAGE, frag=True)
 
     def exit_any_type(self, node):
         kid = node.kid
@@ -1,5 +1,4 @@
 from jaseci.jac.ir.passes import (
-    ParseTreePrunePass,
     PrinterPass,
     StatsPass,
     CodeGenPass,
@@ -9,7 +8,7 @@ from jaseci.jac.ir.ast import Ast
 
 
 def multi_pass_optimizer(jac_ast: Ast, opt_level: int):
-    ParseTreePrunePass(ir=jac_ast).run() if opt_level > 0 else None
+    # Parse tree pruning (opt_level > 0) is done by JacAstBuilder as it builds
     CodeGenPass(ir=jac_ast).run() if opt_level > 2 else None
     AstPrunePass(ir=jac_ast).run() if opt_level > 2 else None
 
@@ -12,23 +12,66 @@ class JacSet(list):
     """
     Jac set class for operations in Jac lang
     (keeps append ordering and no dups)
+
+    Membership is tracked by jid alongside the list so adds, lookups and
+    set operations are linear, the list keeps ordering and indexing
     """
 
     def __init__(self, in_list=None):
+        self._ids = set()
         if in_list:
             for i in in_list:
-                if i not in self:
-                    self.append(i)
+                self.append(i)
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+    def __contains__(self, item):
+        return getattr(item, "jid", None) in self._ids
 
     def append(self, item):
         if not isinstance(item, Element) or not hasattr(item, "anchor_value"):
             logger.error(f"Invalid {type(item)} object {item} to be added to jac_set!")
-        elif item not in self:
+        elif item.jid not in self._ids:
             list.append(self, item)
+            self._ids.add(item.jid)
 
     def add_obj(self, item: Element):
+        self.append(item)
+
+    def extend(self, items):
+        for i in items:
+            self.append(i)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def insert(self, index, item):
         if item not in self:
-            self.append(item)
+            list.insert(self, index, item)
+            self._ids.add(item.jid)
+
+    def remove(self, item):
+        list.remove(self, item)
+        self._ids.discard(item.jid)
+
+    def pop(self, index=-1):
+        item = list.pop(self, index)
+        self._ids.discard(item.jid)
+        return item
+
+    def clear(self):
+        list.clear(self)
+        self._ids.clear()
+
+    def __setitem__(self, key, val):
+        list.__setitem__(self, key, val)
+        self._ids = set(i.jid for i in self)
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self._ids = set(i.jid for i in self)
 
     def obj_list(self):
         return self
@@ -83,37 +126,30 @@ class JacSet(list):
 
     def __add__(self, other):
         """Returns new set with operation applied"""
-        ret = JacSet()
-        for i in self:
-            ret.add_obj(i)
-        for i in other:
-            if i not in ret:
-                ret.add_obj(i)
+        ret = JacSet(in_list=self)
+        ret.extend(other)
         return ret
 
     def __sub__(self, other):
         """Returns new set with operation applied"""
-        ret = JacSet()
-        for i in self:
-            if i not in other:
-                ret.add_obj(i)
-        return ret
+        other_ids = id_set(other)
+        return JacSet(in_list=[i for i in self if i.jid not in other_ids])
 
     def __mul__(self, other):
         """Returns new set with operation applied, mul is intersection"""
-        ret = JacSet()
-        for i in self:
-            if i in other:
-                ret.add_obj(i)
-        return ret
+        other_ids = id_set(other)
+        return JacSet(in_list=[i for i in self if i.jid in other_ids])
 
     def __truediv__(self, other):
         """Returns new set with operation applied, div is 'outersection'"""
-        ret = JacSet()
-        for i in self:
-            if i not in other:
-                ret.add_obj(i)
-        for i in other:
-            if i not in self:
-                ret.add_obj(i)
+        other_ids = id_set(other)
+        ret = JacSet(in_list=[i for i in self if i.jid not in other_ids])
+        ret.extend([i for i in other if i not in self])
         return ret
+
+
+def id_set(objs):
+    """Set of jids for a JacSet or list of elements"""
+    if isinstance(objs, JacSet):
+        return objs._ids
+    return set(getattr(i, "jid", None) for i in objs)
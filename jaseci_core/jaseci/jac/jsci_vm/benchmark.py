@@ -0,0 +1,119 @@
+"""
+Benchmark of bytecode execution against the AST interpreter
+
+Registers each jac program at every opt level (2 interprets the AST, 4 runs
+compiled bytecode) and times its entry walker, reports are compared across
+levels so the benchmark also flags any divergence between the two paths
+
+    python -m jaseci.jac.jsci_vm.benchmark
+"""
+import json
+import re
+from time import perf_counter
+
+from jaseci.svc import MetaService
+from jaseci.utils.utils import logger
+
+# Ids and timestamps differ between runs, blanked before reports are compared
+volatile = re.compile(
+    r"urn:uuid:[0-9a-f-]{36}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-"
+    r"[0-9a-f]{12}|\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?"
+)
+
+
+def normalized(report):
+    """Report as a string with jids and timestamps blanked"""
+    return volatile.sub("_", json.dumps(report, sort_keys=True, default=str))
+
+
+def entry_walker(mast, snt_name):
+    """Walker to time, init if it exists otherwise the first walker"""
+    snt = mast.sentinel_ids.get_obj_by_name(snt_name)
+    walkers = [i.name for i in snt.arch_ids.obj_list() if i.kind == "walker"]
+    if "init" in walkers:
+        return "init"
+    return walkers[0] if walkers else None
+
+
+def bench_program(code, opt_level=4, rounds=5):
+    """
+    Returns (best seconds per walker run, report) for code at opt_level,
+    time is None if the program doesn't register or has no walker
+    """
+    mast = MetaService().build_super_master()
+    name = "bench"
+    ret = mast.sentinel_register(name=name, code=code, opt_level=opt_level, auto_run="")
+    if isinstance(ret, dict) and not ret.get("success", True):
+        return None, None
+    walker = entry_walker(mast, name)
+    if not walker:
+        return None, None
+    best, report = None, None
+    for _ in range(rounds):
+        start = perf_counter()
+        res = mast.general_interface_to_api(
+            api_name="walker_run", params={"name": walker}
+        )
+        took = perf_counter() - start
+        best = took if best is None else min(best, took)
+        report = res.get("report") if isinstance(res, dict) else None
+    return best, report
+
+
+def bench_programs(progs, opt_levels=(2, 4), rounds=5):
+    """
+    progs is a dict of program name to jac code, returns a dict of name to
+    {"times": {opt_level: secs}, "same_report": bool}
+    """
+    results = {}
+    for name, code in progs.items():
+        times, reports = {}, []
+        try:
+            for level in opt_levels:
+                times[level], report = bench_program(code, level, rounds)
+                reports.append(report)
+        except Exception as e:
+            logger.error(f"Benchmark of {name} failed: {e}")
+            continue
+        if None in times.values():
+            continue
+        results[name] = {
+            "times": times,
+            "same_report": len(set(normalized(i) for i in reports)) == 1,
+        }
+    return results
+
+
+def corpus():
+    """The jac_test_progs corpus shipped with the test suite"""
+    import jaseci.tests.jac_test_progs as jtp
+
+    return {
+        k: v
+        for k, v in vars(jtp).items()
+        if isinstance(v, str) and not k.startswith("_") and "walker" in v
+    }
+
+
+def summarize(results, base=2, opt=4):
+    lines = [f"{'program':<40}{'ast (ms)':>12}{'vm (ms)':>12}{'speedup':>10}"]
+    tot_base = tot_opt = 0
+    for name, res in results.items():
+        t_base, t_opt = res["times"][base], res["times"][opt]
+        tot_base += t_base
+        tot_opt += t_opt
+        flag = "" if res["same_report"] else "  (reports differ)"
+        lines.append(
+            f"{name:<40}{t_base * 1000:>12.2f}{t_opt * 1000:>12.2f}"
+            f"{t_base / t_opt:>9.2f}x{flag}"
+        )
+    if tot_opt:
+        lines.append(
+            f"{'total':<40}{tot_base * 1000:>12.2f}{tot_opt * 1000:>12.2f}"
+            f"{tot_base / tot_opt:>9.2f}x"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(summarize(bench_programs(corpus())))
@@ -0,0 +1,216 @@
+"""
+Load time decoder for jsci_vm bytecode
+
+Turns a bytecode blob into a program, a tuple of (op, operand) pairs with
+constants materialized, names interned and jump targets resolved to
+instruction indices, so the machine never parses bytes while running
+"""
+from sys import intern
+from base64 import b64decode
+from jaseci.jac.jsci_vm.op_codes import JsCmp, JsEdgeDir, JsOp, JsType, type_map
+from jaseci.jac.jsci_vm.op_codes import BYTECODE_HEADER
+from jaseci.jac.jsci_vm.inst_ptr import InstPtr, from_bytes
+from jaseci.graph.node import TO, FROM, BI
+
+PROGRAM_CACHE_MAX = 4096
+
+edge_dirs = {
+    JsEdgeDir.TO: [TO, BI],
+    JsEdgeDir.FROM: [FROM, BI],
+    JsEdgeDir.ANY: [TO, FROM, BI],
+}
+
+jump_ops = {
+    JsOp.JUMP,
+    JsOp.JUMP_IF_FALSE,
+    JsOp.JUMP_IF_FALSE_OR_POP,
+    JsOp.JUMP_IF_TRUE_OR_POP,
+    JsOp.FOR_ITER,
+    JsOp.LOOP_NEXT,
+    JsOp.SETUP_TRY,
+}
+
+# b64 bytecode to decoded program, shared by every machine in the process
+program_cache = {}
+
+
+class Decoder(InstPtr):
+    def __init__(self):
+        InstPtr.__init__(self)
+        self._insts = []
+
+    def decode(self, bytecode):
+        """
+        Returns program for bytecode (raw bytes or b64 string), empty if
+        bytecode is of an unknown format version
+        """
+        if type(bytecode) == str:
+            bytecode = b64decode(bytecode.encode())
+        if bytecode[:1] != BYTECODE_HEADER[:1]:
+            return DecoderV1().decode_insts(bytecode, 0)
+        if bytecode[: len(BYTECODE_HEADER)] != BYTECODE_HEADER:
+            return ()
+        return self.decode_insts(bytecode, len(BYTECODE_HEADER))
+
+    def decode_insts(self, bytecode, start):
+        """Program for the instructions of bytecode from byte start on"""
+        self._bytecode = bytearray(bytecode)
+        self._ip = start
+        starts = {}
+        while self._ip < len(self._bytecode):
+            starts[self._ip] = len(self._insts)
+            op = JsOp(self._bytecode[self._ip])
+            if hasattr(self, f"dec_{op.name}"):
+                arg = getattr(self, f"dec_{op.name}")()
+            else:
+                arg = None
+            self.add_inst(op, arg)
+            self._ip += 1
+        starts[len(self._bytecode)] = len(self._insts)
+        for inst in self._insts:
+            if inst[0] in jump_ops:
+                inst[1] = starts[inst[1]]
+            elif inst[0] == JsOp.SETUP_LOOP:
+                inst[1] = (starts[inst[1][0]], starts[inst[1][1]])
+        return tuple((op, arg) for op, arg in self._insts)
+
+    def add_inst(self, op, arg):
+        self._insts.append([op, arg])
+
+    def rel(self, delta=1):
+        """Absolute target of 4 byte relative jump operand at delta"""
+        return self._ip + from_bytes(int, self.offset(delta, 4), signed=True)
+
+    def name(self, delta=1):
+        name = from_bytes(str, self.offset(delta + 1, self.offset(delta)))
+        self._ip += delta + self.offset(delta)
+        return intern(name)
+
+    def number(self, delta=1):
+        val = from_bytes(int, self.offset(delta + 1, self.offset(delta)))
+        self._ip += delta + self.offset(delta)
+        return val
+
+    def dec_jump(self):
+        target = self.rel()
+        self._ip += 4
+        return target
+
+    dec_JUMP = dec_JUMP_IF_FALSE = dec_FOR_ITER = dec_LOOP_NEXT = dec_jump
+    dec_JUMP_IF_FALSE_OR_POP = dec_JUMP_IF_TRUE_OR_POP = dec_SETUP_TRY = dec_jump
+
+    def dec_COMPARE(self):  # noqa
+        self._ip += 1
+        return JsCmp(self.offset(0))
+
+    dec_INCREMENT = dec_COMPARE
+
+    def dec_LOAD_CONST(self):  # noqa
+        typ = JsType(self.offset(1))
+        operand2 = self.offset(2)
+        if typ in [JsType.TYPE]:
+            val = type_map[JsType(operand2)]
+            self._ip += 2
+        elif typ in [JsType.INT]:
+            val = from_bytes(type_map[typ], self.offset(3, operand2))
+            self._ip += 2 + operand2
+        elif typ in [JsType.STRING]:
+            str_len = from_bytes(type_map[JsType.INT], self.offset(3, operand2))
+            val = from_bytes(type_map[typ], self.offset(3 + operand2, str_len))
+            self._ip += 2 + operand2 + str_len
+        elif typ in [JsType.FLOAT]:
+            val = from_bytes(float, self.offset(2, 8))
+            self._ip += 1 + 8
+        elif typ in [JsType.BOOL]:
+            val = bool(self.offset(2))
+            self._ip += 1 + 1
+        return val
+
+    def dec_named(self):
+        return self.name()
+
+    dec_LOAD_VAR = dec_CREATE_VAR = dec_CATCH = dec_TAKE = dec_named
+
+    def dec_DEBUG_INFO(self):  # noqa
+        return (self.number(), self.name(), self.number(), self.name())
+
+    def dec_SETUP_LOOP(self):  # noqa
+        targets = (self.rel(1), self.rel(5))
+        self._ip += 8
+        return targets
+
+    def dec_SET_ITER(self):  # noqa
+        count = self.offset(1)
+        self._ip += 1
+        return tuple(self.name() for _ in range(count))
+
+    def dec_ACTION_CALL(self):  # noqa
+        args, kwargs = self.offset(1), self.offset(2)
+        self._ip += 2
+        names = tuple(self.name() for _ in range(kwargs))
+        return (args, names, self.number(), self.number())
+
+    def dec_LOAD_ATTR(self):  # noqa
+        return (bool(self.offset(1)), self.name(2))
+
+    def dec_LOAD_INDEX(self):  # noqa
+        self._ip += 1
+        return bool(self.offset(0))
+
+    def dec_build(self):
+        count = from_bytes(int, self.offset(1, 4))
+        self._ip += 4
+        return count
+
+    dec_BUILD_LIST = dec_BUILD_DICT = dec_build
+
+    def dec_LOAD_EDGE_REF(self):  # noqa
+        dirs = edge_dirs[JsEdgeDir(self.offset(1))]
+        return (dirs, self.name(2) or None)
+
+
+class DecoderV1(Decoder):
+    """
+    Decoder of the first, unversioned layout: expressions only, operands of
+    binary ops pushed right to left and debug info without column or rule
+    """
+
+    binary_ops = {
+        JsOp.ADD,
+        JsOp.SUBTRACT,
+        JsOp.MULTIPLY,
+        JsOp.DIVIDE,
+        JsOp.MODULO,
+        JsOp.POWER,
+        JsOp.AND,
+        JsOp.OR,
+        JsOp.ASSIGN,
+        JsOp.COPY_FIELDS,
+        JsOp.INCREMENT,
+    }
+
+    def add_inst(self, op, arg):
+        if op in self.binary_ops or (op == JsOp.COMPARE and arg != JsCmp.NOT):
+            super().add_inst(JsOp.SWAP, None)
+        elif op == JsOp.ACTION_CALL:  # emitted without operands, did nothing
+            op = JsOp.NOP
+        super().add_inst(op, arg)
+
+    def dec_DEBUG_INFO(self):  # noqa
+        return (self.number(), self.name(), 0, None)
+
+    def dec_ACTION_CALL(self):  # noqa
+        return None
+
+
+def decode_bytecode(bytecode):
+    """
+    Decoded program for b64 bytecode, decoded once per process, empty for
+    bytecode of an unknown format version
+    """
+    program = program_cache.get(bytecode)
+    if program is None:
+        if len(program_cache) >= PROGRAM_CACHE_MAX:
+            program_cache.clear()
+        program = program_cache[bytecode] = Decoder().decode(bytecode)
+    return program
@@ -1,4 +1,5 @@
-from jaseci.jac.jsci_vm.op_codes import JsCmp, JsOp, JsType, type_map
+from jaseci.jac.jsci_vm.op_codes import JsCmp, JsEdgeDir, JsOp, JsType, type_map
+from jaseci.jac.jsci_vm.op_codes import BYTECODE_HEADER
 from jaseci.jac.jsci_vm.inst_ptr import InstPtr, from_bytes
 from jaseci.utils.utils import logger
 from base64 import b64decode
@@ -13,6 +14,11 @@ class DisAsm(InstPtr):
         if type(bytecode) == str:
             bytecode = b64decode(bytecode.encode())
         self._bytecode = bytearray(bytecode)
+        self._version = 1
+        if self._bytecode[:1] == BYTECODE_HEADER[:1]:
+            self._version = self._bytecode[1]
+            self._ip = len(BYTECODE_HEADER)
+        self._asm.append(["BYTECODE_VERSION", self._version])
         try:
             while self._ip < len(self._bytecode):
                 op = JsOp(self._bytecode[self._ip])
@@ -37,12 +43,12 @@ class DisAsm(InstPtr):
         for i in self._asm:
             logger.info(str(i))
 
-    def op_COMPARE(self):  # noqa
+    def dis_COMPARE(self):  # noqa
         ctyp = JsCmp(self.offset(1))
         self._asm.append([self.cur_op(), ctyp.name])
         self._ip += 1
 
-    def op_INCREMENT(self):  # noqa
+    def dis_INCREMENT(self):  # noqa
         ityp = JsCmp(self.offset(1))
         self._asm.append([self.cur_op(), ityp.name])
         self._ip += 1
@@ -83,12 +89,73 @@ class DisAsm(InstPtr):
         self._ip += 1 + self.offset(1)
 
     def dis_DEBUG_INFO(self):  # noqa
-        byte_len_l = self.offset(1)
-        line = from_bytes(int, self.offset(2, byte_len_l))
-        f_offset = byte_len_l + 2
-        byte_len_f = self.offset(f_offset)
-        jacfile = (
-            from_bytes(str, self.offset(f_offset + 1, byte_len_f)) if byte_len_f else 0
-        )
-        self._asm.append([self.cur_op(), byte_len_l, line, byte_len_f, jacfile])
-        self._ip += 2 + byte_len_l + byte_len_f
+        op = self.cur_op()
+        line = from_bytes(int, self.offset(2, self.offset(1)))
+        self._ip += 1 + self.offset(1)
+        jacfile = self.name()
+        if self._version == 1:
+            self._asm.append([op, line, jacfile])
+            return
+        col = from_bytes(int, self.offset(2, self.offset(1)))
+        self._ip += 1 + self.offset(1)
+        self._asm.append([op, line, jacfile, col, self.name()])
+
+    def rel(self, delta=1):
+        """Absolute target of 4 byte relative jump operand at delta"""
+        return self._ip + from_bytes(int, self.offset(delta, 4), signed=True)
+
+    def name(self, delta=1):
+        name = from_bytes(str, self.offset(delta + 1, self.offset(delta)))
+        self._ip += delta + self.offset(delta)
+        return name
+
+    def number(self, delta=1):
+        val = from_bytes(int, self.offset(delta + 1, self.offset(delta)))
+        self._ip += delta + self.offset(delta)
+        return val
+
+    def dis_jump(self):
+        self._asm.append([self.cur_op(), self.rel()])
+        self._ip += 4
+
+    dis_JUMP = dis_JUMP_IF_FALSE = dis_FOR_ITER = dis_LOOP_NEXT = dis_jump
+    dis_JUMP_IF_FALSE_OR_POP = dis_JUMP_IF_TRUE_OR_POP = dis_SETUP_TRY = dis_jump
+
+    def dis_SETUP_LOOP(self):  # noqa
+        self._asm.append([self.cur_op(), self.rel(1), self.rel(5)])
+        self._ip += 8
+
+    def dis_SET_ITER(self):  # noqa
+        op, count = self.cur_op(), self.offset(1)
+        self._ip += 1
+        self._asm.append([op, count] + [self.name() for _ in range(count)])
+
+    def dis_ACTION_CALL(self):  # noqa
+        op, args, kwargs = self.cur_op(), self.offset(1), self.offset(2)
+        self._ip += 2
+        names = [self.name() for _ in range(kwargs)]
+        self._asm.append([op, args, kwargs] + names + [self.number(), self.number()])
+
+    def dis_LOAD_ATTR(self):  # noqa
+        op, assign = self.cur_op(), self.offset(1)
+        self._asm.append([op, assign, self.name(2)])
+
+    def dis_LOAD_INDEX(self):  # noqa
+        self._asm.append([self.cur_op(), self.offset(1)])
+        self._ip += 1
+
+    def dis_build(self):
+        self._asm.append([self.cur_op(), from_bytes(int, self.offset(1, 4))])
+        self._ip += 4
+
+    dis_BUILD_LIST = dis_BUILD_DICT = dis_build
+
+    def dis_LOAD_EDGE_REF(self):  # noqa
+        op, direction = self.cur_op(), JsEdgeDir(self.offset(1)).name
+        self._asm.append([op, direction, self.name(2)])
+
+    def dis_named(self):
+        op = self.cur_op()
+        self._asm.append([op, self.name()])
+
+    dis_CATCH = dis_TAKE = dis_named
@@ -2,7 +2,7 @@ from jaseci.jac.jsci_vm.op_codes import JsOp
 from struct import unpack
 
 
-def from_bytes(typ, val):
+def from_bytes(typ, val, signed=False):
     if typ == str:
         if val is None:
             return ""
@@ -12,7 +12,7 @@ def from_bytes(typ, val):
     else:
         if val is None:
             return 0
-        return typ.from_bytes(val, "little")
+        return typ.from_bytes(val, "little", signed=signed)
 
 
 class InstPtr:
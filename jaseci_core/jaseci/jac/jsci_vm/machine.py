@@ -1,8 +1,11 @@
-from jaseci.jac.jsci_vm.op_codes import JsCmp, JsOp, JsType, type_map, cmp_op_map
-from jaseci.jac.machine.machine_state import MachineState
-from jaseci.jac.jsci_vm.inst_ptr import InstPtr, from_bytes
+from copy import copy
+from jaseci.jac.jsci_vm.op_codes import JsCmp, JsOp, cmp_op_map
+from jaseci.jac.machine.machine_state import MachineState, TryException
+from jaseci.element.element import Element
 from jaseci.jac.machine.jac_value import JacValue
+from jaseci.utils.slot_context import SlotContext
 from jaseci.jac.jsci_vm.disasm import DisAsm
+from jaseci.jac.jsci_vm.decoder import decode_bytecode
 
 
 class Stack(object):
@@ -13,9 +16,10 @@ class Stack(object):
         return len(self._stk) == 0
 
     def pop(self):
-        if self.stack_is_empty():
+        try:
+            return self._stk.pop()
+        except IndexError:
             raise Exception("JaseciMachine stack is empty")
-        return self._stk.pop()
 
     def push(self, value):
         self._stk.append(value)
@@ -27,162 +31,410 @@ class Stack(object):
             print(list(reversed(self._stk))[0:count])
 
 
-class VirtualMachine(MachineState, Stack, InstPtr):
+class VirtualMachine(MachineState, Stack):
+    op_maps = {}  # op handlers per machine class, called with the machine
+
     def __init__(self, **kwargs):
         Stack.__init__(self)
-        InstPtr.__init__(self)
         MachineState.__init__(self, **kwargs)
-        self._op = self.build_op_call()
-        self._op_id = id(self)
+        self._ip = 0
+        self._program = None
+        self._bytecode = None
+        self._blocks = []  # loop frames and try frames, innermost last
+        self._debug_info = None
+        self._line_frame = None  # (line, start) of line timed when profiling
 
     def reset_vm(self):
         Stack.__init__(self)
-        InstPtr.__init__(self)
-        if id(self) != self._op_id:
-            self._op = self.build_op_call()
+        self._ip = 0
+        self._blocks = []
+        self._debug_info = None
 
     def build_op_call(self):
-        op_map = {}
-        for op in JsOp:
-            op_map[op] = getattr(self, f"op_{op.name}")
-        return op_map
-
-    def run_bytecode(self, bytecode):
-        self.reset_vm()
-        self._bytecode = bytearray(bytecode)
+        """Op map of this machine's class, built once per class"""
+        cls = type(self)
+        if cls not in VirtualMachine.op_maps:
+            op_map = {}
+            for op in JsOp:
+                op_map[op] = getattr(cls, f"op_{op.name}")
+            VirtualMachine.op_maps[cls] = op_map
+        return VirtualMachine.op_maps[cls]
+
+    def run_bytecode(self, bytecode, program=None):
+        """
+        Runs bytecode to completion, reentrant as actions triggered from
+        bytecode may run more jac on this machine, results stay on the stack
+
+        program is the decoded form of bytecode, decoded here if not given
+        """
+        if program is None:
+            program = decode_bytecode(bytecode)
+        outer = None
+        if self._program is None:
+            self.reset_vm()
+        else:
+            outer = [self._ip, self._program, self._bytecode, self._blocks]
+            outer += [self._debug_info, self._line_frame]
+            self._ip, self._blocks, self._debug_info = 0, [], None
+        self._program, self._bytecode = program, bytecode
+        self._line_frame = None
+        ops, end = self.build_op_call(), len(program)
+        if self._profiler:
+            ops = dict(ops)
+            ops[JsOp.DEBUG_INFO] = type(self).profile_debug_info
         try:
-            while self._ip < len(self._bytecode):
-                self._op[self._bytecode[self._ip]]()
-                self._ip += 1
+            while self._ip < end:
+                try:
+                    while self._ip < end:
+                        op, arg = program[self._ip]
+                        ops[op](self, arg)
+                        self._ip += 1
+                except Exception as e:
+                    if not self.catch_exception(e):
+                        raise e
         except Exception as e:
+            self.unwind_blocks()
+            if isinstance(e, TryException):
+                raise e
             self.disassemble(print_out=False, log_out=True)
-            raise e
+            self.sync_debug_info()
+            self.jac_try_exception(e, self._cur_jac_ast)
+        finally:
+            if self._line_frame:
+                self._profiler.stop(self._line_frame[1])
+            if outer:
+                self._ip, self._program, self._bytecode, self._blocks = outer[:4]
+                self._debug_info, self._line_frame = outer[4:]
+            else:
+                self._program = self._bytecode = None
+
+    def catch_exception(self, e):
+        """Jumps to the innermost try handler, returns False if none"""
+        while self._blocks:
+            frame = self._blocks.pop()
+            if frame[0] == "try":
+                self._jac_try_mode -= 1
+                del self._stk[frame[2] :]
+                self.sync_debug_info()
+                ref = e.ref if isinstance(e, TryException) else None
+                self.push(
+                    JacValue(
+                        self, value=ref or self.jac_exception(e, self._cur_jac_ast)
+                    )
+                )
+                self._ip = frame[1]
+                return True
+        return False
+
+    def unwind_blocks(self, kind=None):
+        """Pops frames down to the innermost frame of kind (or all frames)"""
+        while self._blocks and self._blocks[-1][0] != kind:
+            if self._blocks.pop()[0] == "try":
+                self._jac_try_mode -= 1
+        return self._blocks[-1] if self._blocks else None
+
+    def halt(self):
+        self.unwind_blocks()
+        self._ip = len(self._program)
 
     def disassemble(self, print_out=True, log_out=False):
         return DisAsm().disassemble(self._bytecode, print_out, log_out)
 
-    def op_PUSH_SCOPE(self):  # noqa
+    def op_PUSH_SCOPE(self, arg):  # noqa
         pass
 
-    def op_POP_SCOPE(self):  # noqa
+    def op_POP_SCOPE(self, arg):  # noqa
         pass
 
-    def op_ADD(self):  # noqa
+    def op_ADD(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value + self.pop().value
+        val.value = val.value + rhs.value
         self.push(val)
 
-    def op_SUBTRACT(self):  # noqa
+    def op_SUBTRACT(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value - self.pop().value
+        val.value = val.value - rhs.value
         self.push(val)
 
-    def op_MULTIPLY(self):  # noqa
+    def op_MULTIPLY(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value * self.pop().value
+        val.value = val.value * rhs.value
         self.push(val)
 
-    def op_DIVIDE(self):  # noqa
+    def op_DIVIDE(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value / self.pop().value
+        val.value = val.value / rhs.value
         self.push(val)
 
-    def op_MODULO(self):  # noqa
+    def op_MODULO(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value % self.pop().value
+        val.value = val.value % rhs.value
         self.push(val)
 
-    def op_POWER(self):  # noqa
+    def op_POWER(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value ** self.pop().value
+        val.value = val.value**rhs.value
         self.push(val)
 
-    def op_NEGATE(self):  # noqa
+    def op_NEGATE(self, arg):  # noqa
         val = self.pop()
         val.value = -(val.value)
         self.push(val)
 
-    def op_COMPARE(self):  # noqa
-        ctyp = JsCmp(self.offset(1))
-        val = self.pop()
-        val.value = (
-            cmp_op_map[ctyp](val.value, self.pop().value)
-            if ctyp != JsCmp.NOT
-            else cmp_op_map[ctyp](val.value)
-        )
+    def op_COMPARE(self, arg):  # noqa
+        if arg != JsCmp.NOT:
+            rhs = self.pop()
+            val = JacValue(self, value=cmp_op_map[arg](self.pop().value, rhs.value))
+        else:
+            val = JacValue(self, value=cmp_op_map[arg](self.pop().value))
         self.push(val)
-        self._ip += 1
 
-    def op_AND(self):  # noqa
+    def op_AND(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value and self.pop().value
+        val.value = val.value and rhs.value
         self.push(val)
 
-    def op_OR(self):  # noqa
+    def op_OR(self, arg):  # noqa
+        rhs = self.pop()
         val = self.pop()
-        val.value = val.value or self.pop().value
+        val.value = val.value or rhs.value
         self.push(val)
 
-    def op_ASSIGN(self):  # noqa
-        dest = self.pop()
-        self.perform_assignment(dest, self.pop())
-
-    def op_COPY_FIELDS(self):  # noqa
-        dest = self.pop()
-        self.perform_copy_fields(dest, self.pop())
-
-    def op_INCREMENT(self):  # noqa
-        ityp = JsCmp(self.offset(1))
-        dest = self.pop()
-        self.perform_increment(dest, self.pop(), ityp)
-        self._ip += 1
-
-    def op_LOAD_CONST(self):  # noqa
-        typ = JsType(self.offset(1))
-        operand2 = self.offset(2)
-        if typ in [JsType.TYPE]:
-            val = type_map[JsType(operand2)]
-            self._ip += 2
-        elif typ in [JsType.INT]:
-            val = from_bytes(type_map[typ], self.offset(3, operand2))
-            self._ip += 2 + operand2
-        elif typ in [JsType.STRING]:
-            str_len = from_bytes(type_map[JsType.INT], self.offset(3, operand2))
-            val = from_bytes(type_map[typ], self.offset(3 + operand2, str_len))
-            self._ip += 2 + operand2 + str_len
-        elif typ in [JsType.FLOAT]:
-            val = from_bytes(float, self.offset(2, 8))
-            self._ip += 1 + 8
-        elif typ in [JsType.BOOL]:
-            val = bool(self.offset(2))
-            self._ip += 1 + 1
-        self.push(JacValue(self, value=val))
-
-    def op_LOAD_VAR(self):  # noqa
-        name = from_bytes(str, self.offset(2, self.offset(1)))
-        self.load_variable(name)
-        self._ip += 1 + self.offset(1)
-
-    def op_CREATE_VAR(self):  # noqa
-        name = from_bytes(str, self.offset(2, self.offset(1)))
-        self.load_variable(name, assign_mode=True)
-        self._ip += 1 + self.offset(1)
-
-    def op_REPORT(self):  # noqa
-        self.report.append(self.pop())
-
-    def op_ACTION_CALL(self):  # noqa
+    def op_ASSIGN(self, arg):  # noqa
+        src = self.pop()
+        self.perform_assignment(self.pop(), src)
+
+    def op_COPY_FIELDS(self, arg):  # noqa
+        src = self.pop()
+        self.perform_copy_fields(self.pop(), src)
+
+    def op_INCREMENT(self, arg):  # noqa
+        src = self.pop()
+        self.perform_increment(self.pop(), src, arg)
+
+    def op_LOAD_CONST(self, arg):  # noqa
+        self.push(JacValue(self, value=arg))
+
+    def op_LOAD_VAR(self, arg):  # noqa
+        self.load_variable(arg)
+
+    def op_CREATE_VAR(self, arg):  # noqa
+        self.load_variable(arg, assign_mode=True)
+
+    def op_REPORT(self, arg):  # noqa
+        self.perform_report(self.pop())
+
+    def op_ACTION_CALL(self, arg):  # noqa
+        num_args, names, line, col = arg
+        kw_vals = reversed([self.pop().value for _ in names])
+        args = reversed([self.pop().value for _ in range(num_args)])
+        param_list = {"args": list(args), "kwargs": dict(zip(names, kw_vals))}
+        atom_res = self.pop()
+        if isinstance(atom_res.value, Element):
+            self._write_candidate = atom_res.value
+        self.sync_debug_info()  # actions report errors against _cur_jac_ast
+        try:
+            ret = self.perform_call(atom_res, param_list)
+        except Exception as e:
+            call_ast = copy(self._cur_jac_ast)
+            call_ast.name, call_ast.loc = "atom_trailer", [
+                line,
+                col,
+                call_ast.loc[2],
+                {},
+            ]
+            self.jac_try_exception(e, call_ast)
+        self.push(ret or JacValue(self))
+
+    def op_DEBUG_INFO(self, arg):  # noqa
+        self._debug_info = arg  # applied only when location is needed
+
+    def profile_debug_info(self, arg):
+        """DEBUG_INFO when profiling, times each run of a line as a frame"""
+        self._debug_info = arg
+        line = (arg[1] or self._cur_jac_ast.loc[2], arg[0])
+        if self._line_frame:
+            if self._line_frame[0] == line:
+                return
+            self._profiler.stop(self._line_frame[1])
+        self._line_frame = (line, self._profiler.start(line))
+
+    def sync_debug_info(self):
+        """Points _cur_jac_ast to the location of the last DEBUG_INFO"""
+        if self._debug_info is None:
+            return
+        line, jacfile, col, rule = self._debug_info
+        jacfile = jacfile or self._cur_jac_ast.loc[2]
+        self._cur_jac_ast = copy(self._cur_jac_ast)  # leaves the ast untouched
+        self._cur_jac_ast.name = rule or self._cur_jac_ast.name
+        self._cur_jac_ast.loc = [line, col, jacfile, {}]
+        self._debug_info = None
+
+    def rt_log_str(self, msg, jac_ast=None):
+        if jac_ast is None:
+            self.sync_debug_info()
+        return super().rt_log_str(msg, jac_ast)
+
+    def op_POP(self, arg):  # noqa
+        self.pop()
+
+    def op_NOP(self, arg):  # noqa
         pass
 
-    def op_DEBUG_INFO(self):  # noqa
-        byte_len_l = self.offset(1)
-        line = from_bytes(int, self.offset(2, byte_len_l))
-        f_offset = byte_len_l + 2
-        byte_len_f = self.offset(f_offset)
-        jacfile = (
-            from_bytes(str, self.offset(f_offset + 1, byte_len_f))
-            if byte_len_f
-            else self._cur_jac_ast.loc[2]
-        )
-        self._ip += 2 + byte_len_l + byte_len_f
-        self._cur_jac_ast.loc = [line, 0, jacfile, {}]
+    def op_SWAP(self, arg):  # noqa
+        self._stk[-1], self._stk[-2] = self._stk[-2], self._stk[-1]
+
+    def op_JUMP(self, arg):  # noqa
+        self._ip = arg - 1
+
+    def op_JUMP_IF_FALSE(self, arg):  # noqa
+        if not self.pop().value:
+            self._ip = arg - 1
+
+    def op_JUMP_IF_FALSE_OR_POP(self, arg):  # noqa
+        if self._stk[-1].value:
+            self.pop()
+        else:
+            self._ip = arg - 1
+
+    def op_JUMP_IF_TRUE_OR_POP(self, arg):  # noqa
+        if not self._stk[-1].value:
+            self.pop()
+        else:
+            self._ip = arg - 1
+
+    def op_SETUP_LOOP(self, arg):  # noqa
+        # [kind, end, continue, stack height, loop count, iterator, loop vars]
+        self._blocks.append(["loop", arg[0], arg[1], len(self._stk), 0, None, []])
+
+    def op_POP_LOOP(self, arg):  # noqa
+        self._blocks.pop()
+
+    def op_SET_ITER(self, arg):  # noqa
+        count = len(arg)
+        frame = self._blocks[-1]
+        source = self.pop().value
+        frame[6] = [self._jac_scope.get_live_var(i, create_mode=True) for i in arg]
+        if count == 1 and isinstance(source, (list, dict, SlotContext)):
+            frame[5] = ((i,) for i in source)
+        elif count == 2 and isinstance(source, (dict, SlotContext)):
+            frame[5] = iter(source.items())
+        elif count == 2 and isinstance(source, list):
+            frame[5] = enumerate(source)
+        else:
+            frame[5] = iter(())
+            self.rt_error("Not a list/dict for iteration!")
+
+    def op_FOR_ITER(self, arg):  # noqa
+        frame = self._blocks[-1]
+        vals = next(frame[5], None)
+        if vals is None:
+            self._ip = arg - 1
+            return
+        for var, val in zip(frame[6], vals):
+            var.value = val
+            var.write(None)
+
+    def op_LOOP_NEXT(self, arg):  # noqa
+        frame = self._blocks[-1]
+        frame[4] += 1
+        if frame[4] > self._loop_limit:
+            self.rt_error("Hit loop limit, breaking...")
+            self._ip = frame[1] - 1
+        else:
+            self._ip = arg - 1
+
+    def op_BREAK(self, arg):  # noqa
+        frame = self.unwind_blocks("loop")
+        if not frame:
+            self._loop_ctrl = "break"
+            self.halt()
+            return
+        del self._stk[frame[3] :]
+        self._ip = frame[1] - 1
+
+    def op_CONTINUE(self, arg):  # noqa
+        frame = self.unwind_blocks("loop")
+        if not frame:
+            self._loop_ctrl = "continue"
+            self.halt()
+            return
+        del self._stk[frame[3] :]
+        self._ip = frame[2] - 1
+
+    def op_SKIP(self, arg):  # noqa
+        self._stopped = "skip"
+        self.halt()
+
+    def op_SETUP_TRY(self, arg):  # noqa
+        self._blocks.append(["try", arg, len(self._stk)])
+        self._jac_try_mode += 1
+
+    def op_POP_TRY(self, arg):  # noqa
+        self._blocks.pop()
+        self._jac_try_mode -= 1
+
+    def op_CATCH(self, arg):  # noqa
+        jac_ex = self.pop().value
+        if arg:
+            JacValue(
+                self, ctx=self._jac_scope.local_scope, name=arg, value=jac_ex
+            ).write(None)
+
+    def op_LOAD_ATTR(self, arg):  # noqa
+        assign_mode = self._assign_mode
+        self._assign_mode, name = arg
+        try:
+            self.push(self.perform_attr(self.pop(), name) or JacValue(self))
+        finally:
+            self._assign_mode = assign_mode
+
+    def op_LOAD_INDEX(self, arg):  # noqa
+        assign_mode = self._assign_mode
+        self._assign_mode = arg
+        idx = self.pop()
+        atom_res = self.pop()
+        if isinstance(atom_res.value, Element):
+            self._write_candidate = atom_res.value
+        try:
+            if not self.rt_check_type(atom_res.value, [list, str, dict, SlotContext]):
+                self.push(atom_res)
+            else:
+                self.push(self.perform_index(atom_res, idx.value))
+        finally:
+            self._assign_mode = assign_mode
+
+    def op_BUILD_LIST(self, arg):  # noqa
+        vals = [self.pop().value for _ in range(arg)]
+        self.push(JacValue(self, value=list(reversed(vals))))
+
+    def op_BUILD_DICT(self, arg):  # noqa
+        pairs = [(self.pop(), self.pop()) for _ in range(arg)]
+        ret = {}
+        for val, key in reversed(pairs):
+            if isinstance(key.value, str):
+                ret[key.value] = val.value
+            else:
+                self.rt_error(f"Key is not str type : {type(key.value)}!")
+        self.push(JacValue(self, value=ret))
+
+    def op_LOAD_EDGE_REF(self, arg):  # noqa
+        self.push(self.perform_edge_ref(*arg))
+
+    def op_TAKE(self, arg):  # noqa
+        added = self.perform_take(self.pop().value, arg)
+        self.push(JacValue(self, value=added))
+
+    def op_IGNORE(self, arg):  # noqa
+        self.perform_ignore(self.pop().value)
+
+    def op_DISENGAGE(self, arg):  # noqa
+        self.perform_disengage()
+        self.halt()
@@ -2,6 +2,13 @@ from enum import IntEnum, auto
 from jaseci.graph.edge import Edge
 from jaseci.graph.node import Node
 
+# Runnable bytecode starts with BYTECODE_HEADER, bump BYTECODE_VERSION on
+# any change to the op set or operand layouts. Bytecode without a header is
+# of the first layout (IR stored by older releases), translated on decode.
+# Bytecode of any other version is not run, the interpreter walks the AST
+BYTECODE_VERSION = 2
+BYTECODE_HEADER = bytes([0xFF, BYTECODE_VERSION])
+
 
 class JsOp(IntEnum):
     PUSH_SCOPE = auto()
@@ -19,12 +26,38 @@ class JsOp(IntEnum):
     ASSIGN = auto()
     COPY_FIELDS = auto()
     REPORT = auto()
-    ACTION_CALL = auto()
+    ACTION_CALL = auto()  # [args, kwargs, [bytes, (name)]*, bytes, line, bytes, col]
     INCREMENT = auto()  # [type]
     LOAD_CONST = auto()  # [type, bytes, (val)] / [type, (val)] / [type=type, type]
     LOAD_VAR = auto()  # [bytes, (name)]
     CREATE_VAR = auto()  # [bytes, (name)]
-    DEBUG_INFO = auto()  # [bytes, line, bytes, (jacfile)]
+    DEBUG_INFO = auto()  # [bytes, line, bytes, (jacfile), bytes, col, bytes, (rule)]
+    POP = auto()
+    JUMP = auto()  # [rel(4)]
+    JUMP_IF_FALSE = auto()  # [rel(4)]
+    SETUP_LOOP = auto()  # [end rel(4), continue rel(4)]
+    POP_LOOP = auto()
+    SET_ITER = auto()  # [count, bytes, (name), (bytes, (name))]
+    FOR_ITER = auto()  # [end rel(4)]
+    LOOP_NEXT = auto()  # [top rel(4)]
+    BREAK = auto()
+    CONTINUE = auto()
+    SKIP = auto()
+    SETUP_TRY = auto()  # [handler rel(4)]
+    POP_TRY = auto()
+    CATCH = auto()  # [bytes, (name)]
+    LOAD_ATTR = auto()  # [assign, bytes, (name)]
+    LOAD_INDEX = auto()  # [assign]
+    BUILD_LIST = auto()  # [count(4)]
+    BUILD_DICT = auto()  # [count(4)]
+    LOAD_EDGE_REF = auto()  # [dir, bytes, (name)]
+    TAKE = auto()  # [bytes, (style)]
+    IGNORE = auto()
+    DISENGAGE = auto()
+    NOP = auto()
+    JUMP_IF_FALSE_OR_POP = auto()  # [rel(4)]
+    JUMP_IF_TRUE_OR_POP = auto()  # [rel(4)]
+    SWAP = auto()
 
 
 class JsType(IntEnum):
@@ -40,6 +73,12 @@ class JsType(IntEnum):
     EDGE = auto()
 
 
+class JsEdgeDir(IntEnum):
+    TO = auto()
+    FROM = auto()
+    ANY = auto()
+
+
 class JsCmp(IntEnum):
     EE = auto()
     LT = auto()
@@ -29,3 +29,89 @@ class TestCodegen(CoreTest):
         )
         ret = self.call(self.mast, ["walker_run", {"name": "unicode"}])
         self.assertEqual(len(ret["report"]), 1)
+
+    def run_at_level(self, fn, walker, opt_level):
+        self.mast = self.meta.build_master(h=self.smast._h)
+        self.call(
+            self.mast,
+            [
+                "sentinel_register",
+                {"code": self.load_jac(fn), "opt_level": opt_level, "auto_run": ""},
+            ],
+        )
+        return self.call(self.mast, ["walker_run", {"name": walker}])["report"]
+
+    def test_control_flow_matches_interp(self):
+        ast_rep = self.run_at_level("control_flow.jac", "control_flow", 2)
+        self.assertEqual(ast_rep, [2, "Exception", True, 0, 30, [0, 2, 3]])
+        self.assertEqual(
+            self.run_at_level("control_flow.jac", "control_flow", 4), ast_rep
+        )
+
+    def test_walker_body_compiled(self):
+        self.run_at_level("control_flow.jac", "control_flow", 4)
+        walk = self.mast.active_snt().arch_ids.get_obj_by_name(
+            "control_flow", kind="walker"
+        )
+        block = walk.get_jac_ast().kid[2]
+        root_stmts = block.kid[2].kid[0].kid[1].kid[1:-1]
+        self.assertEqual(
+            len([i for i in root_stmts if getattr(i, "bytecode", None)]), 7
+        )
+        self.assertIsNotNone(getattr(block.kid[4].kid[2], "bytecode", None))
+
+    def test_corpus_matches_interp(self):
+        from jaseci.jac.jsci_vm.benchmark import bench_programs, corpus
+
+        progs = corpus()
+        results = bench_programs(progs, rounds=1)
+        self.assertEqual(set(results), set(progs))
+        for name, res in results.items():
+            self.assertTrue(res["same_report"], name)
+
+    def test_bytecode_decoded_once(self):
+        from jaseci.jac.jsci_vm.decoder import decode_bytecode
+        from jaseci.jac.jsci_vm.op_codes import JsOp
+
+        self.run_at_level("control_flow.jac", "control_flow", 4)
+        walk = self.mast.active_snt().arch_ids.get_obj_by_name(
+            "control_flow", kind="walker"
+        )
+        exit_block = walk.get_jac_ast().kid[2].kid[4].kid[2]
+        program = decode_bytecode(exit_block.bytecode)
+        self.assertIs(decode_bytecode(exit_block.bytecode), program)
+        self.assertEqual(
+            [i[0] for i in program], [JsOp.DEBUG_INFO, JsOp.LOAD_VAR, JsOp.REPORT]
+        )
+        self.assertEqual(program[1][1], "seen")
+        self.assertIs(exit_block._program, program)
+
+    def test_decoded_jumps_are_inst_indices(self):
+        from jaseci.jac.jsci_vm.decoder import Decoder, jump_ops
+        from jaseci.jac.jsci_vm.op_codes import JsOp
+
+        self.run_at_level("control_flow.jac", "control_flow", 4)
+        walk = self.mast.active_snt().arch_ids.get_obj_by_name(
+            "control_flow", kind="walker"
+        )
+        root_stmts = walk.get_jac_ast().kid[2].kid[2].kid[0].kid[1].kid[1:-1]
+        for stmt in [i for i in root_stmts if getattr(i, "bytecode", None)]:
+            program = Decoder().decode(stmt.bytecode)
+            for op, arg in program:
+                if op in jump_ops:
+                    self.assertLessEqual(arg, len(program))
+                elif op == JsOp.SETUP_LOOP:
+                    self.assertLess(arg[1], arg[0])
+
+    def test_runs_ir_of_first_bytecode_layout(self):
+        """IR saved before bytecode was versioned still registers and runs"""
+        self.call(
+            self.mast,
+            [
+                "sentinel_register",
+                {"code": self.load_jac("teststest_v1.jir"), "mode": "ir"},
+            ],
+        )
+        ret = self.call(self.mast, ["sentinel_test", {}])
+        self.assertEqual(ret["tests"], 3)
+        self.assertEqual(ret["passed"], 3)
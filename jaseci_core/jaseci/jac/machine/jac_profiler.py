@@ -0,0 +1,98 @@
+"""
+Profiler for jac execution
+
+Times are attributed to jac source lines, AST rules, node architypes
+visited and actions, each with a call count and inclusive/exclusive time
+(exclusive being time not spent in a nested frame), along with counts of
+hook and store touches over the profiled run
+"""
+from threading import Lock, local
+from time import perf_counter
+
+TABLES = ["lines", "rules", "nodes", "actions"]
+
+
+def hook_touches(hook):
+    """Snapshot of hook and store touch counters"""
+    return {
+        "hook": getattr(hook, "hook_touch_count", 0),
+        "redis": getattr(hook, "red_touch_count", 0),
+        "db": getattr(hook, "db_touch_count", 0),
+    }
+
+
+class JacProfiler:
+    """
+    Collects timing of frames, frames are opened with start and closed with
+    stop in LIFO order per thread (frontier branches share a profiler)
+    """
+
+    def __init__(self, hook=None):
+        self.tables = {i: {} for i in TABLES}
+        self._hook = hook
+        self._touches = hook_touches(hook)
+        self._began = perf_counter()
+        self._lock = Lock()
+        self._local = local()
+
+    def stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def start(self, line=None):
+        """
+        Opens a frame, line is (file, line number) if frame runs a jac line,
+        returns start time to be passed to stop
+        """
+        stack = self.stack()
+        outer = stack[-1][1] if stack else None
+        stack.append([0.0, line or outer, line])
+        return perf_counter()
+
+    def stop(self, start, **keys):
+        """
+        Closes the innermost frame, keys is table name to key to record the
+        frame under (i.e., rules="walker_block")
+        """
+        took = perf_counter() - start
+        stack = self.stack()
+        child, _, line = stack.pop()
+        outer = stack[-1][1] if stack else None
+        if stack:
+            stack[-1][0] += took
+        with self._lock:
+            for table, key in keys.items():
+                self.add(self.tables[table], key, took, took - child)
+            if line is not None:
+                # Nested frames on the same line only add to its exclusive time
+                key = f"{line[0]}:{line[1]}"
+                if outer == line:
+                    self.add(self.tables["lines"], key, 0.0, took - child, 0)
+                else:
+                    self.add(self.tables["lines"], key, took, took - child)
+
+    @staticmethod
+    def add(table, key, incl, excl, calls=1):
+        stat = table.get(key)
+        if stat is None:
+            stat = table[key] = [0, 0.0, 0.0]
+        stat[0] += calls
+        stat[1] += incl
+        stat[2] += excl
+
+    def stats(self):
+        """Profile as json, entries of each table sorted by exclusive time"""
+        ret = {"total_ms": round((perf_counter() - self._began) * 1000, 3)}
+        for name, table in self.tables.items():
+            ret[name] = {
+                k: {
+                    "calls": v[0],
+                    "incl_ms": round(v[1] * 1000, 3),
+                    "excl_ms": round(v[2] * 1000, 3),
+                }
+                for k, v in sorted(table.items(), key=lambda x: -x[1][2])
+            }
+        now = hook_touches(self._hook)
+        ret["touches"] = {k: now[k] - v for k, v in self._touches.items()}
+        return ret
@@ -9,6 +9,7 @@ from jaseci.graph.node import Node
 from jaseci.graph.edge import Edge
 from jaseci.graph.graph import Graph
 from jaseci.jac.jac_set import JacSet
+from jaseci.utils.slot_context import SlotContext
 import uuid
 
 NoneType = type(None)
@@ -39,7 +40,7 @@ def jac_type_wrap(val):
             val = JacType.LIST
         elif val == JacSet:
             val = JacType.LIST
-        elif val == dict:
+        elif val in [dict, SlotContext]:
             val = JacType.DICT
         elif val == bool:
             val = JacType.BOOL
@@ -109,9 +110,11 @@ def jac_wrap_value(val, serialize_mode=False):
     elif isinstance(val, list):
         for i in range(len(val)):
             val[i] = jac_wrap_value(val[i], serialize_mode)
-    elif isinstance(val, dict):
+    elif isinstance(val, (dict, SlotContext)):
         for i in val.keys():
             val[i] = jac_wrap_value(val[i], serialize_mode)
+        if serialize_mode and isinstance(val, SlotContext):
+            val = val.as_dict()
     return val
 
 
@@ -122,7 +125,7 @@ def jac_unwrap_value(val, parent):
     elif isinstance(val, list):
         for i in range(len(val)):
             val[i] = jac_unwrap_value(val[i], parent=parent)
-    elif isinstance(val, dict):
+    elif isinstance(val, (dict, SlotContext)):
         for i in val.keys():
             val[i] = jac_unwrap_value(val[i], parent=parent)
     return jac_type_unwrap(val)
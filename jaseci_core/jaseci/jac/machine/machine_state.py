@@ -4,8 +4,9 @@ Interpreter for jac code in AST form
 This interpreter should be inhereted from the class that manages state
 referenced through self.
 """
+import json
 from copy import copy
-from jaseci.utils.utils import logger
+from jaseci.utils.utils import is_jsonable, logger
 from jaseci.actions.live_actions import live_actions, load_preconfig_actions
 
 # from jaseci.actions.find_action import find_action
@@ -14,10 +15,13 @@ from jaseci.element.element import Element
 from jaseci.jac.jac_set import JacSet
 from jaseci.jac.machine.jac_scope import JacScope
 from jaseci.utils.id_list import IdList
+from jaseci.utils.slot_context import SlotContext
 from jaseci.jac.ir.ast import Ast
 from jaseci.graph.edge import Edge
 from jaseci.graph.node import Node
+from jaseci.attr.action import Action
 from jaseci.jac.machine.jac_value import JacValue
+from jaseci.jac.machine.jac_value import jac_wrap_value as jwv
 from jaseci.jac.jsci_vm.op_codes import JsCmp
 
 
@@ -46,6 +50,8 @@ class MachineState:
         self._loop_limit = 10000
         self._cur_jac_ast = Ast("none")
         self._write_candidate = None
+        self._profiler = caller._profiler if caller else None
+        self._report_stream = caller._report_stream if caller else 0  # buffer cap
         self.inform_hook()
 
     def inform_hook(self):
@@ -138,11 +144,126 @@ class MachineState:
         dest.write(jac_ast)
         self.push(dest)
 
+    def perform_attr(self, atom_res, name, jac_ast=None):
+        """Resolves atom.name, on sets name is plucked from each element"""
+        d = atom_res.value
+        if not self.rt_check_type(d, [dict, SlotContext, Element, JacSet], jac_ast):
+            self.rt_error(f"Invalid variable {name}", jac_ast)
+            return None
+        if isinstance(d, Element):
+            self._write_candidate = d
+        if not isinstance(d, JacSet):
+            return JacValue(self, ctx=d, name=name)
+        plucked = []
+        for i in d:
+            if name in i.context.keys():
+                plucked.append(i.context[name])
+            else:
+                self.rt_error(f"Some elements in set does not have {name}", jac_ast)
+        return JacValue(self, value=plucked)
+
+    def perform_index(self, atom_res, idx, end=None, jac_ast=None):
+        """Resolves atom[idx] or the slice atom[idx:end]"""
+        if end is None:
+            if not self.rt_check_type(idx, [int, str], jac_ast):
+                self.rt_error(
+                    f"Index of type {type(idx)} not valid. "
+                    f"Indicies must be an integer or string!",
+                    jac_ast,
+                )
+                return atom_res
+            try:
+                return JacValue(self, ctx=atom_res.value, name=idx)
+            except Exception:
+                self.rt_error("List index out of range", jac_ast)
+                return atom_res
+        if not self.rt_check_type(idx, [int], jac_ast) or not self.rt_check_type(
+            end, [int], jac_ast
+        ):
+            self.rt_error(
+                "List slice range not valid. " "Indicies must be an integers!",
+                jac_ast,
+            )
+            return atom_res
+        try:
+            return JacValue(self, ctx=atom_res.value, name=idx, end=end)
+        except Exception:
+            self.rt_error("List slice out of range", jac_ast)
+            return atom_res
+
+    def perform_call(self, atom_res, param_list, jac_ast=None):
+        """Triggers action atom with {"args": [...], "kwargs": {...}}"""
+        if isinstance(atom_res.value, Action):
+            ret = atom_res.value.trigger(param_list, self._jac_scope, self)
+            return JacValue(self, value=ret)
+        self.rt_error("Unable to execute ability", jac_ast)
+        return None
+
+    def perform_report(self, val, jac_ast=None):
+        report = jwv(val.value, serialize_mode=True)
+        if self._report_stream:
+            return self.stream_report(report, jac_ast)
+        if not is_jsonable(report):
+            self.rt_error(f"Report {report} not Json serializable", jac_ast)
+        self.report.append(copy(report))
+
+    def stream_report(self, report, jac_ast=None):
+        """
+        Reports of streamed walks are kept as their json line until the
+        step ends, a step reporting past the buffer cap is stopped
+        """
+        if len(self.report) >= self._report_stream:
+            self.stop_report_stream(jac_ast)
+            return
+        try:
+            self.report.append(json.dumps({"report": report}))
+        except (TypeError, OverflowError):
+            self.rt_error(f"Report {report} not Json serializable", jac_ast)
+
+    def stop_report_stream(self, jac_ast=None, error=True):
+        """
+        Ends the walk of a streamed step over its report cap, as disengage
+        does, so Jac try blocks can't catch it and keep reporting
+        """
+        if self._stopped == "stop":
+            return
+        if error:
+            error = self.rt_log_str(
+                f"Over {self._report_stream} reports in one step, walk stopped",
+                jac_ast,
+            )
+            logger.error(error)
+            self.runtime_errors.append(error)
+        if hasattr(self, "perform_disengage"):
+            self.perform_disengage()
+        else:
+            self._stopped = "stop"
+        if getattr(self, "_program", None) is not None:
+            self.halt()
+
+    def perform_edge_ref(self, dirs, edge_type=None):
+        """Nodes across the current node's edges in dirs, i.e., [TO, BI] for -->"""
+        edges = JacSet()
+        for i in self.current_node.indexed_edges(dirs, edge_type=edge_type):
+            edges.add_obj(i)
+        self._relevant_edges = edges
+        return JacValue(
+            self, value=self.visibility_prune(self.edge_to_node_jac_set(edges))
+        )
+
     # Helper Functions ##################
 
     def inherit_runtime_state(self, mach):
         """Inherits runtime output state from another machine"""
-        self.report += mach.report
+        if self._report_stream and not mach._report_stream:  # i.e., spawned walker
+            for i in mach.report:
+                self.stream_report(i)
+        else:
+            self.report += mach.report
+            if self._report_stream and mach._stopped == "stop":
+                self.stop_report_stream(error=False)
+            elif self._report_stream and len(self.report) > self._report_stream:
+                self.stop_report_stream(self._cur_jac_ast)
         if mach.report_status:
             self.report_status = mach.report_status
         if mach.report_custom:
@@ -165,6 +286,7 @@ class MachineState:
         ret = JacSet()
         if not location:
             location = self.current_node
+        location.prefetch_opposing_nodes(edge_set.obj_list())
         for i in edge_set.obj_list():
             ret.add_obj(i.opposing_node(location))
         return ret
@@ -181,6 +303,17 @@ class MachineState:
                     break
         return ret
 
+    def visibility_prune(self, node_set=None):
+        """Returns all nodes that shouldnt be ignored"""
+        ret = JacSet()
+        if node_set is None:
+            node_set = self.current_node.attached_nodes()
+        ignore_ids = set(self.ignore_node_ids)
+        for i in node_set:
+            if getattr(i, "jid", None) not in ignore_ids:
+                ret.add_obj(i)
+        return ret
+
     def check_builtin_action(self, func_name, jac_ast=None):
         """
         Takes reference to action attr, finds the built in function
@@ -0,0 +1,250 @@
+import os
+from tempfile import TemporaryDirectory
+
+from jaseci.utils.test_core import CoreTest
+from jaseci.jac.ir import compile_cache
+from jaseci.jac.ir.ast_builder import JacAstBuilder
+from jaseci.jac.ir.jac_code import jac_ast_to_ir, jac_ir_to_ast, load_ir
+from jaseci.jac.ir import jac_code
+from jaseci.jac.ir.jac_code import ast_cache, cache_ast, REDIS_PREFIX
+import jaseci.tests.jac_test_progs as jtp
+
+
+class DictRedis:
+    """Stand in for RedisService with the calls the shared code cache makes"""
+
+    def __init__(self):
+        self.app = {}
+
+    def is_running(self):
+        return True
+
+    def get(self, name):
+        return self.app.get(name)
+
+    def mget(self, names):
+        return [self.app.get(i) for i in names]
+
+    def setex(self, name, ttl, val):
+        self.app[name] = val
+
+    def delete(self, name):
+        self.app.pop(name, None)
+
+
+class IrTest(CoreTest):
+    """Unit tests for Jac IR formats"""
+
+    fixture_src = __file__
+
+    def register(self, code):
+        self.call(self.mast, ["sentinel_register", {"code": code, "auto_run": ""}])
+        return self.mast.active_snt()
+
+    def test_binary_ir_round_trip(self):
+        snt = self.register(jtp.multi_breaks)
+        bin_ir = jac_ast_to_ir(snt.get_jac_ast(), binary=True)
+        self.assertLess(len(bin_ir), len(snt.code_ir))
+        self.assertEqual(jac_ast_to_ir(load_ir(bin_ir)), snt.code_ir)
+
+    def test_binary_ir_lazy_kids(self):
+        snt = self.register(jtp.multi_breaks)
+        jac_ast = load_ir(jac_ast_to_ir(snt.get_jac_ast(), binary=True))
+        self.assertIsNotNone(jac_ast._src)
+        self.assertEqual(jac_ast.kid[0].name, snt.get_jac_ast().kid[0].name)
+        self.assertIsNone(jac_ast._src)
+        self.assertIsNotNone(jac_ast.kid[0]._src)
+
+    def test_ir_decoded_once(self):
+        snt = self.register(jtp.multi_breaks)
+        self.assertIs(jac_ir_to_ast(snt.code_ir, snt.code_sig), snt.get_jac_ast())
+        bin_ir = jac_ast_to_ir(snt.get_jac_ast(), binary=True)
+        self.assertIs(jac_ir_to_ast(bin_ir), jac_ir_to_ast(bin_ir))
+
+    def test_ast_cache_evicts_least_recently_used(self):
+        snt = self.register(jtp.multi_breaks)
+        prev, jac_code.AST_CACHE_MAX = jac_code.AST_CACHE_MAX, 2
+        try:
+            ast_cache.clear()
+            jac_ir_to_ast(snt.code_ir, snt.code_sig)
+            cache_ast("b", None)
+            jac_ir_to_ast(snt.code_ir, snt.code_sig)
+            cache_ast("c", None)
+            self.assertEqual(list(ast_cache), [snt.code_sig, "c"])
+        finally:
+            jac_code.AST_CACHE_MAX = prev
+
+    def published_keys(self, snt):
+        codes = [snt] + snt.arch_ids.obj_list()
+        return {REDIS_PREFIX + i.code_sig for i in codes if i.get_jac_ast()}
+
+    def test_shared_code_cache(self):
+        hook = self.mast._h
+        prev, hook.redis = hook.redis, DictRedis()
+        try:
+            snt = self.register(jtp.multi_breaks)
+            self.assertEqual(set(hook.redis.app), self.published_keys(snt))
+
+            arch = snt.arch_ids.get_obj_by_name("init")
+            ast_cache.clear()
+            jac_ast = jac_ir_to_ast(arch.code_ir, arch.code_sig, hook.redis)
+            self.assertIsNotNone(jac_ast._src)
+            self.assertEqual(jac_ast_to_ir(jac_ast), arch.code_ir)
+
+            old_keys = set(hook.redis.app)
+            snt = self.register(jtp.node_inheritance)
+            self.assertEqual(set(hook.redis.app), old_keys | self.published_keys(snt))
+            self.assertNotIn(arch.code_sig, ast_cache)
+        finally:
+            hook.redis = prev
+
+    def test_abilities_binary_ir(self):
+        self.register(jtp.strange_ability_bug)
+        self.call(self.mast, ["walker_run", {"name": "init"}])
+        ret = self.call(self.mast, ["walker_run", {"name": "travel"}])
+        self.assertEqual(ret["report"], ["Showing"])
+        arch = self.mast.active_snt().arch_ids.get_obj_by_name("plain", kind="node")
+        actions = arch.get_all_actions().obj_list()
+        self.assertTrue(actions[0].value.startswith("jbir:"))
+
+    def test_sll_first_matches_ll(self):
+        trees = []
+        for sll_first in [False, True]:
+            JacAstBuilder.sll_first = sll_first
+            try:
+                tree = JacAstBuilder(mod_name="t", jac_text=jtp.node_inheritance)
+            finally:
+                JacAstBuilder.sll_first = True
+            self.assertEqual(tree._parse_errors, [])
+            trees.append(jac_ast_to_ir(tree.root))
+        self.assertEqual(trees[0], trees[1])
+
+    def test_opt_level_zero_keeps_parse_tree(self):
+        chains = []
+        for opt_level in [0, 1]:
+            self.call(
+                self.mast,
+                [
+                    "sentinel_register",
+                    {"code": jtp.multi_breaks, "auto_run": "", "opt_level": opt_level},
+                ],
+            )
+            ret = self.call(self.mast, ["walker_run", {"name": "init"}])
+            chains.append(
+                sum(
+                    i.name == "arithmetic" and len(i.kid) == 1
+                    for i in walk_ast(self.mast.active_snt().get_jac_ast())
+                )
+            )
+            self.assertTrue(ret["success"])
+        self.assertGreater(chains[0], 0)
+        self.assertEqual(chains[1], 0)
+
+    def register_files(self, code_dir, files):
+        for name, code in files.items():
+            with open(os.path.join(code_dir, name), "w") as f:
+                f.write(code)
+        self.call(
+            self.mast,
+            [
+                "sentinel_register",
+                {"code": files["main.jac"], "code_dir": code_dir, "auto_run": ""},
+            ],
+        )
+        return self.call(self.mast, ["walker_run", {"name": "init"}])["report"]
+
+    def test_compile_cache_import_changed(self):
+        main = 'import {*} with "./lib.jac";\nwalker init { report global.word; }'
+        lib = 'import {*} with "./base.jac";\nglobal greet = "hey";'
+        prev = compile_cache.JAC_CACHE_DIR
+        with TemporaryDirectory() as code_dir:
+            compile_cache.JAC_CACHE_DIR = os.path.join(code_dir, "cache")
+            try:
+                files = {"main.jac": main, "lib.jac": lib}
+                files["base.jac"] = 'global word = "hi";'
+                self.assertEqual(self.register_files(code_dir, files), ["hi"])
+                self.assertEqual(self.register_files(code_dir, files), ["hi"])
+                files["base.jac"] = 'global word = "yo";'
+                self.assertEqual(self.register_files(code_dir, files), ["yo"])
+            finally:
+                compile_cache.JAC_CACHE_DIR = prev
+
+    def test_compile_cache_shared_imports(self):
+        prev = compile_cache.JAC_CACHE_DIR
+        with TemporaryDirectory() as code_dir:
+            compile_cache.JAC_CACHE_DIR = os.path.join(code_dir, "cache")
+            try:
+                files = {
+                    "lib.jac": 'import {*} with "./base.jac";\nglobal b = 2;',
+                    "base.jac": "global a = 1;",
+                    "main.jac": 'import {*} with "./lib.jac";\n'
+                    'import {global::a} with "./base.jac";\n'
+                    "walker init { report [global.a, global.b]; }",
+                }
+                self.assertEqual(self.register_files(code_dir, files), [[1, 2]])
+                files["main.jac"] += "\n"
+                self.assertEqual(self.register_files(code_dir, files), [[1, 2]])
+            finally:
+                compile_cache.JAC_CACHE_DIR = prev
+
+    def test_compile_cache_prunes_least_recently_used(self):
+        prev = compile_cache.JAC_CACHE_DIR, compile_cache.JAC_CACHE_MAX_BYTES
+        with TemporaryDirectory() as cache_dir:
+            compile_cache.JAC_CACHE_DIR = cache_dir
+            try:
+                jac_ast = JacAstBuilder(mod_name="t", jac_text="global a = 1;").root
+                paths = [
+                    compile_cache.compile_path(str(i), "t", None, "start", 4)
+                    for i in range(3)
+                ]
+                compile_cache.save_compiled(paths[0], {}, jac_ast)
+                compile_cache.save_compiled(paths[1], {}, jac_ast)
+                compile_cache.JAC_CACHE_MAX_BYTES = os.path.getsize(paths[0]) * 2
+                os.utime(paths[0], (100, 100))
+                os.utime(paths[1], (200, 200))
+                self.assertIsNotNone(compile_cache.load_compiled(paths[0]))
+                compile_cache.save_compiled(paths[2], {}, jac_ast)
+                self.assertTrue(os.path.isfile(paths[0]))
+                self.assertFalse(os.path.isfile(paths[1]))
+                self.assertTrue(os.path.isfile(paths[2]))
+            finally:
+                compile_cache.JAC_CACHE_DIR, compile_cache.JAC_CACHE_MAX_BYTES = prev
+
+    def test_compile_cache_walks_dir_once_under_max(self):
+        prev = compile_cache.JAC_CACHE_DIR, compile_cache.prune
+        walks = []
+
+        def counted_prune():
+            walks.append(1)
+            return prev[1]()
+
+        with TemporaryDirectory() as cache_dir:
+            compile_cache.JAC_CACHE_DIR = cache_dir
+            compile_cache.prune = counted_prune
+            try:
+                jac_ast = JacAstBuilder(mod_name="t", jac_text="global a = 1;").root
+                for i in range(3):
+                    path = compile_cache.compile_path(str(i), "t", None, "start", 4)
+                    compile_cache.save_compiled(path, {}, jac_ast)
+                self.assertEqual(len(walks), 1)
+            finally:
+                compile_cache.JAC_CACHE_DIR, compile_cache.prune = prev
+
+    def test_compile_cache_keyed_by_bytecode_version(self):
+        from jaseci.jac.jsci_vm import op_codes
+
+        prev = compile_cache.JAC_CACHE_DIR, op_codes.BYTECODE_VERSION
+        compile_cache.JAC_CACHE_DIR = "cache"
+        try:
+            path = compile_cache.compile_path("x", "t", None, "start", 4)
+            op_codes.BYTECODE_VERSION += 1
+            other = compile_cache.compile_path("x", "t", None, "start", 4)
+            self.assertNotEqual(path, other)
+        finally:
+            compile_cache.JAC_CACHE_DIR, op_codes.BYTECODE_VERSION = prev
+
+
+def walk_ast(jac_ast):
+    yield jac_ast
+    for i in jac_ast.kid:
+        yield from walk_ast(i)
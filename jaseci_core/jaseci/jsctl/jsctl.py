@@ -12,6 +12,7 @@ import requests
 from click_shell import shell
 from click.testing import CliRunner
 from jaseci import __version__
+from jaseci.actor.walker import ReportStream
 from jaseci.element.super_master import SuperMaster
 from jaseci.svc import MetaService
 from jaseci.utils.utils import copy_func
@@ -96,7 +97,10 @@ def remote_api_call(payload, api_name):
         session["connection"]["url"] + path,
         json=payload,
         headers=session["connection"]["headers"],
+        stream=bool(payload.get("stream")),
     )
+    if ret.headers.get("content-type", "").startswith(ReportStream.content_type):
+        return ReportStream(i + "\n" for i in ret.iter_lines(decode_unicode=True))
     if ret.status_code > 205:
         ret = f"Status Code Error {ret.status_code}\n{ret.json()}"
     else:
@@ -110,6 +114,20 @@ def resolve_none_type(kwargs):
             kwargs[i] = None
 
 
+def echo_stream(out, output=None):
+    """Echoes lines of a streamed walk as they come, also to output if given"""
+    f = open(output, "w") if output else None
+    try:
+        for i in out:
+            click.echo(i, nl=False)
+            if f:
+                f.write(i)
+    finally:
+        if f:
+            f.close()
+            click.echo(f"[saved to {output}]")
+
+
 def interface_api(api_name, is_public, is_cli_only, **kwargs):
     """
     Interfaces Master apis after processing arguments/parameters
@@ -135,19 +153,22 @@ def interface_api(api_name, is_public, is_cli_only, **kwargs):
         out = session["master"].public_interface_to_api(kwargs, api_name)
     else:
         out = session["master"].general_interface_to_api(kwargs, api_name)
-    if (
-        isinstance(out, dict)
-        and "report_custom" in out.keys()
-        and out["report_custom"] is not None
-    ):
-        out = out["report_custom"]
-    if isinstance(out, dict) or isinstance(out, list):
-        out = json.dumps(out, indent=2)
-    click.echo(out)
-    if "output" in kwargs and kwargs["output"]:
-        with open(kwargs["output"], "w") as f:
-            f.write(out)
-        click.echo(f'[saved to {kwargs["output"]}]')
+    if isinstance(out, ReportStream):
+        echo_stream(out, kwargs.get("output"))
+    else:
+        if (
+            isinstance(out, dict)
+            and "report_custom" in out.keys()
+            and out["report_custom"] is not None
+        ):
+            out = out["report_custom"]
+        if isinstance(out, dict) or isinstance(out, list):
+            out = json.dumps(out, indent=2)
+        click.echo(out)
+        if "output" in kwargs and kwargs["output"]:
+            with open(kwargs["output"], "w") as f:
+                f.write(out)
+            click.echo(f'[saved to {kwargs["output"]}]')
     if not session["mem-only"]:
         with open(session["filename"], "wb") as f:
             pickle.dump(session, f)
@@ -398,6 +419,35 @@ def booktool(op, output):
         click.echo(f"[saved to {output}]")
 
 
+@click.command(help="Run walker engine benchmarks")
+@click.option("--stores", default="memory,redis,orm", help="Stores to run on.")
+@click.option("--cases", default="", help="Comma separated cases, default all.")
+@click.option("--rounds", default=5, type=int)
+@click.option("--quick", is_flag=True, help="Run small sizes only.")
+@click.option(
+    "--output",
+    "-o",
+    default="",
+    required=False,
+    type=str,
+    help="Filename to dump JSON results to.",
+)
+@click.option("--compare", default="", help="JSON results of an earlier run.")
+@click.option(
+    "--threshold", default=0.2, type=float, help="Slowdown flagged on compare."
+)
+@click.pass_context
+def bench(ctx, stores, cases, rounds, quick, output, compare, threshold):
+    from jaseci import benchmark
+
+    results = benchmark.run(
+        stores.split(","), cases.split(",") if cases else None, quick, rounds
+    )
+    code = benchmark.report(results, output, compare, threshold, echo=click.echo)
+    if code:
+        ctx.exit(code)
+
+
 jsctl.add_command(login)
 jsctl.add_command(publogin)
 jsctl.add_command(logout)
@@ -407,6 +457,7 @@ jsctl.add_command(clear)
 jsctl.add_command(reset)
 jsctl.add_command(script)
 jsctl.add_command(booktool)
+jsctl.add_command(bench)
 cmd_tree_builder(extract_api_tree())
 cmd_tree_builder(extract_api_tree()["jac"], group_func=jac)
 
@@ -88,6 +88,47 @@ class JsctlTest(TestCaseHelper, TestCase):
         r = self.call_cast("walker run get_gen_day")
         self.assertGreater(len(r["report"]), 3)
 
+    def test_jsctl_walker_run_stream(self):
+        self.call(f"actions load local {self.infer_loc}")
+        self.call(
+            f"sentinel register {os.path.dirname(__file__)}/ll.jac -name ll -set_active true"
+        )
+        self.call("graph create -set_active true")
+        self.call("walker run init")
+        self.call("walker run gen_rand_life")
+        r = self.call_split("walker run get_gen_day -stream true")
+        lines = [json.loads(i) for i in r if i]
+        self.assertGreater(len(lines), 4)
+        self.assertIn("report", lines[0])
+        self.assertIn("final_node", lines[-1])
+
+    def test_jsctl_bench(self):
+        out = f"{os.path.dirname(__file__)}/bench.json"
+        r = self.call(
+            f"bench --stores memory --cases fanout,commit --rounds 1 --quick -o {out}"
+        )
+        self.assertIn("fanout[memory-100]", r)
+        with open(out, "r") as f:
+            res = json.load(f)
+        self.assertEqual(
+            [i["group"] for i in res["benchmarks"]], ["fanout", "fanout", "commit"]
+        )
+        self.assertEqual(res["benchmarks"][1]["extra_info"]["visited"], 101)
+        self.assertEqual(res["benchmarks"][0]["stats"]["rounds"], 1)
+
+        for i in res["benchmarks"]:
+            i["stats"]["median"] = 1e-9
+        with open(out, "w") as f:
+            json.dump(res, f)
+        ret = CliRunner(mix_stderr=False).invoke(
+            jsctl.jsctl,
+            f"-m bench --stores memory --cases commit --rounds 1 --quick "
+            f"--compare {out}".split(),
+        )
+        os.remove(out)
+        self.assertIn("Slower than", ret.stdout)
+        self.assertEqual(ret.exit_code, 1)
+
     def test_jsctl_dot(self):
         self.call(
             f"sentinel register {os.path.dirname(__file__)}/ll.jac -name ll -set_active true"
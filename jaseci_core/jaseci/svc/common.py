@@ -7,6 +7,7 @@ from kubernetes.client.rest import ApiException
 
 from jaseci.utils.utils import logger
 from jaseci.actions.live_actions import load_action_config
+from jaseci.actions.action_cache import action_cache
 from jaseci.svc.actions_optimizer.actions_optimizer import ActionsOptimizer
 from .state import ServiceState as Ss
 from .config import META_CONFIG, KUBERNETES_CONFIG
@@ -546,6 +547,18 @@ class JsOrc:
         """
         return self.actions_optimizer.get_actions_status(name)
 
+    def get_action_cache_stats(self, name=""):
+        """
+        Return hit, miss and eviction counters of cacheable actions
+        """
+        return action_cache.get_stats(name)
+
+    def clear_action_cache(self):
+        """
+        Drop all locally cached action results and reset counters
+        """
+        action_cache.clear()
+
     def actions_tracking_start(self):
         """ """
         self.actions_history["active"] = True
@@ -605,6 +618,7 @@ class JsOrc:
                 {
                     "ts": ts,
                     "actions": self.get_actions_status(name=""),
+                    "action_cache": self.get_action_cache_stats(),
                     "prometheus": prom_profile,
                 }
             )
@@ -1,8 +1,21 @@
-ELASTIC_CONFIG = {
-    "enabled": False,
-    "quiet": True,
-    "url": "",
-    "auth": "",
-    "common_index": "",
-    "activity_index": "",
-}
+import os
+from pathlib import Path
+
+ELASTIC_CONFIG = {
+    "enabled": False,
+    "quiet": True,
+    "url": "",
+    "auth": "",
+    "common_index": "",
+    "activity_index": "",
+    "bulk": {
+        "enabled": True,
+        "max_docs": 500,
+        "max_bytes": 5 * 1024 * 1024,
+        "interval": 1.0,
+        "queue_size": 10000,
+        "timeout": 10.0,
+        "spill_dir": os.path.join(Path.home(), ".jaseci", "elastic_spill"),
+        "spill_max_bytes": 100 * 1024 * 1024,
+    },
+}
@@ -1,7 +1,10 @@
 from jaseci.svc import CommonService
 from .config import ELASTIC_CONFIG
 from .manifest import ELASTIC_MANIFEST
+from .shipper import ElasticShipper
 from requests import get, post
+from uuid import uuid4
+import atexit
 from datetime import datetime
 from copy import copy
 
@@ -21,6 +24,21 @@ class ElasticService(CommonService):
         self.app = Elastic(self.config)
         self.app.health("timeout=1s")
 
+    ###################################################
+    #                     CLEANER                     #
+    ###################################################
+
+    def reset(self, hook, start=True):
+        if self.app is not None:
+            self.app.close()
+
+        super().reset(hook, start)
+
+    def failed(self):
+        if self.app is not None:
+            self.app.close()
+        super().failed()
+
     ####################################################
     #                    OVERRIDDEN                    #
     ####################################################
@@ -51,6 +69,12 @@ class Elastic:
         if config["auth"]:
             self.headers["Authorization"] = config["auth"]
 
+        # docs without query params are shipped in the background
+        bulk = config.get("bulk", {})
+        self.shipper = None
+        if bulk.get("enabled", True):
+            self.shipper = ElasticShipper(self.url, self.headers, bulk)
+
     def _get(self, url: str, json: dict = None):
         return get(f"{self.url}{url}", json=json, headers=self.headers).json()
 
@@ -70,6 +94,11 @@ class Elastic:
         return self.get(url, body, self.activity_index, suffix)
 
     def doc(self, log: dict, query: str = "", index: str = "", suffix: str = ""):
+        if self.shipper and not query:
+            index = f"{index or self.common_index}{suffix}"
+            doc_id = uuid4().hex
+            self.shipper.ship(log, index, doc_id)
+            return {"_index": index, "_id": doc_id, "result": "queued"}
         return self.post(f"/_doc?{query}", log, index, suffix)
 
     def doc_activity(self, log: dict, query: str = "", suffix: str = ""):
@@ -160,5 +189,14 @@ class Elastic:
             "data": data,
         }
 
+    def shipper_stats(self):
+        return self.shipper.stats() if self.shipper else {}
+
+    def close(self):
+        """Ships or spills queued docs, shipper won't outlive this app"""
+        if self.shipper:
+            self.shipper.close()
+            atexit.unregister(self.shipper.close)
+
     def health(self, query: str = ""):
         return self._get(f"/_cluster/health?{query}")
@@ -0,0 +1,234 @@
+"""
+Background bulk shipping of documents to Elasticsearch
+
+Documents are serialized when handed over and queued in process, a worker
+thread sends them in _bulk requests once max_docs or max_bytes are queued
+or interval seconds after the first one, over a pooled keep-alive session.
+When the queue is full or a bulk request fails the documents are appended
+to a spill file, replayed once the cluster takes requests again. Documents
+are only dropped when the spill file is full or can't be written. Documents
+shipped with an id are indexed once even if a bulk request that partly
+went through is sent again.
+"""
+import atexit
+import glob
+import json
+import os
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from time import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from jaseci.utils.utils import logger
+
+from .config import ELASTIC_CONFIG
+
+
+class ElasticShipper:
+    """Queue and worker thread shipping documents to one cluster"""
+
+    def __init__(self, url, headers, config=None):
+        self.url = url
+        self.config = dict(ELASTIC_CONFIG["bulk"], **(config or {}))
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.session.headers["Content-Type"] = "application/x-ndjson"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.counters = {
+            "shipped": 0,
+            "rejected": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "dropped": 0,
+        }
+        self.lag = 0.0
+        self._spill_lock = Lock()
+        self._start_lock = Lock()
+        self._count_lock = Lock()
+        self._pid = None
+        atexit.register(self.close)
+
+    def ship(self, doc: dict, index: str, doc_id: str = None):
+        """Queues doc for index, never waits on the cluster"""
+        item = (bulk_lines(doc, index, doc_id), time())
+        self.start()
+        try:
+            self._queue.put_nowait(item)
+        except Full:
+            self.spill([item])
+
+    def start(self):
+        """Starts the worker in this process, i.e., again after a fork"""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = Queue(self.config["queue_size"])
+            self._stop = Event()
+            self._thread = Thread(target=self.run, daemon=True, name="elastic_shipper")
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def close(self, timeout: float = 5):
+        """Ships what is queued, spilling what is left after timeout"""
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._pid = None
+            self.spill(self.collect(wait=False, limit=False))
+
+    def stats(self):
+        """
+        Counters of documents since start, documents queued and seconds
+        the last shipped batch waited in queue
+        """
+        queued = self._queue.qsize() if self._pid == os.getpid() else 0
+        with self._count_lock:
+            counters = dict(self.counters)
+        return dict(counters, queued=queued, lag=round(self.lag, 3))
+
+    def count(self, counter, num):
+        with self._count_lock:
+            self.counters[counter] += num
+
+    def run(self):
+        while not self._stop.is_set():
+            batch = []
+            try:
+                batch = self.collect()
+                if not batch:
+                    self.replay()
+                elif self.send(batch):
+                    self.replay()
+                else:
+                    self.spill(batch)
+                    self._stop.wait(self.config["interval"])
+            except Exception as e:
+                logger.error(f"Elastic shipper failed on a batch: {e}")
+                self.spill(batch)
+                self._stop.wait(self.config["interval"])
+        batch = self.collect(wait=False)
+        if batch and not self.send(batch):
+            self.spill(batch)
+
+    def collect(self, wait=True, limit=True):
+        """Next batch of (lines, queued at), waits up to interval for one"""
+        batch, size = [], 0
+        deadline = time() + self.config["interval"]
+        while not limit or (
+            len(batch) < self.config["max_docs"] and size < self.config["max_bytes"]
+        ):
+            timeout = deadline - time()
+            try:
+                if wait and timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    item = self._queue.get_nowait()
+            except Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def send(self, batch):
+        """Sends batch as one _bulk request, False if it should be retried"""
+        try:
+            res = self.session.post(
+                f"{self.url}/_bulk",
+                data="".join(i[0] for i in batch).encode(),
+                timeout=self.config["timeout"],
+            )
+        except requests.RequestException as e:
+            logger.warning(f"Elastic bulk request failed: {e}")
+            return False
+        if res.status_code == 429 or res.status_code >= 500:
+            logger.warning(f"Elastic bulk request refused: {res.status_code}")
+            return False
+        rejected = len(batch)
+        if res.status_code < 300:
+            try:
+                items = res.json().get("items", [])
+            except ValueError as e:
+                logger.warning(f"Elastic bulk response unreadable: {e}")
+                return False
+            rejected = sum(list(i.values())[0].get("status", 500) >= 300 for i in items)
+        if rejected:
+            logger.error(f"Elastic rejected {rejected} of {len(batch)} documents")
+        self.count("rejected", rejected)
+        self.count("shipped", len(batch) - rejected)
+        self.lag = time() - batch[0][1]
+        return True
+
+    def spill_path(self):
+        return os.path.join(self.config["spill_dir"], f"spill-{os.getpid()}.ndjson")
+
+    def spill(self, batch, count=True):
+        """Appends batch to spill file of this process, drops it if full"""
+        if not batch:
+            return
+        path = self.spill_path()
+        data = "".join(i[0] for i in batch)
+        with self._spill_lock:
+            try:
+                os.makedirs(self.config["spill_dir"], exist_ok=True)
+                size = os.path.getsize(path) if os.path.isfile(path) else 0
+                if size + len(data) > self.config["spill_max_bytes"]:
+                    raise OSError("spill file is full")
+                with open(path, "a") as f:
+                    f.write(data)
+                if count:
+                    self.count("spilled", len(batch))
+            except OSError as e:
+                logger.error(f"Dropped {len(batch)} elastic documents: {e}")
+                self.count("dropped", len(batch))
+
+    def spill_files(self):
+        """Spill file of this process and those of exited processes"""
+        files = []
+        for path in glob.glob(os.path.join(self.config["spill_dir"], "spill-*.ndjson")):
+            try:
+                pid = int(os.path.basename(path).split("-")[1].split(".")[0])
+                if pid != os.getpid():
+                    os.kill(pid, 0)
+                    continue
+            except ProcessLookupError:
+                pass
+            except (ValueError, OSError):
+                continue
+            files.append(path)
+        return files
+
+    def replay(self):
+        """Ships spilled documents in batches until the cluster fails"""
+        for path in self.spill_files():
+            with self._spill_lock:
+                try:
+                    os.rename(path, path + ".replay")
+                except OSError:
+                    continue
+            with open(path + ".replay", "r") as f:
+                lines = f.readlines()
+            os.remove(path + ".replay")
+            now = time()
+            items = [("".join(lines[i : i + 2]), now) for i in range(0, len(lines), 2)]
+            for i in range(0, len(items), self.config["max_docs"]):
+                batch = items[i : i + self.config["max_docs"]]
+                if not self.send(batch):
+                    self.spill(items[i:], count=False)
+                    return
+                self.count("replayed", len(batch))
+
+
+def bulk_lines(doc: dict, index: str, doc_id: str = None):
+    """Action and source lines of doc in a _bulk request body"""
+    action = {"_index": index}
+    if doc_id:
+        action["_id"] = doc_id
+    return json.dumps({"index": action}) + "\n" + json.dumps(doc) + "\n"
@@ -0,0 +1,163 @@
+import json
+import threading
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import sleep, time
+from unittest import TestCase
+
+from jaseci.hook import MemoryHook
+from jaseci.svc.elastic.elastic import Elastic, ElasticService
+from jaseci.utils.stub_server import JsonHandler, start_server, stop_server
+from jaseci.utils.utils import TestCaseHelper
+
+
+class BulkHandler(JsonHandler):
+    """Elastic _bulk endpoint answering with server.status"""
+
+    def do_POST(self):  # noqa
+        body = self.rfile.read(int(self.headers["content-length"])).decode()
+        lines = body.splitlines()
+        if self.path != "/_bulk":
+            self.reply(404, {})
+        elif self.server.status != 200:
+            self.reply(self.server.status, {})
+        elif self.server.garbled:
+            self.reply(200, b"<html>bad gateway</html>")
+        else:
+            docs = [json.loads(i) for i in lines[1::2]]
+            self.server.ids += [json.loads(i)["index"].get("_id") for i in lines[::2]]
+            self.server.bulks.append(
+                ([json.loads(i)["index"]["_index"] for i in lines[::2]], docs)
+            )
+            items = [{"index": {"status": 201}} for _ in docs]
+            self.reply(200, {"errors": False, "items": items})
+
+    def do_GET(self):  # noqa
+        self.reply(200, {"status": "green"})
+
+
+class ElasticShipperTests(TestCaseHelper, TestCase):
+    """Unit tests for background bulk shipping of elastic documents"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = start_server(
+            BulkHandler, status=200, bulks=[], ids=[], garbled=False
+        )
+        self.spill_dir = TemporaryDirectory()
+        self.elastic = None
+
+    def tearDown(self):
+        self.elastic.shipper.close()
+        stop_server(self.server)
+        self.spill_dir.cleanup()
+        super().tearDown()
+
+    def config(self, **bulk):
+        bulk = dict({"interval": 0.1, "spill_dir": self.spill_dir.name}, **bulk)
+        return {
+            "url": f"http://127.0.0.1:{self.server.server_port}",
+            "auth": "",
+            "common_index": "common",
+            "activity_index": "activity",
+            "bulk": bulk,
+        }
+
+    def build(self, **bulk):
+        self.elastic = Elastic(self.config(**bulk))
+        return self.elastic.shipper
+
+    def wait_for(self, cond, timeout=5):
+        deadline = time() + timeout
+        while not cond() and time() < deadline:
+            sleep(0.02)
+        self.assertTrue(cond())
+
+    def shipped_docs(self):
+        return [j for i in self.server.bulks for j in i[1]]
+
+    def test_docs_shipped_in_bulk(self):
+        shipper = self.build(max_docs=20)
+        ids = []
+        for i in range(50):
+            ret = self.elastic.doc_activity({"n": i})
+            self.assertEqual(ret["result"], "queued")
+            self.assertEqual(ret["_index"], "activity")
+            ids.append(ret["_id"])
+        ids.append(self.elastic.doc({"n": 50}, suffix="-x")["_id"])
+        self.wait_for(lambda: shipper.stats()["shipped"] == 51)
+        self.assertLessEqual(len(self.server.bulks), 4)
+        self.assertEqual([i["n"] for i in self.shipped_docs()], list(range(51)))
+        self.assertEqual(self.server.bulks[-1][0][-1], "common-x")
+        self.assertEqual(set(self.server.bulks[0][0]), {"activity"})
+        self.assertEqual(shipper.stats()["queued"], 0)
+        self.assertEqual(self.server.ids, ids)
+        self.assertEqual(len(set(ids)), 51)
+
+    def test_spilled_while_cluster_down(self):
+        self.server.status = 503
+        shipper = self.build(queue_size=5)
+        for i in range(20):
+            self.elastic.doc_activity({"n": i})
+        self.wait_for(lambda: shipper.stats()["spilled"] == 20)
+        self.assertEqual(self.server.bulks, [])
+        self.server.status = 200
+        self.wait_for(lambda: shipper.stats()["replayed"] == 20)
+        self.assertEqual(sorted(i["n"] for i in self.shipped_docs()), list(range(20)))
+        self.assertEqual(shipper.stats()["dropped"], 0)
+
+    def test_dropped_when_spill_full(self):
+        self.server.status = 429
+        shipper = self.build(queue_size=1, max_docs=2, spill_max_bytes=400)
+        for i in range(10):
+            self.elastic.doc_activity({"n": i})
+        self.wait_for(
+            lambda: sum(shipper.stats()[i] for i in ["spilled", "dropped"]) == 10
+        )
+        self.assertGreater(shipper.stats()["dropped"], 0)
+        self.assertGreater(shipper.stats()["spilled"], 0)
+
+    def test_query_posts_directly(self):
+        self.build()
+        self.server.status = 404
+        self.assertEqual(self.elastic.doc_activity({"n": 1}, "refresh=true"), {})
+        self.assertEqual(self.elastic.shipper_stats()["shipped"], 0)
+
+    def test_reset_closes_shipper(self):
+        hook = MemoryHook()
+        hook.save_glob("ELASTIC_CONFIG", json.dumps(dict(self.config(), enabled=True)))
+        svc = ElasticService(hook).start(hook)
+        old = svc.app
+        old.doc({"n": 1})
+        svc.reset(hook)
+        self.elastic = svc.app
+        self.assertIsNot(svc.app, old)
+        self.assertFalse(old.shipper._thread.is_alive())
+        self.assertEqual(old.shipper_stats()["shipped"], 1)
+        self.assertEqual(self.shipped_docs(), [{"n": 1}])
+
+    def test_unreadable_response_keeps_worker(self):
+        self.server.garbled = True
+        shipper = self.build()
+        for i in range(5):
+            self.elastic.doc_activity({"n": i})
+        self.wait_for(lambda: shipper.stats()["spilled"] == 5)
+        self.assertTrue(shipper._thread.is_alive())
+        self.server.garbled = False
+        self.wait_for(lambda: shipper.stats()["replayed"] == 5)
+        self.assertEqual(sorted(i["n"] for i in self.shipped_docs()), list(range(5)))
+
+    def test_concurrent_first_ships_start_one_worker(self):
+        shipper = self.build()
+        threads = [
+            Thread(target=self.elastic.doc_activity, args=({"n": i},))
+            for i in range(20)
+        ]
+        for i in threads:
+            i.start()
+        for i in threads:
+            i.join()
+        self.wait_for(lambda: shipper.stats()["shipped"] == 20)
+        self.assertEqual(sorted(i["n"] for i in self.shipped_docs()), list(range(20)))
+        workers = [i for i in threading.enumerate() if i.name == "elastic_shipper"]
+        self.assertEqual(workers, [shipper._thread])
@@ -27,9 +27,18 @@ class RedisService(CommonService):
     def get(self, name):
         return self.app.get(name)
 
+    def mget(self, names):
+        return self.app.mget(names)
+
     def set(self, name, val):
         self.app.set(name, val)
 
+    def setex(self, name, ttl, val):
+        self.app.setex(name, ttl, val)
+
+    def mset(self, mapping):
+        self.app.mset(mapping)
+
     def exists(self, name):
         return self.app.exists(name)
 
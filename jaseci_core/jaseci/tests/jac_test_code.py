@@ -1158,3 +1158,39 @@ struct_types = """
         report [a.basic.apple.apple, a.basic.apple.orange];
     }
     """
+
+dispatch_tables = """
+    node base {
+        can greet with entry { report "base greet"; }
+        can leave with exit { report "base leave"; }
+    }
+
+    node leaf: base {
+        can greet with entry { report "leaf greet"; }
+        can visit with other entry { report "other visit"; }
+    }
+
+    walker init {
+        root { take spawn here ++> node::leaf; }
+        base { report "is base"; }
+    }
+    """
+
+context_as_dict = """
+    node person {
+        has name, age;
+    }
+
+    walker init {
+        p = spawn here ++> node::person(name="Ann", age=3);
+        p.context["age"] += 1;
+        report p.age;
+        for k, v in p.context: report [k, v];
+        report p.context.d::keys;
+        report p.context.{name};
+        report 'age' in p.context;
+        c = p.context.d::copy;
+        c["age"] = 9;
+        report p.context;
+    }
+    """
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from jaseci import benchmark
+from jaseci.utils.utils import TestCaseHelper
+
+
+class BenchmarkTests(TestCaseHelper, TestCase):
+    """Tests for the walker engine benchmark suite"""
+
+    def test_redis_round_trips_flat_in_degree(self):
+        try:
+            store = benchmark.RedisStore()
+        except ImportError:
+            self.skipTest("fakeredis not installed")
+        calls = []
+        for degree in [5, 50]:
+            bench = benchmark.Bench(store, 2)
+            benchmark.fanout(bench, store, degree)
+            self.assertEqual(bench.extra["visited"], degree + 1)
+            calls.append(bench.extra["redis_calls"])
+        self.assertEqual(calls[0], calls[1])
+
+    def test_compare_flags_slower(self):
+        def results(median):
+            stats = {"median": median, "min": median}
+            return {"benchmarks": [{"name": "fanout[memory-10]", "stats": stats}]}
+
+        self.assertEqual(benchmark.compare(results(1.1), results(1.0)), [])
+        self.assertEqual(
+            benchmark.compare(results(1.3), results(1.0)), ["fanout[memory-10]"]
+        )
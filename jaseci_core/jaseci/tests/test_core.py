@@ -1,3 +1,5 @@
+import copy
+import json
 import uuid
 from unittest import TestCase
 
@@ -9,6 +11,8 @@ from jaseci.graph.node import Node
 from jaseci.svc import MetaService
 from jaseci.utils.utils import TestCaseHelper, get_all_subclasses
 from jaseci.actor.architype import Architype
+from jaseci.utils.mem_cache import MemCache
+from jaseci.utils.slot_context import SlotContext
 
 
 class ArchitypeTests(TestCaseHelper, TestCase):
@@ -98,6 +102,97 @@ class ArchitypeTests(TestCaseHelper, TestCase):
         self.assertNotEqual(bad, node12)
         self.assertIsNone(bad)
 
+    def test_get_obj_many_aligns_with_ids(self):
+        mh = self.meta.build_hook()
+        mast = self.meta.build_master(h=mh)
+        mast2 = self.meta.build_master(h=mh)
+        node1 = Node(m_id=mast._m_id, h=mh)
+        node2 = Node(m_id=mast2._m_id, h=mh)
+        objs = mh.get_obj_many(
+            mast._m_id, [node1.jid, node2.jid, uuid.uuid4().urn, node1.jid]
+        )
+        self.assertEqual(objs, [node1, None, None, node1])
+
+    def test_mem_cache_lru_evicts_oldest_unpinned(self):
+        cache = MemCache(mode="lru", max_objs=4, evictable=lambda x: x != "dirty")
+        cache["global"] = {}
+        for i in range(4):
+            cache[i] = "dirty" if i == 0 else "clean"
+        cache[1]
+        cache[4] = "clean"
+        cache[5] = "clean"
+        self.assertIn(0, cache)
+        self.assertIn(1, cache)
+        self.assertIn("global", cache)
+        self.assertNotIn(2, cache)
+        self.assertLessEqual(cache.num_objs(), 4)
+
+    def test_mem_cache_arc_keeps_frequent_items(self):
+        cache = MemCache(mode="arc", max_objs=10)
+        for i in range(10):
+            cache[i] = i
+        for i in range(3):
+            cache[i]
+        for i in range(100, 130):
+            cache[i] = i
+        for i in range(3):
+            self.assertIn(i, cache)
+        self.assertLessEqual(cache.num_objs(), 10)
+
+    def test_mem_cache_byte_budget_and_sizes(self):
+        mh = self.meta.build_hook()
+        mast = self.meta.build_master(h=mh)
+        mh.set_mem_cache(mode="lru", max_bytes=10**9)
+        node = Node(m_id=mast._m_id, h=mh)
+        node.context["blob"] = "x" * 10000
+        node.save()
+        dist = mh.get_object_distribution(sizes=True)
+        self.assertEqual(dist[Node]["count"], 1)
+        self.assertGreater(dist[Node]["bytes"], 10000)
+        self.assertGreater(mh.mem_size(), 10)
+
+    def test_mem_cache_sizes_items_lazily(self):
+        cache = MemCache(mode="lru", max_bytes=10**9)
+        for i in range(10):
+            cache[i] = "x" * 1000
+        self.assertEqual(len(cache.sizes), 1)
+        self.assertGreater(cache.usage_ratio(estimate=True), 0)
+        self.assertEqual(len(cache.sizes), 1)
+        self.assertGreater(cache.total_bytes(), 10000)
+        self.assertEqual(len(cache.sizes), 10)
+        cache[0] = "x"
+        self.assertNotIn(0, cache.sizes)
+
+    def test_mem_cache_eviction_drops_id_list_refs(self):
+        mh = self.meta.build_hook()
+        mast = self.meta.build_master(h=mh)
+        hub = Node(m_id=mast._m_id, h=mh)
+        kids = [Node(m_id=mast._m_id, h=mh) for i in range(3)]
+        hub.member_node_ids.add_obj_list(kids)
+        for i in kids:
+            i.member_node_ids.add_obj(hub)
+            i.member_node_ids.obj_list()
+        self.assertEqual(hub.member_node_ids.obj_list(), kids)
+        mh.is_evictable = lambda item: item is not hub
+        mh.set_mem_cache(mode="lru", max_objs=4)
+        mh.get_obj(mast._m_id, hub.jid)
+        for i in range(4):
+            Node(m_id=mast._m_id, h=mh)
+        self.assertNotIn(kids[0].jid, mh.mem)
+        self.assertEqual(hub.member_node_ids.cached_objects, ())
+        self.assertEqual(kids[0].member_node_ids.cached_objects, ())
+
+    def test_memory_hook_never_evicts_unbacked_objects(self):
+        mh = self.meta.build_hook()
+        mast = self.meta.build_master(h=mh)
+        mh.set_mem_cache(mode="lru", max_objs=2)
+        nodes = [Node(m_id=mast._m_id, h=mh) for i in range(5)]
+        mh.commit()
+        for i in nodes:
+            self.assertIn(i.jid, mh.mem)
+        mh.clear_cache()
+        self.assertEqual(mh.mem.max_objs, 2)
+
     def test_id_list_smart_name_error(self):
         self.logger_on()
         mast = self.meta.build_master()
@@ -154,3 +249,100 @@ class ArchitypeTests(TestCaseHelper, TestCase):
         sent.arch_ids.obj_list()
         after = len(sent.arch_ids)
         self.assertEqual(after, before - 2)
+
+    def test_id_list_copy(self):
+        mast = self.meta.build_master()
+        node1 = Node(m_id=mast._m_id, h=mast._h)
+        node2 = Node(m_id=mast._m_id, h=mast._h)
+        node1.member_node_ids.add_obj(node2)
+        self.assertEqual(node1.member_node_ids.obj_list(), [node2])
+        dup = copy.copy(node1.member_node_ids)
+        self.assertEqual(dup, [node2.jid])
+        self.assertIs(dup.parent_obj, node1)
+        self.assertEqual(dup.obj_list(), [node2])
+        self.assertFalse(hasattr(dup, "__dict__"))
+
+    def test_payload_fields_follow_object_fields(self):
+        mast = self.meta.build_master()
+        node1 = Node(m_id=mast._m_id, h=mast._h)
+        node2 = Node(m_id=mast._m_id, h=mast._h)
+        node2.extra = 5
+        self.assertNotIn("extra", json.loads(node1.jsci_payload()))
+        self.assertEqual(json.loads(node2.jsci_payload())["extra"], 5)
+        payload = json.loads(node1.jsci_payload())
+        self.assertNotIn("extra", payload)
+        self.assertNotIn("jid", payload)
+        self.assertIn("context", payload)
+
+    def test_sentinel_arch_index(self):
+        mast = self.meta.build_master()
+        sent1 = Sentinel(m_id=mast._m_id, h=mast._h)
+        sent1.register_code(text="node a; walker init {}")
+        sent2 = Sentinel(m_id=mast._m_id, h=mast._h)
+        sent2.register_code(text="node b; node a: b; walker init {}")
+        arch1 = sent1.get_arch_by_name("a", kind="node")
+        arch2 = sent2.get_arch_by_name("a", kind="node")
+        self.assertEqual(arch1.jid, sent1.arch_index["node.a"])
+        self.assertEqual(arch2.jid, sent2.arch_index["node.a"])
+        self.assertNotEqual(arch1.jid, arch2.jid)
+        self.assertEqual(sent2.arch_types["node.a"], ["a", "b"])
+        self.assertFalse(arch1.is_instance("b"))
+        self.assertTrue(arch2.is_instance("b"))
+        self.assertIn("arch_index", json.loads(sent2.jsci_payload()))
+
+        sent2.arch_ids.destroy_obj(sent2.get_arch_by_name("b", kind="node"))
+        self.assertIsNone(sent2.get_arch_by_name("b", kind="node", silent=True))
+        self.assertNotIn("node.b", sent2.arch_index)
+
+    def test_contexts_share_layout(self):
+        mast = self.meta.build_master()
+        node1 = Node(m_id=mast._m_id, h=mast._h)
+        node2 = Node(m_id=mast._m_id, h=mast._h)
+        for i, node in enumerate([node1, node2]):
+            node.context["name"] = f"n{i}"
+            node.context["age"] = i
+        self.assertIs(node1.context._layout, node2.context._layout)
+        self.assertEqual(node2.context, {"name": "n1", "age": 1})
+        payload = json.loads(node1.jsci_payload())
+        self.assertEqual(payload["context"], {"name": "n0", "age": 0})
+        node3 = Node(m_id=mast._m_id, h=mast._h)
+        node3.json_load(node1.jsci_payload())
+        self.assertIsInstance(node3.context, SlotContext)
+        self.assertIs(node3.context._layout, node1.context._layout)
+        self.assertEqual(type(node3.serialize()["context"]), dict)
+
+    def test_slot_context_as_dict(self):
+        ctx = SlotContext({"a": 1, "b": 2})
+        ctx["c"] = 3
+        del ctx["a"]
+        self.assertEqual(list(ctx.items()), [("b", 2), ("c", 3)])
+        self.assertEqual(ctx.popitem(), ("c", 3))
+        ctx.update(d=4)
+        self.assertEqual(ctx.pop("b"), 2)
+        self.assertEqual(ctx, {"d": 4})
+        self.assertEqual(repr(ctx), "{'d': 4}")
+        self.assertEqual(type(ctx.copy()), dict)
+        dup = copy.deepcopy(ctx)
+        self.assertEqual(dup, ctx)
+        self.assertIs(dup._layout, ctx._layout)
+        ctx.clear()
+        self.assertEqual(len(ctx), 0)
+        self.assertNotIn("d", ctx)
+
+    def test_fast_edge_context_kept_in_node(self):
+        mast = self.meta.build_master()
+        node1 = Node(m_id=mast._m_id, h=mast._h)
+        node2 = Node(m_id=mast._m_id, h=mast._h)
+        edge = node1.attach_outbound(node2)[0]
+        self.assertTrue(edge.is_fast())
+        edge.context["weight"] = 2
+        entry = node1.fast_edges["generic"][0]
+        self.assertIs(entry[3], edge.context)
+        self.assertEqual(
+            json.loads(node1.jsci_payload())["fast_edges"],
+            {"generic": [[node2.jid, 0, edge.jid, {"weight": 2}]]},
+        )
+        self.assertEqual(
+            node1.serialize(detailed=True)["fast_edges"],
+            {"generic": [[node2.jid, 0, edge.jid, {"weight": 2}]]},
+        )
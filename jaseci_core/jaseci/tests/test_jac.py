@@ -794,3 +794,44 @@ class JacTests(TestCaseHelper, TestCase):
         report = test_walker.report
         self.assertEqual(report[0], [43, 33])
         self.assertEqual(report[1], [33, 43])
+
+    def test_dispatch_tables_follow_architype_changes(self):
+        sent = Sentinel(m_id=0, h=self.meta.build_hook())
+        gph = Graph(m_id=0, h=sent._h)
+        sent.register_code(jtc.dispatch_tables)
+        test_walker = sent.run_architype("init")
+        test_walker.prime(gph)
+        test_walker.run()
+        self.assertEqual(test_walker.report, ["leaf greet", "is base", "base leave"])
+        leaf = sent.arch_ids.get_obj_by_name("leaf", kind="node")
+        self.assertIn(leaf.jid, sent._dispatch)
+
+        sent.register_architype(
+            "node base { can hello with entry { report 'hello'; } }"
+        )
+        self.assertEqual(sent._dispatch, {})
+        self.assertTrue(leaf.is_instance("base"))
+        test_walker = sent.run_architype("init")
+        test_walker.prime(gph)
+        test_walker.run()
+        self.assertEqual(test_walker.report, ["leaf greet", "hello", "is base"])
+
+    def test_context_as_dict(self):
+        sent = Sentinel(m_id=0, h=self.meta.build_hook())
+        gph = Graph(m_id=0, h=sent._h)
+        sent.register_code(jtc.context_as_dict)
+        test_walker = sent.run_architype("init")
+        test_walker.prime(gph)
+        test_walker.run()
+        self.assertEqual(
+            test_walker.report,
+            [
+                4,
+                ["name", "Ann"],
+                ["age", 4],
+                ["name", "age"],
+                {"name": "Ann"},
+                True,
+                {"name": "Ann", "age": 4},
+            ],
+        )
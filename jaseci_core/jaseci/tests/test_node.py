@@ -1,9 +1,11 @@
+from copy import copy
 from unittest import TestCase
 
 from jaseci.actor.architype import Architype
 from jaseci.attr import action
-from jaseci.graph.edge import Edge
-from jaseci.graph.node import Node
+from jaseci.graph.edge import Edge, FAST_EDGE_MAX_FIELDS
+from jaseci.graph.node import Node, TO, BI
+from jaseci.jac.jac_set import JacSet
 from jaseci.svc import MetaService
 from jaseci.utils.utils import TestCaseHelper
 
@@ -97,3 +99,116 @@ class NodeTests(TestCaseHelper, TestCase):
         )
         a.connect(Node(m_id=0, h=hook), Node(m_id=0, h=hook)),
         self.assertEqual(a.name, "my edge")
+
+    def test_edge_index_directions_and_names(self):
+        """Test adjacency index matches edge direction and name semantics"""
+        mast = self.meta.build_master()
+        hook, m_id = mast._h, mast._m_id
+        hub = Node(m_id=m_id, h=hook)
+        others = [Node(m_id=m_id, h=hook) for _ in range(4)]
+        friend = hub.attach_outbound(
+            others[0], [Edge(m_id=m_id, h=hook, kind="edge", name="friend")]
+        )[0]
+        generic = hub.attach_outbound(others[1])[0]
+        inbound = hub.attach_inbound(others[2])[0]
+        bidir = hub.attach_bidirected(others[3])[0]
+        loop = hub.attach_outbound(hub)[0]
+
+        self.assertEqual(hub.outbound_edges(), [friend, generic, loop])
+        self.assertEqual(hub.inbound_edges(), [inbound, loop])
+        self.assertEqual(hub.bidirected_edges(), [bidir])
+        self.assertEqual(hub.outbound_edges(others[1]), [generic])
+        self.assertEqual(hub.bidirected_edges(others[3]), [bidir])
+        self.assertEqual(hub.indexed_edges([TO, BI], edge_type="friend"), [friend])
+        self.assertEqual(
+            hub.attached_nodes(), [others[0], others[1], others[2], others[3], hub]
+        )
+        self.assertEqual(others[3].fast_edges["generic"][0][1], BI)
+
+        hub.detach_outbound(others[0])
+        self.assertEqual(hub.indexed_edges([TO], edge_type="friend"), [])
+        self.assertEqual(hub.outbound_nodes(), [others[1], hub])
+
+    def test_edge_index_loads_only_matching_edges(self):
+        """Test named edge lookups only build fast edges they need"""
+        mast = self.meta.build_master()
+        hook, m_id = mast._h, mast._m_id
+        hub = Node(m_id=m_id, h=hook)
+        friends = []
+        for i in range(10):
+            name = "friend" if i % 5 == 0 else "other"
+            friends += hub.attach_outbound(
+                Node(m_id=m_id, h=hook),
+                [Edge(m_id=m_id, h=hook, kind="edge", name=name)],
+            )
+        edge_ids = [i.jid for i in friends]
+        hub.clear_fast_edge_ids()
+        for i in edge_ids:
+            hook.mem.pop(i)
+
+        found = hub.indexed_edges([TO], edge_type="friend")
+        self.assertEqual([i.jid for i in found], [edge_ids[0], edge_ids[5]])
+        self.assertEqual(
+            [i for i in edge_ids if i in hook.mem], [edge_ids[0], edge_ids[5]]
+        )
+        self.assertEqual(len(hub.outbound_edges()), 10)
+
+    def test_edge_index_reloads_without_slow_edges(self):
+        """Test reloaded node indexes slow edges without loading them"""
+        mast = self.meta.build_master()
+        hook, m_id = mast._h, mast._m_id
+        hub = Node(m_id=m_id, h=hook)
+        edges = []
+        for i in range(6):
+            edge = Edge(m_id=m_id, h=hook, kind="edge", name="slow")
+            edge.name = "friend" if i % 3 == 0 else "other"
+            edge.context = {f"f{j}": j for j in range(FAST_EDGE_MAX_FIELDS + 1)}
+            edges += hub.attach_outbound(Node(m_id=m_id, h=hook), [edge])
+        hub.attach_outbound(Node(m_id=m_id, h=hook))
+        self.assertEqual(len(hub.edge_ids), 6)
+        self.assertEqual(len(hub.slow_edges["friend"]), 2)
+
+        reloaded = Node(m_id=m_id, h=hook)
+        reloaded.json_load(hub.jsci_payload())
+        fetched = []
+        get_obj_many = hook.get_obj_many
+
+        def counted_get_obj_many(m_id, ids):
+            fetched.extend(ids)
+            return get_obj_many(m_id, ids)
+
+        hook.get_obj_many = counted_get_obj_many
+        found = reloaded.indexed_edges([TO], edge_type="friend")
+        self.assertEqual(found, [edges[0], edges[3]])
+        self.assertEqual(fetched, [edges[0].jid, edges[3].jid])
+        self.assertEqual(len(reloaded.outbound_edges()), 7)
+
+        # nodes saved before slow edges were kept fill them in once
+        slow_edges, hub.slow_edges = hub.slow_edges, {}
+        hub.clear_fast_edge_ids()
+        saves = []
+        hub.save = lambda *args, **kwargs: saves.append(args)
+        self.assertEqual(hub.indexed_edges([TO], edge_type="friend"), found)
+        self.assertEqual(hub.slow_edges, slow_edges)
+        self.assertEqual(saves, [])
+
+    def test_jac_set_order_and_set_algebra(self):
+        """Test JacSet keeps list ordering with jid keyed membership"""
+        hook = self.meta.build_hook()
+        nodes = [Node(m_id=0, h=hook) for _ in range(5)]
+        a = JacSet(in_list=nodes[:3] + nodes[:2])
+        b = JacSet(in_list=[nodes[4], nodes[2], nodes[3]])
+        self.assertEqual(list(a), nodes[:3])
+        self.assertEqual(a[1], nodes[1])
+        self.assertIn(nodes[2], a)
+        self.assertNotIn(nodes[4], a)
+        self.assertEqual(list(a + b), nodes[:3] + [nodes[4], nodes[3]])
+        self.assertEqual(list(a - b), nodes[:2])
+        self.assertEqual(list(a * b), [nodes[2]])
+        self.assertEqual(list(a / b), nodes[:2] + [nodes[4], nodes[3]])
+        a.remove(nodes[0])
+        self.assertNotIn(nodes[0], a)
+        a.add_obj(nodes[0])
+        self.assertEqual(list(a), [nodes[1], nodes[2], nodes[0]])
+        self.assertEqual(list(copy(a)), list(a))
+        self.assertIn(nodes[0], copy(a))
@@ -14,18 +14,26 @@ class IdList(list):
     ID list class for tracking lists of objects in Jaseci
 
     ingest_list is a list of hex strings to convert to UUID and append.
+
+    Every graph element holds several of these, so they are slotted and the
+    object cache and heal list are only allocated once used
     """
 
+    __slots__ = ("parent_obj", "cached_objects", "heal_list", "auto_save")
+
     def __init__(self, parent_obj, auto_save=True, in_list=None):
         self.parent_obj = parent_obj
-        self.cached_objects = []
-        self.heal_list = []
+        self.cached_objects = ()
+        self.heal_list = ()
         self.auto_save = auto_save
         if in_list:
             self.extend(in_list)
 
+    def __copy__(self):
+        return IdList(self.parent_obj, self.auto_save, self)
+
     def cache_reset(self):
-        self.cached_objects = []
+        self.cached_objects = ()
 
     def add_obj(self, obj, push_front=False, allow_dups=False, silent=False):
         """Adds a obj obj to Jaseci object"""
@@ -62,7 +70,7 @@ class IdList(list):
             self.remove(i)
         if len(self.heal_list) and hasattr(self.parent_obj, "save"):
             self.save()
-        self.heal_list = []
+        self.heal_list = ()
 
     def destroy_obj(self, obj):
         """Completely destroys a Jaseci obj obj by it's name"""
@@ -70,6 +78,8 @@ class IdList(list):
         obj.destroy()
 
     def obj_for_id_not_exist_error(self, item_id):
+        if not self.heal_list:
+            self.heal_list = []
         self.heal_list.append(item_id)
         my_name = "id_list"
         for k, v in self.parent_obj.__dict__.items():
@@ -110,14 +120,15 @@ class IdList(list):
     def obj_list(self):
         """Return list of objects from ids"""
         if not len(self.cached_objects):
-            for i in self:
-                obj = self.parent_obj._h.get_obj(self.parent_obj._m_id, i)
+            objs = self.parent_obj._h.get_obj_many(self.parent_obj._m_id, list(self))
+            self.cached_objects = []
+            for i, obj in zip(list(self), objs):
                 if not obj:
                     logger.critical(self.obj_for_id_not_exist_error(i))
                 else:
                     self.cached_objects.append(obj)
         self.heal()
-        return self.cached_objects.copy()
+        return list(self.cached_objects)
 
     def remove_all(self):
         """Remove a Jaseci obj obj by it's name"""
@@ -4,11 +4,15 @@ from uuid import UUID
 
 from jaseci.svc import MetaService
 from jaseci.utils.id_list import IdList
+from jaseci.utils.slot_context import SlotContext
 from jaseci.utils.utils import logger
 
 
 class JaseciJsonEncoder(JSONEncoder):
     def default(self, obj):
+        if isinstance(obj, SlotContext):
+            return obj.as_dict()
+
         from jaseci.element.element import Element
 
         if isinstance(obj, Element):
@@ -0,0 +1,253 @@
+"""
+Memory cache class for Jaseci hooks
+
+Dict compatible object cache with optional count/byte budgets and LRU or
+ARC eviction. Items are only evicted when the evictable callback agrees,
+which lets hooks pin dirty objects and objects without a backing store.
+"""
+import os
+import sys
+from collections import OrderedDict
+
+from jaseci.utils.slot_context import SlotContext
+
+
+MEM_CACHE_CONFIG = {
+    "mode": os.getenv("JSCI_MEM_CACHE_MODE", "unbounded"),
+    "max_objs": int(os.getenv("JSCI_MEM_CACHE_MAX_OBJS", "0")),
+    "max_bytes": int(os.getenv("JSCI_MEM_CACHE_MAX_BYTES", "0")),
+}
+
+CACHE_MODES = ["unbounded", "lru", "arc"]
+
+# Trims evict down to this fraction of budget so inserts don't trim each time
+LOW_WATER_RATIO = 0.9
+
+
+def deep_size(obj, root=None, seen=None):
+    """
+    Estimates bytes held by obj, references to other hookable objects
+    (and the hook itself) are not followed
+    """
+    if seen is None:
+        seen = set()
+        root = obj
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, (dict, SlotContext)):
+        for k, v in obj.items():
+            size += deep_size(k, root, seen) + deep_size(v, root, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for i in obj:
+            size += deep_size(i, root, seen)
+    if hasattr(obj, "__dict__") and (obj is root or not hasattr(obj, "_h")):
+        for k, v in vars(obj).items():
+            if k == "_h" or (v is not root and hasattr(v, "_h")):
+                continue
+            size += deep_size(k, root, seen) + deep_size(v, root, seen)
+    return size
+
+
+class MemCache(OrderedDict):
+    """
+    Object cache for hooks, keys are jids (plus the pinned 'global' key)
+
+    mode is one of 'unbounded', 'lru' or 'arc', max_objs and max_bytes
+    of 0 mean no bound on that dimension. Items are sized lazily, inserts
+    check the byte budget against an estimate from the items already sized
+    and only trims size the rest. on_evict is called with the items of
+    each trim that evicted some
+    """
+
+    def __init__(
+        self,
+        mode="unbounded",
+        max_objs=0,
+        max_bytes=0,
+        evictable=None,
+        pinned_keys=("global",),
+        on_evict=None,
+    ):
+        super().__init__()
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Invalid mem cache mode '{mode}', use {CACHE_MODES}")
+        self.mode = mode
+        self.max_objs = max_objs
+        self.max_bytes = max_bytes
+        self.evictable = evictable
+        self.on_evict = on_evict
+        self.pinned_keys = set(pinned_keys)
+        self.sizes = {}
+        self.bytes_used = 0
+        self.evictions = 0
+        self.trim_ratio = 1.0
+        # ARC bookkeeping, t1/t2 hold live keys, b1/b2 are ghosts
+        self.arc_p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    # -------------------- ACCESS -------------------- #
+
+    def __getitem__(self, key):
+        val = super().__getitem__(key)
+        self.touch(key)
+        return val
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __setitem__(self, key, val):
+        is_new = key not in self
+        super().__setitem__(key, val)
+        self.bytes_used -= self.sizes.pop(key, 0)
+        if key in self.pinned_keys or not self.is_bounded():
+            return
+        if is_new:
+            self.admit(key)
+        else:
+            self.touch(key)
+        if self.usage_ratio(estimate=True) > self.trim_ratio:
+            self.trim()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.forget(key)
+
+    def pop(self, key, *args):
+        ret = super().pop(key, *args)
+        self.forget(key)
+        return ret
+
+    def clear(self):
+        super().clear()
+        self.sizes = {}
+        self.bytes_used = 0
+        for i in [self.t1, self.t2, self.b1, self.b2]:
+            i.clear()
+
+    # ------------------- POLICY -------------------- #
+
+    def is_bounded(self):
+        return self.mode != "unbounded" and (self.max_objs or self.max_bytes)
+
+    def touch(self, key):
+        """Records a hit on key for the active eviction policy"""
+        if key in self.pinned_keys or not self.is_bounded():
+            return
+        if self.mode == "lru":
+            self.move_to_end(key)
+        elif key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        elif key in self.t2:
+            self.t2.move_to_end(key)
+
+    def admit(self, key):
+        """Registers a newly inserted key with the active eviction policy"""
+        if self.mode != "arc":
+            return
+        cap = max(self.max_objs or len(self), 1)
+        if key in self.b1:
+            delta = max(len(self.b2) / len(self.b1), 1)
+            self.arc_p = min(cap, self.arc_p + delta)
+            del self.b1[key]
+            self.t2[key] = None
+        elif key in self.b2:
+            delta = max(len(self.b1) / len(self.b2), 1)
+            self.arc_p = max(0, self.arc_p - delta)
+            del self.b2[key]
+            self.t2[key] = None
+        else:
+            self.t1[key] = None
+        for ghost in [self.b1, self.b2]:
+            while len(ghost) > cap:
+                ghost.popitem(last=False)
+
+    def forget(self, key):
+        self.bytes_used -= self.sizes.pop(key, 0)
+        self.t1.pop(key, None)
+        self.t2.pop(key, None)
+
+    def usage_ratio(self, estimate=False):
+        """Fraction of the tightest budget in use"""
+        ratio = 0.0
+        if self.max_objs:
+            ratio = self.num_objs() / self.max_objs
+        if self.max_bytes:
+            used = self.estimated_bytes() if estimate else self.total_bytes()
+            ratio = max(ratio, used / self.max_bytes)
+        return ratio
+
+    def trim(self):
+        """
+        Evicts items until cache is under its low water mark or only pinned
+        items remain, in which case automatic trims back off until the cache
+        grows another 10%
+        """
+        if not self.is_bounded() or self.usage_ratio() <= 1.0:
+            self.trim_ratio = 1.0
+            return 0
+        evicted = []
+        for key in self.eviction_order():
+            if self.usage_ratio() <= LOW_WATER_RATIO:
+                break
+            if key in self.pinned_keys or (
+                self.evictable is not None
+                and not self.evictable(OrderedDict.__getitem__(self, key))
+            ):
+                continue
+            if self.mode == "arc":
+                (self.b1 if key in self.t1 else self.b2)[key] = None
+            evicted.append(OrderedDict.__getitem__(self, key))
+            super().__delitem__(key)
+            self.forget(key)
+        self.evictions += len(evicted)
+        self.trim_ratio = max(1.0, self.usage_ratio() * 1.1)
+        if len(evicted) and self.on_evict is not None:
+            self.on_evict(evicted)
+        return len(evicted)
+
+    def eviction_order(self):
+        """Snapshot of keys in the order the active policy evicts them"""
+        if self.mode == "lru":
+            return list(self.keys())
+        if len(self.t1) > self.arc_p:
+            return list(self.t1) + list(self.t2)
+        return list(self.t2) + list(self.t1)
+
+    # ------------------ ACCOUNTING ------------------ #
+
+    def num_objs(self):
+        return len(self) - len(self.pinned_keys & self.keys())
+
+    def item_size(self, key):
+        """Deep size estimate of item, cached until item is recommitted"""
+        if key not in self.sizes:
+            size = deep_size(OrderedDict.__getitem__(self, key))
+            self.sizes[key] = size
+            self.bytes_used += size
+        return self.sizes[key]
+
+    def estimated_bytes(self):
+        """Bytes of sized items plus unsized ones at their average size"""
+        unsized = len(self) - len(self.sizes)
+        if unsized and not len(self.sizes):
+            self.item_size(next(reversed(self.keys())))
+            unsized -= 1
+        if not unsized:
+            return self.bytes_used
+        return self.bytes_used * len(self) / len(self.sizes)
+
+    def total_bytes(self):
+        if len(self.sizes) < len(self):
+            for i in self.keys():
+                self.item_size(i)
+        return self.bytes_used
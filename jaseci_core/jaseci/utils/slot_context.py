@@ -0,0 +1,138 @@
+"""
+Slotted context for Jaseci graph elements
+
+Nodes and edges of an architype all hold the same has vars, so instead of
+a dict per element their contexts share a layout, the field names in
+order, and each context only keeps a list of values. Layouts are found
+through transitions as keys are first set, so contexts filled in the same
+order (as the interpreter does with the has vars of an architype) or
+loaded with the same fields end up on one shared layout. The layout is
+also the plan contexts are serialized with, see as_dict.
+
+SlotContext is a MutableMapping so Jac code and the engine can keep using
+it as the dict it replaces, copies of it are plain dicts.
+"""
+from collections.abc import MutableMapping
+
+MAX_LAYOUTS = 4096
+layouts = {}  # {tuple of keys: ContextLayout}
+
+
+class ContextLayout:
+    """Field names of a context in order and their slot positions"""
+
+    __slots__ = ("keys", "index", "transitions")
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+        self.transitions = {}  # {added key: ContextLayout}
+
+    def add(self, key):
+        """Layout of this one with key appended"""
+        nxt = self.transitions.get(key)
+        if nxt is None:
+            nxt = self.transitions[key] = layout_for(self.keys + (key,))
+        return nxt
+
+
+def layout_for(keys):
+    """Shared layout of keys, unshared once MAX_LAYOUTS are registered"""
+    layout = layouts.get(keys)
+    if layout is None:
+        layout = ContextLayout(keys)
+        if len(layouts) < MAX_LAYOUTS:
+            layout = layouts.setdefault(keys, layout)
+    return layout
+
+
+class SlotContext(MutableMapping):
+    """Context of a graph element, values slotted by a shared layout"""
+
+    __slots__ = ("_layout", "_vals")
+
+    def __init__(self, data=None):
+        if isinstance(data, SlotContext):
+            self._layout, self._vals = data._layout, list(data._vals)
+        elif isinstance(data, dict):
+            self._layout = layout_for(tuple(data))
+            self._vals = list(data.values())
+        else:
+            self._layout, self._vals = layout_for(()), []
+            if data:
+                self.update(data)
+
+    def __getitem__(self, key):
+        idx = self._layout.index.get(key)
+        if idx is None:
+            raise KeyError(key)
+        return self._vals[idx]
+
+    def __setitem__(self, key, val):
+        idx = self._layout.index.get(key)
+        if idx is None:
+            self._layout = self._layout.add(key)
+            self._vals.append(val)
+        else:
+            self._vals[idx] = val
+
+    def __delitem__(self, key):
+        idx = self._layout.index.get(key)
+        if idx is None:
+            raise KeyError(key)
+        keys = self._layout.keys
+        self._layout = layout_for(keys[:idx] + keys[idx + 1 :])
+        del self._vals[idx]
+
+    def __contains__(self, key):
+        return key in self._layout.index
+
+    def __iter__(self):
+        return iter(self._layout.keys)
+
+    def __len__(self):
+        return len(self._vals)
+
+    def get(self, key, default=None):
+        idx = self._layout.index.get(key)
+        return default if idx is None else self._vals[idx]
+
+    def popitem(self):
+        """Removes and returns the last (key, value) as dict does"""
+        if not self._vals:
+            raise KeyError("popitem(): context is empty")
+        key = self._layout.keys[-1]
+        self._layout = layout_for(self._layout.keys[:-1])
+        return key, self._vals.pop()
+
+    def clear(self):
+        self._layout, self._vals = layout_for(()), []
+
+    def as_dict(self):
+        """Plain dict of context, built from the layout in one pass"""
+        return dict(zip(self._layout.keys, self._vals))
+
+    def copy(self):
+        return self.as_dict()
+
+    def __copy__(self):
+        return self.as_dict()
+
+    def __reduce__(self):
+        return (SlotContext, (self.as_dict(),))
+
+    def __repr__(self):
+        return repr(self.as_dict())
+
+
+class ContextField:
+    """
+    Keeps the context attribute of an element as a SlotContext. It only
+    defines __set__, so reads find the context in the instance's __dict__
+    at plain attribute speed
+    """
+
+    def __set__(self, obj, val):
+        if not isinstance(val, SlotContext):
+            val = SlotContext(val)
+        obj.__dict__["context"] = val
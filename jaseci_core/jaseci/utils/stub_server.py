@@ -0,0 +1,40 @@
+"""
+Stub JSON HTTP server for unit tests of clients calling remote services
+"""
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    """Base of stub request handlers, replies with JSON or raw bytes"""
+
+    protocol_version = "HTTP/1.1"
+
+    def reply(self, status, payload):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(handler, **attrs):
+    """
+    Serves handler on a free local port from a daemon thread, attrs are set
+    on the server for the handler to read as self.server.<attr>
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    for k, v in attrs.items():
+        setattr(server, k, v)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_server(server):
+    server.shutdown()
+    server.server_close()
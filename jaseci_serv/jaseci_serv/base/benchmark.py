@@ -0,0 +1,57 @@
+"""
+OrmHook store for the walker engine benchmarks of jaseci.benchmark
+
+Runs on a throwaway sqlite db migrated when the store is built and counts
+every statement sent to it
+
+    python -m jaseci.benchmark --stores orm
+"""
+import os
+from tempfile import TemporaryDirectory
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+
+from jaseci.benchmark import MemoryStore
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jaseci_serv.settings")
+
+
+class OrmStore(MemoryStore):
+    """Django ORM store on sqlite, every request gets a fresh OrmHook"""
+
+    name = "orm"
+
+    def __init__(self):
+        from django.db import connections
+        from jaseci_serv.hook.orm import StatementCounter
+
+        self.db_dir = TemporaryDirectory()
+        settings.DATABASES["default"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.path.join(self.db_dir.name, "bench.sqlite3"),
+        }
+        django.setup()
+        call_command("migrate", verbosity=0)
+        self.statements = StatementCounter()
+        connections["default"].execute_wrappers.append(self.statements)
+        super().__init__()
+
+    def build_hook(self):
+        from jaseci_serv.base.models import GlobalVars, JaseciObject
+        from jaseci_serv.hook.orm import OrmHook
+
+        hook = OrmHook(objects=JaseciObject.objects, globs=GlobalVars.objects)
+        hook.meta = self.meta
+        return hook
+
+    def request_hook(self):
+        return self.build_hook()
+
+    def commit(self, hook):
+        hook.commit_all_cache_sync()
+        hook.commit(True)
+
+    def counters(self):
+        return {"db_statements": self.statements.count}
@@ -44,6 +44,40 @@ class OrmPrivateTests(TestCaseHelper, TestCase):
         load_test = JaseciObject.objects.get(jid=tnode.id)
         self.assertEqual(load_test.name, tnode.name)
 
+    def test_parallel_walk_loads_from_db(self):
+        """Frontier branches load nodes on the connection of the request"""
+        code = """
+        node item {has val, score;}
+        walker build {
+            for i=0 to i<6 by i+=1: spawn here ++> node::item(val=i);
+        }
+        walker score {
+            root: take -->;
+            item { here.score = here.val * 10; take -->; }
+        }
+        walker scores {
+            root: take -->;
+            item: report here.score;
+        }
+        """
+        h = self.user._h
+
+        def walk(name, **params):
+            mast = self.user.get_master()
+            ret = mast.general_interface_to_api(
+                api_name="walker_run", params=dict(params, name=name)
+            )
+            h.commit()
+            h.clear_cache()
+            return ret
+
+        self.user.get_master().general_interface_to_api(
+            api_name="sentinel_register", params={"code": code, "auto_run": ""}
+        )
+        walk("build")
+        self.assertTrue(walk("score", parallel=True)["success"])
+        self.assertEqual(walk("scores")["report"], [0, 10, 20, 30, 40, 50])
+
     def test_jsci_db_to_engine_hook_on_authenticate_loading(self):
         """Test that db hooks are set up correctly for loading"""
         user = self.user
@@ -99,6 +133,8 @@ class OrmPrivateTests(TestCaseHelper, TestCase):
         self.assertIn(oedge[0], newobj.smart_edges)
 
         otnode.destroy()
+        self.assertIsNone(user._h.get_obj(otnode._m_id, otnode.jid))
+        user._h.commit()
         self.assertFalse(
             JaseciObject.objects.filter(jid=oload_test.jid.urn).exists(), False
         )
@@ -132,6 +168,54 @@ class OrmPrivateTests(TestCaseHelper, TestCase):
         self.assertEqual(node2.id, new_node.jid)
         self.assertEqual(node1.id, new_jsci_node.parent().id)
 
+    def test_get_obj_many_single_db_query(self):
+        """Test that batched loads hit the db once for all misses"""
+        user = self.user
+        h = user._h
+        nodes = [node.Node(m_id=0, h=h) for i in range(5)]
+        h.commit()
+        h.clear_cache()
+        ids = [i.jid for i in nodes]
+        with self.assertNumQueries(1):
+            objs = h.get_obj_many(0, ids + [uuid.uuid4().urn])
+        self.assertEqual([i.jid for i in objs[:5]], ids)
+        self.assertIsNone(objs[5])
+        with self.assertNumQueries(0):
+            h.get_obj_many(0, ids)
+
+    def test_commit_batches_writes_and_deletes(self):
+        """Test that commit flushes objects with a constant number of statements"""
+        h = self.user._h
+        h.commit()
+        nodes = [node.Node(m_id=0, h=h) for i in range(50)]
+        stats = h.commit()
+        self.assertEqual(stats["objects"], 50)
+        self.assertLess(stats["statements"], 10)
+        self.assertEqual(JaseciObject.objects.filter(kind="generic").count(), 50)
+
+        for i in nodes:
+            i.name = "updated"
+            i.save()
+        for i in nodes[:10]:
+            i.destroy()
+        stats = h.commit()
+        self.assertLess(stats["statements"], 10)
+        self.assertEqual(JaseciObject.objects.filter(name="updated").count(), 40)
+        self.assertEqual(JaseciObject.objects.filter(kind="generic").count(), 40)
+
+    def test_bounded_mem_cache_evicts_clean_objects(self):
+        """Test that bounded caches pin dirty objects and evict after commit"""
+        h = self.user._h
+        h.set_mem_cache(mode="lru", max_objs=5)
+        nodes = [node.Node(m_id=0, h=h) for i in range(20)]
+        for i in nodes:
+            self.assertIn(i.jid, h.mem)
+        h.commit()
+        self.assertLessEqual(h.mem.num_objs(), 5)
+        self.assertGreater(h.mem.evictions, 0)
+        reloaded = h.get_obj(0, nodes[0].jid)
+        self.assertEqual(reloaded.jid, nodes[0].jid)
+
     @skip_without_redis
     def test_redis_connection(self):
         """Test redis connection"""
@@ -5,8 +5,11 @@ core engine.
 FIX: Serious permissions work needed
 """
 import uuid
+from contextlib import contextmanager
+from time import time
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, transaction
 
 import jaseci as core_mod
 from jaseci.hook import RedisHook
@@ -17,6 +20,21 @@ from jaseci.utils.utils import logger
 from datetime import datetime
 import json
 
+# Max number of rows per IN lookup / bulk statement
+ORM_BATCH_SIZE = 500
+JASECI_OBJECT_FIELDS = [
+    "j_parent",
+    "j_master",
+    "name",
+    "kind",
+    "j_timestamp",
+    "j_type",
+    "j_access",
+    "j_r_acc_ids",
+    "j_rw_acc_ids",
+    "jsci_obj",
+]
+
 
 class OrmHook(RedisHook):
     """
@@ -27,6 +45,8 @@ class OrmHook(RedisHook):
         self.objects = objects
         self.globs = globs
         self.db_touch_count = 0
+        self.destroy_obj_ids = set()
+        self._shared_conn = None
         super().__init__()
 
     ####################################################
@@ -38,6 +58,8 @@ class OrmHook(RedisHook):
     def get_obj_from_store(self, item_id):
         loaded_obj = super().get_obj_from_store(item_id)
         if loaded_obj is None:
+            if item_id in self.destroy_obj_ids:
+                return None
             try:
                 loaded_obj = self.objects.get(jid=item_id)
                 self.db_touch_count += 1
@@ -47,33 +69,61 @@ class OrmHook(RedisHook):
                     exc_info=True,
                 )
                 return None
-            class_for_type = self.find_class_and_import(loaded_obj.j_type, core_mod)
-            kwargs = {"h": self, "m_id": loaded_obj.j_master.urn, "auto_save": False}
-            ret_obj = class_for_type(**kwargs)
-            map_assignment_of_matching_fields(ret_obj, loaded_obj)
-
-            # Unwind jsci_payload for fields beyond element object
-            ret_obj.json_load(loaded_obj.jsci_obj)
-            self.commit_obj_to_cache(ret_obj, all_caches=True)
-            return ret_obj
+            return self.load_obj_from_orm(loaded_obj)
         return loaded_obj
 
+    def get_obj_many_from_store(self, item_ids):
+        objs = super().get_obj_many_from_store(item_ids)
+        missing = [
+            i
+            for i in dict.fromkeys(item_ids)
+            if i not in objs and i not in self.destroy_obj_ids
+        ]
+        loaded = []
+        for batch in batches(missing):
+            for loaded_obj in self.objects.filter(jid__in=batch):
+                self.db_touch_count += 1
+                ret_obj = self.load_obj_from_orm(loaded_obj, all_caches=False)
+                objs[ret_obj.jid] = ret_obj
+                loaded.append(ret_obj)
+        self.commit_obj_list_to_cache(loaded)
+        for i in missing:
+            if i not in objs:
+                logger.error(str(f"Object {i} does not exist in Django ORM!"))
+        return objs
+
+    def load_obj_from_orm(self, loaded_obj, all_caches=True):
+        """
+        Build jaseci object from Django model and commit it to caches
+        """
+        class_for_type = self.find_class_and_import(loaded_obj.j_type, core_mod)
+        kwargs = {
+            "h": self,
+            "m_id": loaded_obj.j_master.urn,
+            "mode": loaded_obj.j_access,
+            "auto_save": False,
+        }
+        ret_obj = class_for_type(**kwargs)
+        map_assignment_of_matching_fields(ret_obj, loaded_obj)
+
+        # Unwind jsci_payload for fields beyond element object
+        ret_obj.json_load(loaded_obj.jsci_obj)
+        self.commit_obj_to_cache(ret_obj, all_caches=all_caches)
+        return ret_obj
+
     def has_obj_in_store(self, item_id):
         """
         Checks for object existance in store
         """
         return super().has_obj_in_store(item_id) or (
-            self.objects.filter(jid=item_id).count()
+            item_id not in self.destroy_obj_ids
+            and self.objects.filter(jid=item_id).count()
         )
 
     def destroy_obj_from_store(self, item):
+        """Queue item for deletion, rows are removed in batch on commit"""
         super().destroy_obj_from_store(item)
-        try:
-            self.objects.get(jid=item.id).delete()
-        except ObjectDoesNotExist:
-            # NOTE: Should look at this at some point
-            # logger.error("Object does not exists so delete aborted!")
-            pass
+        self.destroy_obj_ids.add(item.jid)
 
     # --------------------- GLOB --------------------- #
 
@@ -124,29 +174,136 @@ class OrmHook(RedisHook):
     #                    COMMITTER                     #
     ####################################################
 
-    def commit_obj(self, item):
-        item_from_db, created = self.objects.get_or_create(jid=item.id)
-        map_assignment_of_matching_fields(item_from_db, item)
-        item_from_db.jsci_obj = item.jsci_payload()
-        item_from_db.save()
+    def commit_obj_list(self, items):
+        """
+        Write items to db with one existence lookup then bulk update and
+        bulk create (per ORM_BATCH_SIZE rows)
+        """
+        items = {i.jid: i for i in items}
+        existing = set()
+        for batch in batches(list(items.keys())):
+            for i in self.objects.filter(jid__in=batch).values_list("jid", flat=True):
+                existing.add(i.urn)
+        creates = []
+        updates = []
+        for jid, item in items.items():
+            item_for_db = self.objects.model(jid=item.id)
+            map_assignment_of_matching_fields(item_for_db, item)
+            item_for_db.jsci_obj = item.jsci_payload()
+            (updates if jid in existing else creates).append(item_for_db)
+        if creates:
+            self.objects.bulk_create(creates, batch_size=ORM_BATCH_SIZE)
+        if updates:
+            self.objects.bulk_update(
+                updates, JASECI_OBJECT_FIELDS, batch_size=ORM_BATCH_SIZE
+            )
+
+    def commit_glob_dict(self, globs):
+        """Write globals to db with bulk update and bulk create"""
+        for k, v in globs.items():
+            self.commit_glob_to_cache(k, v)
+        existing = {i.name: i for i in self.globs.filter(name__in=list(globs.keys()))}
+        for k, v in existing.items():
+            v.value = globs[k]
+        creates = [
+            self.globs.model(name=k, value=v)
+            for k, v in globs.items()
+            if k not in existing
+        ]
+        if creates:
+            self.globs.bulk_create(creates, batch_size=ORM_BATCH_SIZE)
+        if existing:
+            self.globs.bulk_update(
+                list(existing.values()), ["value"], batch_size=ORM_BATCH_SIZE
+            )
 
-    def commit_glob(self, name, value):
-        self.commit_glob_to_cache(name, value)
-        item_from_db, created = self.globs.get_or_create(name=name)
-        item_from_db.value = value
-        item_from_db.save()
+    def destroy_obj_list(self, item_ids):
+        """Delete rows for item ids in batched statements"""
+        for batch in batches(list(item_ids)):
+            self.objects.filter(jid__in=batch).delete()
 
     def commit(self, skip_cache=False):
-        """Write through all saves to store"""
-        for i in self.save_obj_list:
-            if not skip_cache:
-                self.commit_obj_to_cache(i, all_caches=True)
-            self.commit_obj(i)
-        self.save_obj_list = set()
-
-        for k, v in self.save_glob_dict.items():
-            self.commit_glob(k, v)
-        self.save_glob_dict = {}
+        """
+        Write through all saves and destroys to store in one transaction,
+        returns number of db statements issued and time taken in ms
+        """
+        stats = {"objects": len(self.save_obj_list), "statements": 0, "time_ms": 0}
+        if not (self.save_obj_list or self.save_glob_dict or self.destroy_obj_ids):
+            return stats
+
+        start = time()
+        counter = StatementCounter()
+        saved_ids = set(i.jid for i in self.save_obj_list)
+        with connections[self.objects.db].execute_wrapper(counter):
+            with transaction.atomic(using=self.objects.db):
+                if self.save_obj_list:
+                    if not skip_cache:
+                        self.commit_obj_list_to_cache(self.save_obj_list)
+                    self.commit_obj_list(self.save_obj_list)
+                self.save_obj_list = set()
+
+                if self.save_glob_dict:
+                    self.commit_glob_dict(self.save_glob_dict)
+                self.save_glob_dict = {}
+
+                self.destroy_obj_list(self.destroy_obj_ids - saved_ids)
+                self.destroy_obj_ids = set()
+        self.trim_mem_cache()
+
+        stats["statements"] = counter.count
+        stats["time_ms"] = round((time() - start) * 1000, 3)
+        logger.debug(
+            f"Committed {stats['objects']} objects with {stats['statements']} "
+            f"statements in {stats['time_ms']}ms"
+        )
+        return stats
+
+    @contextmanager
+    def threaded(self):
+        """Pool threads share the db connection of this thread, see in_thread"""
+        conn = connections[self.objects.db]
+        conn.inc_thread_sharing()
+        outer, self._shared_conn = self._shared_conn, conn
+        try:
+            with super().threaded():
+                yield
+        finally:
+            self._shared_conn = outer
+            conn.dec_thread_sharing()
+
+    @contextmanager
+    def in_thread(self):
+        """
+        Pool threads query on the connection of the thread that started the
+        walk, serialized by the hook's lock, so they see its uncommitted
+        writes and never open connections of their own
+        """
+        alias = self.objects.db
+        connections[alias] = self._shared_conn
+        try:
+            yield
+        finally:
+            del connections[alias]
+
+    def is_evictable(self, item):
+        """Clean persisted objects can be reloaded from db once evicted"""
+        return item._persist and item not in self.save_obj_list
+
+
+class StatementCounter:
+    """Django execute wrapper that counts statements sent to the db"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def batches(items, size=ORM_BATCH_SIZE):
+    """Split list into lists of at most size items"""
+    return [items[i : i + size] for i in range(0, len(items), size)]
 
 
 def map_assignment_of_matching_fields(dest, source):
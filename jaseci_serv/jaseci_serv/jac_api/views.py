@@ -4,11 +4,13 @@ from io import BytesIO
 from tempfile import _TemporaryFileWrapper
 from time import time
 
+from django.http import StreamingHttpResponse
 from knox.auth import TokenAuthentication
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from jaseci.actor.walker import ReportStream
 from jaseci.element.element import Element
 from jaseci.utils.utils import logger, ColCodes as Cc
 from jaseci_serv.base.models import Master as ServMaster
@@ -28,6 +30,19 @@ class JResponse(Response):
         self.hook.commit(True)
 
 
+class JStreamResponse(StreamingHttpResponse):
+    """Chunked NDJSON of a streamed walk, committed once the walk is done"""
+
+    def __init__(self, master, stream, **kwargs):
+        super().__init__(stream, content_type=ReportStream.content_type, **kwargs)
+        self.hook = master._h
+
+    def close(self):
+        super(JStreamResponse, self).close()
+        self.hook.commit_all_cache_sync()
+        self.hook.commit(True)
+
+
 class AbstractJacAPIView(APIView):
     """
     The builder set of Jaseci APIs
@@ -180,6 +195,8 @@ class AbstractJacAPIView(APIView):
         # return Response(api_result)
         # for i in self.caller._h.save_obj_list:
         #     self.caller._h.commit_obj_to_redis(i)
+        if isinstance(api_result, ReportStream):
+            return JStreamResponse(self.caller, api_result)
         status = self.pluck_status_code(api_result)
         if (
             isinstance(api_result, dict)